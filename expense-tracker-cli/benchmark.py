@@ -0,0 +1,737 @@
+#!/usr/bin/env python3
+
+import argparse
+import importlib.util
+import json
+import multiprocessing
+import os
+import random
+import re
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parent / "expense-tracker.py"
+
+CATEGORIES = [
+    "General",
+    "Food",
+    "Daily",
+    "Cafe and Restaurant",
+    "Beauty & Health",
+    "Bills & Charging",
+    "Clothes",
+    "Travel & Transportation",
+    "House",
+    "Entertainment",
+    "Savings",
+    "Sports",
+    "Gifting",
+    "Other",
+    "Money Transfer",
+    "Loan Installments",
+    "Culture & Art",
+]
+
+WORDS = [
+    "uber", "rent", "coffee", "groceries", "gym", "cinema", "book", "train",
+    "flight", "pharmacy", "lunch", "dinner", "internet", "phone", "gift",
+    "shoes", "taxi", "insurance", "concert", "museum", "transfer", "loan",
+]
+
+
+############## Ledger generation #################
+
+
+def generate_items(rows: int, years: int = 5, seed: int = 42):
+    """Yield (id, item) pairs spread over every category and several years"""
+    rng = random.Random(seed)
+    first_day = date.today() - timedelta(days=365 * years)
+    span = 365 * years
+
+    for item_id in range(1, rows + 1):
+        yield str(item_id), {
+            "description": " ".join(rng.sample(WORDS, 2)),
+            "amount": round(rng.uniform(1, 500), 2),
+            "date": (first_day + timedelta(days=rng.randrange(span))).isoformat(),
+            "category": rng.choice(CATEGORIES),
+        }
+
+
+def make_config_directory() -> Path:
+    """A temporary HOME's config directory, with the result cache turned off"""
+    home = Path(tempfile.mkdtemp(prefix="expense-bench-"))
+    config_directory = home / ".config" / "expense-tracker"
+    config_directory.mkdir(parents=True)
+    with open(config_directory / "config.json", "w", encoding="utf-8") as f:
+        json.dump({"cache_max_bytes": 0}, f)
+    return config_directory
+
+
+def make_home(rows: int) -> Path:
+    """Create a temporary HOME holding a JSON ledger with the given row count"""
+    config_directory = make_config_directory()
+    home = config_directory.parent.parent
+
+    ledger = {
+        "id_counter": {"counter": rows + 1, "available_ids": []},
+        "items": dict(generate_items(rows)),
+    }
+    with open(config_directory / "expenseDB.json", "w", encoding="utf-8") as f:
+        json.dump(ledger, f)
+
+    return home
+
+
+def run_cli(home: Path, *argv: str) -> float:
+    """Run expense-tracker.py in a fresh process and return the wall time"""
+    env = dict(os.environ, HOME=str(home))
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, str(SCRIPT), *argv],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=False,
+    )
+    return time.perf_counter() - start
+
+
+def run_cli_peak(home: Path, *argv: str) -> tuple:
+    """Run expense-tracker.py in a fresh process; (wall seconds, peak RSS in MB)"""
+    env = dict(os.environ, HOME=str(home))
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, str(SCRIPT), *argv],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    _, _, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - start
+    process.returncode = 0  # Already reaped by wait4.
+    return elapsed, usage.ru_maxrss / 1024
+
+
+def median_ms(samples: list) -> float:
+    return statistics.median(samples) * 1000
+
+
+def load_tracker():
+    """Import expense-tracker.py as a module for in-process benchmarks"""
+    spec = importlib.util.spec_from_file_location("expense_tracker", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class SortedListAllocator:
+    """The old free-list: append + sort on free, pop(0) on allocate"""
+
+    def __init__(self, counter: int) -> None:
+        self.counter = counter
+        self.available_ids = []
+
+    def release(self, item_id: int) -> None:
+        self.available_ids.append(item_id)
+        self.available_ids.sort()
+
+    def peek(self) -> int:
+        return self.available_ids[0] if self.available_ids else self.counter
+
+    def claim(self, item_id: int) -> None:
+        if self.available_ids and self.available_ids[0] == item_id:
+            self.available_ids.pop(0)
+        else:
+            self.counter = self.counter + 1
+
+
+############## Benchmarks #################
+
+
+def bench_startup(sizes: list, repeat: int) -> dict:
+    """Cold-start latency of commands that never touch the ledger"""
+    commands = {
+        "no command": [],
+        "--help": ["--help"],
+        "list --list-categories": ["list", "--list-categories"],
+        "summary": ["summary"],
+    }
+    results = {}
+
+    for rows in sizes:
+        home = make_home(rows)
+        results[rows] = {
+            label: median_ms([run_cli(home, *argv) for _ in range(repeat)])
+            for label, argv in commands.items()
+        }
+
+    print(f"{'command':<26}" + "".join(f"{rows:>12,}" for rows in sizes))
+    for label in commands:
+        print(
+            f"{label:<26}"
+            + "".join(f"{results[rows][label]:>10.1f}ms" for rows in sizes)
+        )
+
+    return results
+
+
+def bench_churn(rows: int, churn: int) -> dict:
+    """Delete and re-add `churn` random IDs, one commit per operation"""
+    tracker = load_tracker()
+    rng = random.Random(7)
+    victims = rng.sample(range(1, rows + 1), churn)
+
+    # The allocators on their own: free every victim, then allocate them back.
+    allocators = {}
+    for label, allocator in (
+        ("sorted list", SortedListAllocator(rows + 1)),
+        ("heap", tracker.IdAllocator(rows + 1)),
+    ):
+        start = time.perf_counter()
+        for item_id in victims:
+            allocator.release(item_id)
+        for _ in victims:
+            allocator.claim(allocator.peek())
+        allocators[label] = time.perf_counter() - start
+
+    # End to end through the JSON store.
+    home = Path(tempfile.mkdtemp(prefix="expense-bench-"))
+    store = tracker.JournalStore(home / "expenseDB.json")
+    store.bulk_load(generate_items(rows), rows + 1, [])
+
+    start = time.perf_counter()
+    for item_id in victims:
+        store.record({"op": "delete", "id": str(item_id)})
+        store.commit()
+    delete_time = time.perf_counter() - start
+
+    item = {
+        "description": "churn",
+        "amount": 1.0,
+        "date": "2024-01-01",
+        "category": "Food",
+    }
+    start = time.perf_counter()
+    for _ in victims:
+        store.record({"op": "add", "id": str(store.next_id()), "item": item})
+        store.commit()
+    add_time = time.perf_counter() - start
+
+    results = {
+        "allocator_seconds": allocators,
+        "store_delete_ops_per_second": churn / delete_time,
+        "store_add_ops_per_second": churn / add_time,
+    }
+
+    print(f"{rows:,} rows, {churn:,} deletes then {churn:,} adds")
+    for label, seconds in allocators.items():
+        print(f"  {'allocator, ' + label:<24}{seconds * 1000:>12.1f}ms")
+    print(f"  {'store delete':<24}{results['store_delete_ops_per_second']:>12,.0f} ops/s")
+    print(f"  {'store add':<24}{results['store_add_ops_per_second']:>12,.0f} ops/s")
+
+    return results
+
+
+def bench_shards(sizes: list, repeat: int) -> dict:
+    """`add` latency for the single-file JSON ledger and the sharded one.
+
+    History grows by adding years at a steady ~1,000 expenses a month, so the
+    shard an add lands in stays the same size as the ledger grows.
+    """
+    tracker = load_tracker()
+    argv = ["add", "--description", "bench", "--amount", "1"]
+    results = {}
+
+    for rows in sizes:
+        years = max(1, rows // 12000)
+        home = make_home(rows)
+        shards_path = home / ".config" / "expense-tracker" / "expenseDB.shards"
+        store = tracker.ShardedStore(shards_path)
+        store.bulk_load(generate_items(rows, years), rows + 1, [])
+
+        results[rows] = {
+            backend: median_ms(
+                [run_cli(home, "--backend", backend, *argv) for _ in range(repeat)]
+            )
+            for backend in ("json", "sharded")
+        }
+
+    print(f"{'add latency':<26}" + "".join(f"{rows:>12,}" for rows in sizes))
+    for backend in ("json", "sharded"):
+        print(
+            f"{backend:<26}"
+            + "".join(f"{results[rows][backend]:>10.1f}ms" for rows in sizes)
+        )
+
+    return results
+
+
+def bench_daemon(rows: int, repeat: int) -> dict:
+    """Per-command latency in direct mode and through a running `serve` daemon"""
+    commands = {
+        "summary": ["summary"],
+        "summary --rolling 30d": ["summary", "--rolling", "30d"],
+        "search uber": ["search", "uber", "--limit", "5"],
+        "add": ["add", "--description", "bench", "--amount", "1"],
+    }
+    home = make_home(rows)
+    results = {"direct": {}, "daemon": {}}
+
+    for label, argv in commands.items():
+        results["direct"][label] = median_ms(
+            [run_cli(home, *argv) for _ in range(repeat)]
+        )
+
+    daemon = subprocess.Popen(
+        [sys.executable, str(SCRIPT), "serve"],
+        env=dict(os.environ, HOME=str(home)),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    socket_path = home / ".config" / "expense-tracker" / "expense-tracker.sock"
+    while not socket_path.exists():
+        time.sleep(0.1)
+
+    try:
+        for label, argv in commands.items():
+            results["daemon"][label] = median_ms(
+                [run_cli(home, *argv) for _ in range(repeat)]
+            )
+    finally:
+        run_cli(home, "serve", "--stop")
+        daemon.wait()
+
+    print(f"{rows:,} rows")
+    print(f"  {'command':<24}{'direct':>12}{'daemon':>12}")
+    for label in commands:
+        print(
+            f"  {label:<24}{results['direct'][label]:>10.1f}ms"
+            f"{results['daemon'][label]:>10.1f}ms"
+        )
+
+    return results
+
+
+def resident_mb() -> float:
+    """Current resident set size of this process"""
+    with open("/proc/self/statm") as f:
+        resident_pages = int(f.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def probe_memory(layout: str, snapshot: str, results) -> None:
+    """Load the snapshot in this (fresh) process and report the RSS it added"""
+    tracker = load_tracker()
+    baseline = resident_mb()
+    start = time.perf_counter()
+
+    if layout == "dicts":
+        # The old in-memory model: the parsed {id: {field: value}} dicts.
+        with open(snapshot, "r") as f:
+            ledger = json.load(f)
+        count = len(ledger["items"])
+    else:
+        store = tracker.JournalStore(Path(snapshot))
+        count = store.count()
+
+    results.put(
+        {
+            "items": count,
+            "load_seconds": time.perf_counter() - start,
+            "resident_mb": resident_mb() - baseline,
+            "peak_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        }
+    )
+
+
+def bench_memory(rows: int) -> dict:
+    """RSS of a loaded ledger held as dicts and as the compact record table"""
+    home = make_home(rows)
+    snapshot = str(home / ".config" / "expense-tracker" / "expenseDB.json")
+    context = multiprocessing.get_context("spawn")
+
+    results = {}
+    for layout in ("dicts", "record table"):
+        queue = context.Queue()
+        process = context.Process(target=probe_memory, args=(layout, snapshot, queue))
+        process.start()
+        results[layout] = queue.get()
+        process.join()
+
+    print(f"{rows:,} rows")
+    print(f"  {'layout':<16}{'resident':>12}{'peak':>12}{'load':>12}")
+    for layout, result in results.items():
+        print(
+            f"  {layout:<16}{result['resident_mb']:>10.1f}MB"
+            f"{result['peak_mb']:>10.1f}MB{result['load_seconds']:>11.2f}s"
+        )
+
+    return results
+
+
+def bench_stats(rows: int) -> dict:
+    """Sketch quantiles against exact order statistics, per category"""
+    tracker = load_tracker()
+    quantiles = [q for _, q in tracker.Expense.STATS_QUANTILES]
+    items = [item for _, item in generate_items(rows)]
+
+    start = time.perf_counter()
+    sketches = {}
+    for item in items:
+        sketches.setdefault(item["category"], tracker.QuantileSketch()).add(
+            item["amount"]
+        )
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    estimates = {
+        category: [sketch.quantile(q) for q in quantiles]
+        for category, sketch in sketches.items()
+    }
+    sketch_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    amounts = {}
+    for item in items:
+        amounts.setdefault(item["category"], []).append(item["amount"])
+    exact = {}
+    for category, values in amounts.items():
+        values.sort()
+        exact[category] = [values[int(q * (len(values) - 1))] for q in quantiles]
+    exact_time = time.perf_counter() - start
+
+    max_error = max(
+        abs(estimate - value) / value
+        for category in exact
+        for estimate, value in zip(estimates[category], exact[category])
+    )
+    results = {
+        "max_relative_error": max_error,
+        "bound": tracker.QuantileSketch.ALPHA,
+        "build_seconds": build_time,
+        "sketch_query_seconds": sketch_time,
+        "exact_sort_seconds": exact_time,
+    }
+
+    print(f"{rows:,} rows, {len(exact)} categories")
+    print(f"  {'max relative error':<24}{max_error:>12.4%}  (bound {results['bound']:.0%})")
+    print(f"  {'build sketches':<24}{build_time * 1000:>12.1f}ms")
+    print(f"  {'query sketches':<24}{sketch_time * 1000:>12.1f}ms")
+    print(f"  {'exact sort':<24}{exact_time * 1000:>12.1f}ms")
+
+    return results
+
+
+INSTRUMENTED_COMMANDS = [
+    ["--timings", "summary"],
+    ["--timings", "add", "--description", "bench", "--amount", "1.5"],
+    ["--profile", "{profile}", "list", "--category", "Food"],
+]
+
+
+def check_instrumentation(home: Path, backend: str) -> list:
+    """Run --timings and --profile once each; a description of every failure"""
+    failures = []
+    profile = home / "suite.prof"
+    env = dict(os.environ, HOME=str(home))
+
+    for argv in INSTRUMENTED_COMMANDS:
+        argv = [arg.format(profile=profile) for arg in argv]
+        completed = subprocess.run(
+            [sys.executable, str(SCRIPT), "--backend", backend, *argv],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        command = " ".join(argv)
+        if completed.returncode != 0:
+            output = (completed.stdout + completed.stderr).strip().splitlines()
+            last_line = re.sub(r"\x1b\[[0-9;]*m", "", output[-1]).strip() if output else ""
+            failures.append(f"{command}: exit {completed.returncode}: {last_line}")
+        elif argv[0] == "--timings" and "total" not in completed.stderr:
+            failures.append(f"{command}: no phase table on stderr")
+        elif argv[0] == "--profile" and not (
+            profile.exists() and profile.stat().st_size
+        ):
+            failures.append(f"{command}: no profile written")
+
+    return failures
+
+
+def bench_instrumentation(rows: int) -> list:
+    """Smoke-run --timings and --profile against every backend"""
+    tracker = load_tracker()
+    failures = []
+
+    for backend, (file_name, store_class) in tracker.STORAGE_BACKENDS.items():
+        home = Path(tempfile.mkdtemp(prefix="expense-bench-"))
+        config_directory = home / ".config" / "expense-tracker"
+        config_directory.mkdir(parents=True)
+        store_class(config_directory / file_name).bulk_load(
+            generate_items(rows), rows + 1, []
+        )
+        failures.extend(
+            f"{backend}: {failure}" for failure in check_instrumentation(home, backend)
+        )
+
+    for failure in failures:
+        print(f"INSTRUMENTATION FAILED {failure}")
+    if not failures:
+        print("--timings and --profile ran cleanly on every backend.")
+
+    return failures
+
+
+SUITE_COMMANDS = {
+    "list": ["list"],
+    "list --category": ["list", "--category", "Food"],
+    "summary": ["summary"],
+    "summary --month": ["summary", "--month", "3"],
+    "summary --category": ["summary", "--category", "Food"],
+    "summary --from/--to": ["summary", "--from", "2022-01-01", "--to", "2022-12-31"],
+    "summary --rolling": ["summary", "--rolling", "30d"],
+    "export": ["export", "--output", "{export}"],
+    "add": ["add", "--description", "bench", "--amount", "9.99", "--category", "Food"],
+    "update": ["update", "--id", "{id}", "--amount", "12.5"],
+    "delete": ["delete", "--id", "{id}"],
+}
+
+
+def bench_suite(sizes: list, backends: list, repeat: int) -> dict:
+    """Latency and peak memory of every command on synthetic ledgers.
+
+    Each command runs `repeat` times in a fresh process; the median wall time
+    and the highest peak RSS are kept. update and delete use a different ID on
+    every run, from the top of the ledger down. Afterwards --timings and
+    --profile run once per ledger as a smoke check; failures are returned
+    next to the results rather than timed.
+    """
+    tracker = load_tracker()
+    results = {}
+    failures = []
+
+    for backend in backends:
+        results[backend] = {}
+        for rows in sizes:
+            config_directory = make_config_directory()
+            home = config_directory.parent.parent
+            file_name, store_class = tracker.STORAGE_BACKENDS[backend]
+            store_class(config_directory / file_name).bulk_load(
+                generate_items(rows), rows + 1, []
+            )
+
+            measured = {}
+            for label, argv in SUITE_COMMANDS.items():
+                samples = []
+                for run in range(repeat):
+                    values = {"id": rows - run, "export": home / "export.csv"}
+                    samples.append(
+                        run_cli_peak(
+                            home,
+                            "--backend",
+                            backend,
+                            *(arg.format(**values) for arg in argv),
+                        )
+                    )
+                measured[label] = {
+                    "median_ms": median_ms([seconds for seconds, _ in samples]),
+                    "peak_mb": max(peak for _, peak in samples),
+                }
+            results[backend][str(rows)] = measured
+
+            failures.extend(
+                f"{backend} {rows:,} rows: {failure}"
+                for failure in check_instrumentation(home, backend)
+            )
+
+    for backend, by_rows in results.items():
+        print(f"{backend} backend")
+        print(f"  {'command':<24}" + "".join(f"{rows:>22,}" for rows in sizes))
+        for label in SUITE_COMMANDS:
+            print(
+                f"  {label:<24}"
+                + "".join(
+                    f"{by_rows[str(rows)][label]['median_ms']:>10.1f}ms"
+                    f"{by_rows[str(rows)][label]['peak_mb']:>8.1f}MB"
+                    for rows in sizes
+                )
+            )
+
+    for failure in failures:
+        print(f"INSTRUMENTATION FAILED {failure}")
+    if not failures:
+        print("--timings and --profile ran cleanly on every ledger.")
+
+    return results, failures
+
+
+def regressions(results: dict, baseline: dict, threshold: float) -> list:
+    """(backend, rows, command, baseline ms, new ms) slower than threshold x"""
+    slower = []
+    for backend, by_rows in results.items():
+        for rows, measured in by_rows.items():
+            for label, values in measured.items():
+                before = baseline.get(backend, {}).get(rows, {}).get(label)
+                if before and values["median_ms"] > before["median_ms"] * threshold:
+                    slower.append(
+                        (backend, rows, label, before["median_ms"], values["median_ms"])
+                    )
+    return slower
+
+
+def arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the expense tracker.")
+    subparser = parser.add_subparsers(dest="command", required=True)
+
+    startup_parser = subparser.add_parser(
+        "startup", help="Cold-start latency as the ledger grows."
+    )
+    startup_parser.add_argument(
+        "--sizes",
+        help="Comma separated ledger sizes.",
+        default="1000,10000,100000",
+    )
+    startup_parser.add_argument(
+        "--repeat", help="Runs per measurement.", type=int, default=5
+    )
+
+    churn_parser = subparser.add_parser(
+        "churn", help="Delete/add churn against the ID allocator and the JSON store."
+    )
+    churn_parser.add_argument("--rows", help="Ledger size.", type=int, default=100000)
+    churn_parser.add_argument(
+        "--churn", help="IDs deleted and re-added.", type=int, default=20000
+    )
+
+    shards_parser = subparser.add_parser(
+        "shards", help="add latency of the single-file and sharded JSON ledgers."
+    )
+    shards_parser.add_argument(
+        "--sizes",
+        help="Comma separated ledger sizes.",
+        default="10000,100000,1000000",
+    )
+    shards_parser.add_argument(
+        "--repeat", help="Runs per measurement.", type=int, default=5
+    )
+
+    memory_parser = subparser.add_parser(
+        "memory", help="Resident memory of a loaded ledger, dicts vs record table."
+    )
+    memory_parser.add_argument("--rows", help="Ledger size.", type=int, default=1000000)
+
+    daemon_parser = subparser.add_parser(
+        "daemon", help="Command latency in direct mode and through `serve`."
+    )
+    daemon_parser.add_argument("--rows", help="Ledger size.", type=int, default=100000)
+    daemon_parser.add_argument(
+        "--repeat", help="Runs per measurement.", type=int, default=5
+    )
+
+    stats_parser = subparser.add_parser(
+        "stats", help="Quantile sketch error and speed against an exact sort."
+    )
+    stats_parser.add_argument("--rows", help="Ledger size.", type=int, default=1000000)
+
+    instrumentation_parser = subparser.add_parser(
+        "instrumentation", help="Smoke-run --timings and --profile on every backend."
+    )
+    instrumentation_parser.add_argument(
+        "--rows", help="Ledger size.", type=int, default=1000
+    )
+
+    suite_parser = subparser.add_parser(
+        "suite", help="Latency and peak memory of every command, as JSON."
+    )
+    suite_parser.add_argument(
+        "--sizes",
+        help="Comma separated ledger sizes.",
+        default="10000,100000,1000000",
+    )
+    suite_parser.add_argument(
+        "--backends",
+        help="Comma separated storage backends.",
+        default="json",
+    )
+    suite_parser.add_argument(
+        "--repeat", help="Runs per measurement.", type=int, default=3
+    )
+    suite_parser.add_argument(
+        "--output", help="Write the results to this JSON file.", metavar="PATH"
+    )
+    suite_parser.add_argument(
+        "--baseline",
+        help="Compare against the JSON results of an earlier run.",
+        metavar="PATH",
+    )
+    suite_parser.add_argument(
+        "--threshold",
+        help="With --baseline: fail when a command is this many times slower.",
+        type=float,
+        default=1.25,
+    )
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = arguments()
+
+    if args.command == "startup":
+        sizes = [int(size) for size in args.sizes.split(",")]
+        bench_startup(sizes, args.repeat)
+
+    elif args.command == "churn":
+        bench_churn(args.rows, args.churn)
+
+    elif args.command == "shards":
+        sizes = [int(size) for size in args.sizes.split(",")]
+        bench_shards(sizes, args.repeat)
+
+    elif args.command == "memory":
+        bench_memory(args.rows)
+
+    elif args.command == "daemon":
+        bench_daemon(args.rows, args.repeat)
+
+    elif args.command == "stats":
+        bench_stats(args.rows)
+
+    elif args.command == "instrumentation":
+        if bench_instrumentation(args.rows):
+            sys.exit(1)
+
+    elif args.command == "suite":
+        sizes = [int(size) for size in args.sizes.split(",")]
+        results, failures = bench_suite(sizes, args.backends.split(","), args.repeat)
+
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+
+        if args.baseline:
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+            slower = regressions(results, baseline, args.threshold)
+            for backend, rows, label, before, after in slower:
+                print(
+                    f"REGRESSION {backend} {int(rows):,} rows {label}: "
+                    f"{before:.1f}ms -> {after:.1f}ms ({after / before:.2f}x)"
+                )
+            if slower:
+                sys.exit(1)
+            print(f"No command slower than {args.threshold:.2f}x the baseline.")
+
+        if failures:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
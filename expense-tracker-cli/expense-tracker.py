@@ -1,13 +1,37 @@
 #!/usr/bin/env python3
 
+import time
+
+# Taken before the other imports so that --timings can report them.
+STARTED = (time.perf_counter(), time.process_time())
+
 import argparse
 import json
 from pathlib import Path
 import sys
-import re
 import os
 import csv
-from datetime import datetime
+import functools
+import gzip
+import hashlib
+import heapq
+import io
+import math
+import mmap
+import re
+import shlex
+import socket
+import sqlite3
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager, nullcontext, redirect_stderr, redirect_stdout
+from datetime import date, datetime, timedelta
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 # ==============================================================================
 #  THEME ENGINE (Catppuccin Mocha) & UTILS
@@ -69,6 +93,11 @@ class UI:
 
     @staticmethod
     def table_row(col1, col2, col3, col4, col5, header=False):
+        """Prints a strict columnar table row"""
+        print(UI.format_row(col1, col2, col3, col4, col5, header))
+
+    @staticmethod
+    def format_row(col1, col2, col3, col4, col5, header=False) -> str:
         """Formats a strict columnar table row"""
         c1_w, c2_w, c3_w, c4_w, c5_w = 6, 14, 30, 30, 12
 
@@ -86,7 +115,7 @@ class UI:
             sep = f"{Theme.OVERLAY}│{Theme.RESET}"
 
         # F-string padding
-        print(
+        return (
             f" {color}{str(col1):<{c1_w}}{reset} {sep} "
             f"{Theme.BLUE if not header else color}{str(col2):<{c2_w}}{reset} {sep} "
             f"{color}{str(col3):<{c3_w}}{reset} {sep} "
@@ -98,51 +127,916 @@ class UI:
     def format_currency(amount):
         return f"${float(amount):,.2f}"
 
+    @staticmethod
+    def format_size(count: int) -> str:
+        for unit in ("B", "KB", "MB"):
+            if count < 1024:
+                return f"{count:.0f}{unit}" if unit == "B" else f"{count:.1f}{unit}"
+            count = count / 1024
+        return f"{count:.1f}GB"
 
-############## Expense Class #################
 
+############## Instrumentation #################
 
-class Expense:
-    @staticmethod
-    def _handle_path() -> Path:
-        """Create and store the JSON in a specific path"""
-        file_name = "expenseDB.json"
-        home_path = os.getenv("HOME")
-        config_path = ".config/expense-tracker/"
 
-        config_directory = os.path.join(home_path, config_path)
-        full_path = os.path.join(home_path, config_path, file_name)
+class Instrumentation:
+    """Per-phase wall time, CPU time and bytes read/written for ``--timings``.
 
-        if not os.path.exists(config_directory):
+    ``hook`` wraps a method so every call runs as a named phase. Phases nest,
+    and the time spent in an inner phase is taken off the enclosing one, so each
+    second is counted once. Nothing is wrapped unless ``--timings`` is given, so
+    a normal run does not pay for the hooks. Byte counts come from
+    ``/proc/self/io`` and are shown as ``-`` where it does not exist.
+    """
+
+    HEADINGS = ("PHASE", "WALL", "CPU", "READ", "WRITTEN", "CALLS")
+
+    phases = {}
+    stack = []
+    has_io = os.path.exists("/proc/self/io")
+    _probe_bytes = 0
+
+    @classmethod
+    def _io(cls) -> tuple:
+        """(bytes read, bytes written) so far, less the reads of this probe"""
+        if not cls.has_io:
+            return 0, 0
+        with open("/proc/self/io", "rb") as f:
+            text = f.read()
+        counters = dict(line.split(b": ") for line in text.splitlines())
+        read = int(counters[b"rchar"]) - cls._probe_bytes
+        cls._probe_bytes = cls._probe_bytes + len(text)
+        return read, int(counters[b"wchar"])
+
+    @classmethod
+    def sample(cls) -> tuple:
+        return (time.perf_counter(), time.process_time(), *cls._io())
+
+    @classmethod
+    def _charge(cls, name: str, since: tuple, now: tuple, calls: int = 0) -> None:
+        totals = cls.phases.setdefault(name, [0.0, 0.0, 0, 0, 0])
+        for index in range(4):
+            totals[index] = totals[index] + now[index] - since[index]
+        totals[4] = totals[4] + calls
+
+    @classmethod
+    def start(cls, name: str) -> None:
+        now = cls.sample()
+        if cls.stack:
+            cls._charge(*cls.stack[-1], now)
+        cls.stack.append([name, now])
+        cls._charge(name, now, now, calls=1)
+
+    @classmethod
+    def stop(cls) -> None:
+        now = cls.sample()
+        cls._charge(*cls.stack.pop(), now)
+        if cls.stack:
+            cls.stack[-1][1] = now
+
+    @classmethod
+    def hook(cls, owner: type, attribute: str, name: str) -> None:
+        """Run every call of owner.attribute as the phase `name`"""
+        method = owner.__dict__[attribute]
+        wrapper = None
+        function = method
+        if isinstance(method, (classmethod, staticmethod)):
+            wrapper = type(method)
+            function = method.__func__
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            cls.start(name)
             try:
-                os.mkdir(config_directory)
-            except OSError:
-                pass  # Handle quietly or use print_error if strictly needed
+                return function(*args, **kwargs)
+            finally:
+                cls.stop()
 
-        return full_path
+        setattr(owner, attribute, wrapper(timed) if wrapper else timed)
+
+    @classmethod
+    def install(cls) -> None:
+        """Hook the commands, the table rendering and the ledger reads and writes"""
+        for attribute, method in list(vars(Expense).items()):
+            if not attribute.startswith("_") and isinstance(
+                method, (classmethod, staticmethod)
+            ):
+                cls.hook(Expense, attribute, attribute)
+
+        for owner, attribute in (
+            (UI, "header"),
+            (UI, "table_row"),
+            (Expense, "_print_rows"),
+        ):
+            cls.hook(owner, attribute, "render")
+        for attribute in ("_load_snapshot", "_replay_journal"):
+            cls.hook(JournalStore, attribute, "load ledger")
+        for store_class in (JournalStore, SqliteStore, ShardedStore):
+            for attribute in ("commit", "compact"):
+                cls.hook(store_class, attribute, "write ledger")
+        cls.hook(Expense, "_final_writing", "write ledger")
+
+    @classmethod
+    @contextmanager
+    def session(cls, loaded: tuple, parsed: tuple):
+        """Time the rest of the run and print the phases to stderr at the end.
+
+        `loaded` and `parsed` are (wall, cpu) times taken when main() started
+        and once the arguments were parsed; the bytes read before then are
+        counted as import.
+        """
+        read, written = cls._io()
+        cls._charge("import", (*STARTED, 0, 0), (*loaded, read, written), calls=1)
+        cls._charge("arguments", (*loaded, 0, 0), (*parsed, 0, 0), calls=1)
+        cls.install()
+        cls.start("other")
+        try:
+            yield
+        finally:
+            while cls.stack:
+                cls.stop()
+            cls.report()
 
-    file_path = Path(_handle_path())
+    @classmethod
+    def report(cls) -> None:
+        phases = sorted(
+            cls.phases.items(), key=lambda phase: (phase[0] == "other", -phase[1][0])
+        )
+        totals = [sum(values[index] for _, values in phases) for index in range(5)]
+
+        def line(name, wall, cpu, read, written, calls, color=Theme.TEXT) -> str:
+            read, written = (
+                (UI.format_size(read), UI.format_size(written)) if cls.has_io else ("-", "-")
+            )
+            return (
+                f" {color}{name[:22]:<22}{wall * 1000:>10.1f}ms{cpu * 1000:>10.1f}ms"
+                f"{read:>11}{written:>11}{calls:>8}{Theme.RESET}"
+            )
+
+        header = Theme.MAUVE + Theme.BOLD
+        lines = [
+            "",
+            f" {header}{cls.HEADINGS[0]:<22}"
+            + "".join(f"{heading:>12}" for heading in cls.HEADINGS[1:3])
+            + "".join(f"{heading:>11}" for heading in cls.HEADINGS[3:5])
+            + f"{cls.HEADINGS[5]:>8}{Theme.RESET}",
+        ]
+        lines.extend(line(name, *values) for name, values in phases)
+        lines.append(line("total", *totals, color=header))
+        print("\n".join(lines) + "\n", file=sys.stderr)
 
     @staticmethod
-    def _load_python_object(file_path: Path):
-        """Load json file and return a Python object"""
+    @contextmanager
+    def profile(path: str):
+        """Run the block under cProfile and dump the pstats file to path"""
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
         try:
-            if file_path.exists():
-                with open(file_path, "r") as f:
-                    dict_object = json.load(f)
-                    return dict_object
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(path)
+
+
+############## Storage #################
+
+
+class DateIndex:
+    """Per-day totals as sorted date ordinals with a prefix-sum array.
+
+    A date range is two ``bisect`` lookups and one subtraction. Adjusting a day
+    only marks the prefix sums stale from that day on; they are recomputed on
+    the next range query.
+    """
+
+    def __init__(self, daily: dict) -> None:
+        pairs = sorted(
+            (date.fromisoformat(day).toordinal(), total) for day, total in daily.items()
+        )
+        self.days = [ordinal for ordinal, _ in pairs]
+        self.amounts = [total for _, total in pairs]
+        self.prefix = [0.0]
+        self.valid = 0
+
+    def adjust(self, day: str, delta: float) -> None:
+        ordinal = date.fromisoformat(day).toordinal()
+        position = bisect_left(self.days, ordinal)
+        if position < len(self.days) and self.days[position] == ordinal:
+            self.amounts[position] = round(self.amounts[position] + delta, 2)
+        else:
+            self.days.insert(position, ordinal)
+            self.amounts.insert(position, delta)
+        self.valid = min(self.valid, position)
+
+    def total(self, date_from: str | None = None, date_to: str | None = None) -> float:
+        """Sum the days between the two dates, both inclusive and both optional"""
+        if self.valid < len(self.days):
+            del self.prefix[self.valid + 1 :]
+            running = self.prefix[-1]
+            for amount in self.amounts[self.valid :]:
+                running = running + amount
+                self.prefix.append(running)
+            self.valid = len(self.days)
+
+        low = 0
+        high = len(self.days)
+        if date_from is not None:
+            low = bisect_left(self.days, date.fromisoformat(date_from).toordinal())
+        if date_to is not None:
+            high = bisect_right(self.days, date.fromisoformat(date_to).toordinal())
+        if high <= low:
+            return 0
+        return round(self.prefix[high] - self.prefix[low], 2)
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with a relative error bound (DDSketch).
+
+    A positive amount x is counted in bin ``ceil(log(x) / log(gamma))`` with
+    ``gamma = (1 + ALPHA) / (1 - ALPHA)``; every amount in a bin lies within
+    ``ALPHA`` (1%) of the bin's midpoint estimate. A quantile is read off the
+    bin holding that rank, so it is within 1% of the exact order statistic,
+    and adding, removing or merging sketches keeps that bound. Count and mean
+    are exact. The state is a plain dict so it can live in the snapshot.
+    """
+
+    ALPHA = 0.01
+    GAMMA = (1 + ALPHA) / (1 - ALPHA)
+    LOG_GAMMA = math.log(GAMMA)
+
+    def __init__(self, state: dict | None = None) -> None:
+        self.state = state if state is not None else {"count": 0, "sum": 0, "bins": {}}
+
+    @classmethod
+    def key(cls, amount: float) -> str:
+        """The bin of an amount; 'z' holds zero and negative amounts"""
+        if amount <= 0:
+            return "z"
+        return str(math.ceil(math.log(amount) / cls.LOG_GAMMA))
+
+    @classmethod
+    def estimate(cls, key: str) -> float:
+        if key == "z":
+            return 0.0
+        return 2 * cls.GAMMA ** int(key) / (cls.GAMMA + 1)
+
+    @property
+    def count(self) -> int:
+        return self.state["count"]
+
+    def add(self, amount: float, sign: int = 1) -> None:
+        """Count (sign=1) or uncount (sign=-1) one amount"""
+        self.state["count"] = self.state["count"] + sign
+        self.state["sum"] = round(self.state["sum"] + sign * amount, 2)
+        bins = self.state["bins"]
+        key = self.key(amount)
+        count = bins.get(key, 0) + sign
+        if count:
+            bins[key] = count
+        else:
+            bins.pop(key, None)
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        self.state["count"] = self.state["count"] + other.count
+        self.state["sum"] = round(self.state["sum"] + other.state["sum"], 2)
+        bins = self.state["bins"]
+        for key, count in other.state["bins"].items():
+            bins[key] = bins.get(key, 0) + count
+        return self
+
+    def mean(self) -> float:
+        return self.state["sum"] / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """The amount at rank ``floor(q * (count - 1))``, within ALPHA"""
+        if not self.count:
+            return 0.0
+        rank = math.floor(q * (self.count - 1))
+        seen = 0
+        order = sorted(
+            self.state["bins"], key=lambda key: -math.inf if key == "z" else int(key)
+        )
+        for key in order:
+            seen = seen + self.state["bins"][key]
+            if seen > rank:
+                return self.estimate(key)
+        return 0.0
+
+
+class AggregateIndex:
+    """Running totals keyed by day, year-month, category and year-month/category.
+
+    Stored in the snapshot under ``aggregates`` and adjusted on every
+    add/update/delete, so summaries never have to walk the items. ``sketches``
+    holds a ``QuantileSketch`` state per year-month and category.
+    """
+
+    KEYS = ("day", "month", "category", "month_category", "sketches")
+
+    def __init__(self, totals: dict) -> None:
+        self.totals = totals
+        for key in self.KEYS:
+            self.totals.setdefault(key, {})
+        self._dates = None
+
+    @classmethod
+    def build(cls, items) -> "AggregateIndex":
+        """Rebuild the totals from scratch"""
+        index = cls({})
+        for item in items:
+            index.adjust(item, 1)
+        return index
+
+    @staticmethod
+    def _bump(totals: dict, key: str, delta: float) -> None:
+        total = round(totals.get(key, 0) + delta, 2)
+        if total:
+            totals[key] = total
+        else:
+            totals.pop(key, None)
+
+    def adjust(self, item: dict, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) one item from the totals"""
+        year_month = item["date"][:7]
+        category = item.get("category", "General")
+        delta = sign * item["amount"]
+
+        self._bump(self.totals["day"], item["date"], delta)
+        if self._dates is not None:
+            self._dates.adjust(item["date"], delta)
+        self._bump(self.totals["month"], year_month, delta)
+        self._bump(self.totals["category"], category, delta)
+
+        month_categories = self.totals["month_category"].setdefault(year_month, {})
+        self._bump(month_categories, category, delta)
+        if not month_categories:
+            del self.totals["month_category"][year_month]
+
+        month_sketches = self.totals["sketches"].setdefault(year_month, {})
+        sketch = QuantileSketch(month_sketches.get(category))
+        month_sketches[category] = sketch.state
+        sketch.add(item["amount"], sign)
+        if not sketch.count:
+            del month_sketches[category]
+        if not month_sketches:
+            del self.totals["sketches"][year_month]
+
+    def total(self, month: int | None = None, category: str | None = None) -> float:
+        """Sum the totals matching the month number and/or category"""
+        if month is None and category is None:
+            return round(sum(self.totals["category"].values()), 2)
+        if month is None:
+            return self.totals["category"].get(category, 0)
+
+        summary = 0
+        for year_month, month_categories in self.totals["month_category"].items():
+            if int(year_month[5:7]) != int(month):
+                continue
+            if category is None:
+                summary = summary + self.totals["month"].get(year_month, 0)
             else:
-                id_counter_obj = {
-                    "id_counter": {"counter": 1, "available_ids": []},
-                    "items": {},
-                }
+                summary = summary + month_categories.get(category, 0)
+        return round(summary, 2)
+
+    def range_total(
+        self, date_from: str | None = None, date_to: str | None = None
+    ) -> float:
+        """Sum the days between the two dates through the date index"""
+        if self._dates is None:
+            self._dates = DateIndex(self.totals["day"])
+        return self._dates.total(date_from, date_to)
+
+    def sketches(self, period: str | None = None) -> dict:
+        """{(year-month, category): QuantileSketch} for months starting with period"""
+        return {
+            (year_month, category): QuantileSketch(state)
+            for year_month, month_sketches in self.totals["sketches"].items()
+            if period is None or year_month.startswith(period)
+            for category, state in month_sketches.items()
+        }
+
+    def rows(self) -> dict:
+        """Flatten to {(year-month, category): total}"""
+        return {
+            (year_month, category): total
+            for year_month, month_categories in self.totals["month_category"].items()
+            for category, total in month_categories.items()
+        }
+
+
+class SearchIndex:
+    """Inverted index from description tokens to expense IDs.
+
+    Stored in the snapshot under ``search`` as ``{token: [ids]}``. A posting
+    list is turned into a set only when an add/update/delete touches it, so
+    loading the snapshot costs no more than parsing it. Prefix matches walk a
+    sorted vocabulary with ``bisect``.
+    """
+
+    def __init__(self, postings: dict) -> None:
+        self.postings = postings
+        self._vocabulary = None
+
+    @staticmethod
+    def tokenize(text) -> set:
+        return set(re.findall(r"\w+", str(text).lower()))
 
-                with open(file_path, "w", encoding="utf-8") as f:
-                    json.dump(id_counter_obj, f, indent=4)
+    @classmethod
+    def build(cls, items) -> "SearchIndex":
+        """Rebuild the postings from (id, item) pairs"""
+        index = cls({})
+        for item_id, item in items:
+            index.adjust(item_id, item, 1)
+        return index
+
+    def adjust(self, item_id, item: dict, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) one item's tokens"""
+        item_id = int(item_id)
+        for token in self.tokenize(item["description"]):
+            posting = self.postings.get(token)
+            if not isinstance(posting, set):
+                posting = self.postings[token] = set(posting or ())
+                self._vocabulary = None
+            if sign > 0:
+                posting.add(item_id)
+            else:
+                posting.discard(item_id)
+
+    @property
+    def vocabulary(self) -> list:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        return self._vocabulary
+
+    def expand(self, term: str):
+        """Yield the indexed tokens that start with ``term``"""
+        vocabulary = self.vocabulary
+        position = bisect_left(vocabulary, term)
+        while position < len(vocabulary) and vocabulary[position].startswith(term):
+            yield vocabulary[position]
+            position = position + 1
+
+    def score(self, terms) -> dict:
+        """Score every matching ID: 2 per exact term match, 1 per prefix match"""
+        scores = {}
+        for term in terms:
+            weights = {}
+            for token in self.expand(term):
+                if token != term:
+                    weights.update(dict.fromkeys(self.postings[token], 1))
+            weights.update(dict.fromkeys(self.postings.get(term, ()), 2))
+
+            if not scores:
+                scores = weights
+                continue
+            for item_id, weight in weights.items():
+                scores[item_id] = scores.get(item_id, 0) + weight
+        return scores
+
+    def to_json(self) -> dict:
+        """Turn the touched posting sets back into sorted lists, dropping empty ones"""
+        for token in list(self.postings):
+            posting = self.postings[token]
+            if not posting:
+                del self.postings[token]
+                self._vocabulary = None
+            elif isinstance(posting, set):
+                self.postings[token] = sorted(posting)
+        return self.postings
+
+
+class IdAllocator:
+    """Hands out expense IDs, reusing freed ones smallest first.
+
+    Freed IDs live in a min-heap with a companion set, so allocating, freeing
+    and claiming an arbitrary ID (journal replay) are all O(log n). Claimed IDs
+    are dropped from the set and skipped lazily when they reach the top of the
+    heap. The free IDs are persisted as ``[start, end]`` ranges.
+    """
+
+    def __init__(self, counter: int = 1, free_ids=()) -> None:
+        self.counter = counter
+        self.free = set(free_ids)
+        self.heap = list(self.free)
+        heapq.heapify(self.heap)
+
+    @classmethod
+    def from_json(cls, state: dict) -> "IdAllocator":
+        """Load ``free_ranges``, or the older flat ``available_ids`` list"""
+        free_ids = list(state.get("available_ids", []))
+        for start, end in state.get("free_ranges", []):
+            free_ids.extend(range(start, end + 1))
+        return cls(state.get("counter", 1), free_ids)
+
+    def to_json(self) -> dict:
+        ranges = []
+        for item_id in sorted(self.free):
+            if ranges and ranges[-1][1] == item_id - 1:
+                ranges[-1][1] = item_id
+            else:
+                ranges.append([item_id, item_id])
+        return {"counter": self.counter, "free_ranges": ranges}
+
+    def peek(self) -> int:
+        """Return the ID the next allocation will use"""
+        while self.heap and self.heap[0] not in self.free:
+            heapq.heappop(self.heap)
+        return self.heap[0] if self.heap else self.counter
+
+    def claim(self, item_id: int) -> None:
+        self.free.discard(item_id)
+        if item_id >= self.counter:
+            self.counter = item_id + 1
+
+    def release(self, item_id: int) -> None:
+        if item_id not in self.free:
+            self.free.add(item_id)
+            heapq.heappush(self.heap, item_id)
+
+    def is_free(self, item_id: int) -> bool:
+        """True if the ID is not held by any item"""
+        return item_id in self.free or item_id >= self.counter
+
+    def free_ids(self) -> list:
+        return sorted(self.free)
+
+
+class RecordTable:
+    """The items of a ledger as parallel typed arrays.
+
+    Each row keeps the date as a day ordinal, the amount in integer cents and
+    the category as a code into ``CategoryList.list_of_categories``; only the
+    description is a Python object. ``row_of`` maps an ID to its row (-1 when
+    the ID is unused) and deleted rows are reused. The table stands in for the
+    ``{id: item}`` dict, building item dicts only when they are asked for.
+    """
+
+    def __init__(self) -> None:
+        self.category_names = list(CategoryList.list_of_categories)
+        self.category_codes = {
+            name: code for code, name in enumerate(self.category_names)
+        }
+        self.descriptions = []
+        self.dates = array("i")
+        self.cents = array("q")
+        self.categories = array("H")
+        self.row_of = array("i")
+        self.free_rows = []
+        self.length = 0
+        self._iso_dates = {}
+        self._ordinals = {}
+
+    @classmethod
+    def from_items(cls, items) -> "RecordTable":
+        table = cls()
+        for key, item in items:
+            table[key] = item
+        return table
+
+    WHITESPACE = re.compile(r"[ \t\n\r]*")
+    # A member's key up to the start of its value, and what follows a value.
+    MEMBER_KEY = re.compile(r'[ \t\n\r]*"([^"\\]*)"[ \t\n\r]*:[ \t\n\r]*')
+    MEMBER_END = re.compile(r"[ \t\n\r]*([,}])")
+
+    @classmethod
+    def _scan_object(cls, text: str, index: int, member) -> int:
+        """Walk the members of the JSON object at text[index].
+
+        ``member(key, start)`` decodes the value starting at ``start`` and
+        returns the index just past it; the index past the closing brace is
+        returned.
+        """
+        if text[index : index + 1] != "{":
+            raise json.JSONDecodeError("Expecting '{'", text, index)
+        match_key = cls.MEMBER_KEY.match
+        match_end = cls.MEMBER_END.match
+        skip = cls.WHITESPACE.match
+        index += 1
+        first = skip(text, index).end()
+        if text[first : first + 1] == "}":
+            return first + 1
+
+        while True:
+            found = match_key(text, index)
+            if found is not None:
+                key, start = found.group(1), found.end()
+            else:
+                # Keys with escapes, or malformed input.
+                index = skip(text, index).end()
+                if text[index : index + 1] != '"':
+                    raise json.JSONDecodeError(
+                        "Expecting property name enclosed in double quotes", text, index
+                    )
+                key, index = json.decoder.scanstring(text, index + 1)
+                index = skip(text, index).end()
+                if text[index : index + 1] != ":":
+                    raise json.JSONDecodeError("Expecting ':' delimiter", text, index)
+                start = skip(text, index + 1).end()
+
+            end = member(key, start)
+            found = match_end(text, end)
+            if found is None:
+                raise json.JSONDecodeError(
+                    "Expecting ',' delimiter", text, skip(text, end).end()
+                )
+            index = found.end()
+            if found.group(1) == "}":
+                return index
+
+    @classmethod
+    def load(cls, f) -> dict:
+        """Parse a snapshot, turning every item into a row as soon as it is decoded.
+
+        Only the values directly under the top-level "items" key are rows;
+        every other key (id_counter, aggregates, search, ...) is decoded as
+        plain JSON, whatever its objects look like.
+        """
+        table = cls()
+        descriptions = table.descriptions
+        # Bound methods hoisted out of the member callback, which runs once per item.
+        scan = json.JSONDecoder().scan_once
+        add_description = descriptions.append
+        add_date = table.dates.append
+        add_cents = table.cents.append
+        add_category = table.categories.append
+        known_ordinal = table._ordinals.get
+        known_code = table.category_codes.get
+        text = f.read()
+        rows = {}
+        ledger = {}
+
+        def decode(start: int) -> tuple:
+            try:
+                return scan(text, start)
+            except StopIteration as e:
+                raise json.JSONDecodeError("Expecting value", text, e.value) from None
+
+        def item_member(key: str, start: int) -> int:
+            value, end = decode(start)
+            code = known_code(value.get("category", "General"))
+            if code is None:
+                code = table.code(value["category"])
+            add_description(value["description"])
+            add_date(known_ordinal(value["date"]) or table.ordinal(value["date"]))
+            add_cents(round(value["amount"] * 100))
+            add_category(code)
+            rows[key] = len(descriptions) - 1
+            return end
+
+        def ledger_member(key: str, start: int) -> int:
+            if key == "items":
+                return cls._scan_object(text, start, item_member)
+            ledger[key], end = decode(start)
+            return end
+
+        end = cls._scan_object(text, cls.WHITESPACE.match(text).end(), ledger_member)
+        if cls.WHITESPACE.match(text, end).end() != len(text):
+            raise json.JSONDecodeError("Extra data", text, end)
+
+        if rows:
+            table.row_of = array("i", [-1]) * (max(map(int, rows)) + 1)
+            for key, row in rows.items():
+                table.row_of[int(key)] = row
+            table.length = len(rows)
+        ledger["items"] = table
+        return ledger
+
+    def code(self, category: str) -> int:
+        code = self.category_codes.get(category)
+        if code is None:
+            code = self.category_codes[category] = len(self.category_names)
+            self.category_names.append(category)
+        return code
+
+    def ordinal(self, iso_date: str) -> int:
+        ordinal = self._ordinals.get(iso_date)
+        if ordinal is None:
+            ordinal = date.fromisoformat(iso_date).toordinal()
+            self._ordinals[iso_date] = ordinal
+            self._iso_dates[ordinal] = iso_date
+        return ordinal
+
+    def iso_date(self, ordinal: int) -> str:
+        text = self._iso_dates.get(ordinal)
+        if text is None:
+            text = self._iso_dates[ordinal] = date.fromordinal(ordinal).isoformat()
+        return text
+
+    def store(self, item: dict, row: int | None = None) -> int:
+        """Write an item into a row (a free one by default) and return the row"""
+        ordinal = self.ordinal(item["date"])
+        cents = round(item["amount"] * 100)
+        code = self.category_codes.get(item.get("category", "General"))
+        if code is None:
+            code = self.code(item["category"])
+
+        if row is None and self.free_rows:
+            row = self.free_rows.pop()
+        if row is None:
+            row = len(self.descriptions)
+            self.descriptions.append(item["description"])
+            self.dates.append(ordinal)
+            self.cents.append(cents)
+            self.categories.append(code)
+        else:
+            self.descriptions[row] = item["description"]
+            self.dates[row] = ordinal
+            self.cents[row] = cents
+            self.categories[row] = code
+        return row
+
+    def bind(self, item_id: int, row: int) -> None:
+        if item_id >= len(self.row_of):
+            self.row_of.extend([-1] * (item_id + 1 - len(self.row_of)))
+        self.row_of[item_id] = row
+        self.length = self.length + 1
+
+    def row(self, key) -> int:
+        """The row of an ID, or -1"""
+        key = str(key)
+        if not key.isdigit() or int(key) >= len(self.row_of):
+            return -1
+        return self.row_of[int(key)]
+
+    def item(self, row: int) -> dict:
+        return {
+            "description": self.descriptions[row],
+            "amount": self.cents[row] / 100,
+            "date": self.iso_date(self.dates[row]),
+            "category": self.category_names[self.categories[row]],
+        }
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __contains__(self, key) -> bool:
+        return self.row(key) >= 0
+
+    def __getitem__(self, key) -> dict:
+        row = self.row(key)
+        if row < 0:
+            raise KeyError(key)
+        return self.item(row)
+
+    def get(self, key, default=None):
+        row = self.row(key)
+        return self.item(row) if row >= 0 else default
+
+    def __setitem__(self, key, item: dict) -> None:
+        row = self.row(key)
+        if row >= 0:
+            self.store(item, row)
+        else:
+            self.bind(int(key), self.store(item))
+
+    def patch(self, key, fields: dict) -> None:
+        self[key] = {**self[key], **fields}
+
+    def pop(self, key) -> dict:
+        item = self[key]
+        row = self.row(key)
+        self.row_of[int(key)] = -1
+        self.descriptions[row] = None
+        self.free_rows.append(row)
+        self.length = self.length - 1
+        return item
+
+    def ids(self):
+        """Yield every used ID with its row, in ID order"""
+        for item_id, row in enumerate(self.row_of):
+            if row >= 0:
+                yield item_id, row
+
+    def keys(self):
+        return (str(item_id) for item_id, _ in self.ids())
+
+    __iter__ = keys
+
+    def items(self):
+        return ((str(item_id), self.item(row)) for item_id, row in self.ids())
+
+    def values(self):
+        return (self.item(row) for _, row in self.ids())
+
+    def matching(
+        self,
+        category: str | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+    ):
+        """Yield the (id, row) pairs passing the filters, compared as integers"""
+        code = None if category is None else self.category_codes.get(category, -1)
+        low = date.fromisoformat(date_from).toordinal() if date_from else None
+        high = date.fromisoformat(date_to).toordinal() if date_to else None
+
+        for item_id, row in self.ids():
+            if code is not None and self.categories[row] != code:
+                continue
+            if low is not None and self.dates[row] < low:
+                continue
+            if high is not None and self.dates[row] > high:
+                continue
+            yield item_id, row
+
+    def sort_key(self, sort: str):
+        """Order (id, row) pairs by ID, or by date or amount then ID"""
+        if sort == "date":
+            return lambda pair: (self.dates[pair[1]], pair[0])
+        if sort == "amount":
+            return lambda pair: (self.cents[pair[1]], pair[0])
+        return lambda pair: pair[0]
+
+    def columns(self):
+        """Yield (date, category, amount) for every item"""
+        for _, row in self.ids():
+            yield (
+                self.iso_date(self.dates[row]),
+                self.category_names[self.categories[row]],
+                self.cents[row] / 100,
+            )
 
-                with open(file_path, "r") as f:
-                    dict_object = json.load(f)
-                    return dict_object
+    def dump(self, f) -> None:
+        """Write the items as a JSON object, one item per line"""
+        f.write("{")
+        separator = "\n"
+        for key, item in self.items():
+            f.write(f"{separator}        {json.dumps(key)}: {json.dumps(item)}")
+            separator = ",\n"
+        f.write("\n    }" if self.length else "}")
+
+
+class JournalStore:
+    """JSON snapshot plus an append-only journal of mutations.
+
+    The snapshot keeps the ``id_counter`` + ``items`` layout. Every
+    add/update/delete made since the last compaction is appended to the journal
+    as a single JSON line, so a write costs a few hundred bytes whatever the size
+    of the ledger. Nothing is read until the ledger is first used; loading then
+    replays the journal on top of the snapshot.
+    """
+
+    def __init__(self, snapshot_path: Path) -> None:
+        self.snapshot_path = Path(snapshot_path)
+        self.journal_path = self.snapshot_path.with_suffix(".journal")
+        self.pending = []
+        self.journal_length = 0
+        self._data = None
+        self._aggregates = None
+        self._search = None
+        self._ids = None
+
+    @property
+    def data(self) -> dict:
+        """The ledger, loaded from disk on first access"""
+        if self._data is None:
+            self._data = self._load_snapshot()
+            self._ids = IdAllocator.from_json(self._data["id_counter"])
+            aggregates = self._data.get("aggregates", {})
+            if all(key in aggregates for key in AggregateIndex.KEYS):
+                self._aggregates = AggregateIndex(self._data["aggregates"])
+            else:
+                # Older snapshots: rebuilt on first use.
+                self._data.pop("aggregates", None)
+            if "search" in self._data:
+                self._search = SearchIndex(self._data["search"])
+            self.journal_length = self._replay_journal()
+        return self._data
+
+    @property
+    def aggregates(self) -> AggregateIndex:
+        """The summary totals; built on first use for snapshots that lack them"""
+        if self.data.get("aggregates") is None:
+            self.data["aggregates"] = AggregateIndex.build(self.items.values()).totals
+            self._aggregates = AggregateIndex(self.data["aggregates"])
+        return self._aggregates
+
+    @property
+    def search_index(self) -> SearchIndex:
+        """The description token index; built on first use for snapshots that lack it"""
+        if self.data.get("search") is None:
+            self._search = SearchIndex.build(self.items.items())
+            self.data["search"] = self._search.postings
+        return self._search
+
+    def _track(self, item_id: str, item: dict, sign: int) -> None:
+        if self._aggregates is not None:
+            self._aggregates.adjust(item, sign)
+        if self._search is not None:
+            self._search.adjust(item_id, item, sign)
+
+    def _load_snapshot(self) -> dict:
+        """Load the snapshot file, or an empty ledger if it is missing"""
+        try:
+            if self.snapshot_path.exists():
+                with open(self.snapshot_path, "r") as f:
+                    return RecordTable.load(f)
+            else:
+                return {
+                    "id_counter": {"counter": 1, "free_ranges": []},
+                    "items": RecordTable(),
+                }
 
         except IOError as e:
             UI.print_error(f"IO Error during load: {e}")
@@ -156,47 +1050,2003 @@ class Expense:
             UI.print_error(f"Unexpected error: {e}")
             sys.exit(1)
 
-    python_json_object = _load_python_object(file_path)
-    id_counter = 1
-    available_ids = []
+    def _replay_journal(self) -> int:
+        """Apply the journal tail to the snapshot and return its length"""
+        if not self.journal_path.exists():
+            return 0
 
-    @classmethod
-    def _load_counter(cls) -> None:
-        """Load ID counter"""
+        applied = 0
         try:
-            cls.id_counter = cls.python_json_object.get("id_counter").get("counter")
-            cls.available_ids = cls.python_json_object.get("id_counter").get(
-                "available_ids"
-            )
-        except Exception as e:
-            UI.print_error(f"Error loading counter: {e}")
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from an interrupted append.
+                        break
+                    self._apply(entry, replay=True)
+                    applied = applied + 1
+
+        except IOError as e:
+            UI.print_error(f"IO Error during journal replay: {e}")
             sys.exit(1)
 
-    @classmethod
-    def _write_counter(cls) -> None:
-        """Write new counter"""
+        return applied
+
+    def _write_snapshot(self, ledger: dict) -> None:
+        """Atomically replace the snapshot file, streaming the items row by row"""
+        temp_path = self.snapshot_path.with_suffix(".json.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write("{\n")
+            for key, value in ledger.items():
+                if key != "items":
+                    f.write(f"    {json.dumps(key)}: {json.dumps(value)},\n")
+            f.write('    "items": ')
+            ledger["items"].dump(f)
+            f.write("\n}\n")
+        os.replace(temp_path, self.snapshot_path)
+
+    @property
+    def items(self) -> dict:
+        return self.data["items"]
+
+    @property
+    def ids(self) -> IdAllocator:
+        self.data
+        return self._ids
+
+    def next_id(self) -> int:
+        """Return the ID the next add will use"""
+        return self.ids.peek()
+
+    def _apply(self, entry: dict, replay: bool = False) -> None:
+        """Apply one journal entry to the in-memory ledger.
+
+        Entries carry absolute values, so replaying a journal that was already
+        folded into the snapshot (a crash during ``compact``) converges to the
+        same state; on replay, entries for missing IDs are skipped.
+        """
+        op = entry["op"]
+        item_id = entry["id"]
+
+        if op == "add":
+            if item_id in self.items:
+                self._track(item_id, self.items[item_id], -1)
+            self.items[item_id] = dict(entry["item"])
+            self._track(item_id, self.items[item_id], 1)
+            self._ids.claim(int(item_id))
+        elif item_id not in self.items:
+            if replay:
+                return
+            raise KeyError(item_id)
+        elif op == "update":
+            self._track(item_id, self.items[item_id], -1)
+            self.items.patch(item_id, entry["fields"])
+            self._track(item_id, self.items[item_id], 1)
+        elif op == "delete":
+            self._track(item_id, self.items.pop(item_id), -1)
+            self._ids.release(int(item_id))
+
+    def record(self, entry: dict) -> None:
+        """Apply a mutation and queue it for the next commit"""
+        self._apply(entry)
+        self.pending.append(entry)
+
+    def commit(self) -> None:
+        """Append the queued mutations to the journal in one write"""
+        if not self.pending:
+            return
+
+        payload = "".join(
+            json.dumps(entry, separators=(",", ":")) + "\n" for entry in self.pending
+        )
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(payload)
+
+        self.journal_length = self.journal_length + len(self.pending)
+        self.pending = []
+
+    def rollback(self) -> None:
+        """Drop the queued mutations; the ledger is reloaded on next use"""
+        if not self.pending:
+            return
+        self.pending = []
+        self._data = None
+        self._aggregates = None
+        self._search = None
+        self._ids = None
+
+    def compact(self) -> int:
+        """Fold the journal into a fresh snapshot and return the folded count"""
+        self.commit()
+        self.data["id_counter"] = self.ids.to_json()
+        self.data["aggregates"] = self.aggregates.totals
+        self.data["search"] = self.search_index.to_json()
+        self._write_snapshot(self.data)
+        if self.journal_path.exists():
+            os.remove(self.journal_path)
+
+        folded = self.journal_length
+        self.journal_length = 0
+        return folded
+
+    def get(self, item_id: str) -> dict | None:
+        return self.items.get(str(item_id))
+
+    def signature(self) -> tuple:
+        """Size and mtime of the files, to spot writes made by another process"""
+        return tuple(
+            (path.stat().st_size, path.stat().st_mtime_ns) if path.exists() else None
+            for path in (self.snapshot_path, self.journal_path)
+        )
+
+    def count(self) -> int:
+        return len(self.items)
+
+    def iter_items(
+        self,
+        category: str | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+    ):
+        """Stream the (id, item) pairs matching the filters, ordered by ID"""
+        for item_id, row in self.items.matching(category, date_from, date_to):
+            yield str(item_id), self.items.item(row)
+
+    SORT_KEYS = {
+        "id": lambda pair: int(pair[0]),
+        "date": lambda pair: (pair[1]["date"], int(pair[0])),
+        "amount": lambda pair: (pair[1]["amount"], int(pair[0])),
+    }
+
+    def select_items(
+        self,
+        category: str | None = None,
+        sort: str = "id",
+        limit: int | None = None,
+        offset: int = 0,
+        descending: bool = False,
+    ) -> list:
+        """Filter, order and page the items.
+
+        The category filter runs first; a bounded page is picked with a heap
+        selection over the matches instead of sorting all of them. Sorting
+        reads the typed columns, so only the returned rows become dicts.
+        """
+        rows = self.items.matching(category)
+        key = self.items.sort_key(sort)
+        if limit is None:
+            rows = sorted(rows, key=key, reverse=descending)[offset:]
+        else:
+            select = heapq.nlargest if descending else heapq.nsmallest
+            rows = select(offset + limit, rows, key=key)[offset:]
+        return [(str(item_id), self.items.item(row)) for item_id, row in rows]
+
+    def columns(self):
+        """Yield (date, category, amount) for every item, in no particular order"""
+        return self.items.columns()
+
+    def total(self, month: int | None = None, category: str | None = None) -> float:
+        """Sum the amounts matching the month and/or category from the aggregates"""
+        return self.aggregates.total(month, category)
+
+    def range_total(
+        self, date_from: str | None = None, date_to: str | None = None
+    ) -> float:
+        """Sum the amounts dated between the two dates, both inclusive"""
+        return self.aggregates.range_total(date_from, date_to)
+
+    def sketches(self, period: str | None = None) -> dict:
+        return self.aggregates.sketches(period)
+
+    def aggregate_rows(self) -> dict:
+        return self.aggregates.rows()
+
+    def scan_aggregate_rows(self) -> dict:
+        """Recompute the aggregate rows by walking every item"""
+        return AggregateIndex.build(self.items.values()).rows()
+
+    def rank(
+        self,
+        terms: list,
+        category: str | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        limit: int | None = None,
+    ) -> list:
+        """Return the best (score, date, id) triples matching any term, best first"""
+        table = self.items
+        code = None if category is None else table.category_codes.get(category, -1)
+        low = date.fromisoformat(date_from).toordinal() if date_from else None
+        high = date.fromisoformat(date_to).toordinal() if date_to else None
+
+        matches = []
+        for item_id, score in self.search_index.score(terms).items():
+            row = table.row_of[item_id]
+            if code is not None and table.categories[row] != code:
+                continue
+            if low is not None and table.dates[row] < low:
+                continue
+            if high is not None and table.dates[row] > high:
+                continue
+            matches.append((score, table.dates[row], item_id))
+
+        if limit is None:
+            return sorted(matches, reverse=True)
+        return heapq.nlargest(limit, matches)
+
+    def search(
+        self,
+        terms: list,
+        category: str | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        limit: int | None = None,
+    ) -> list:
+        """Rank the items matching any term: best score first, then newest"""
+        matches = self.rank(terms, category, date_from, date_to, limit)
+        return [(str(item_id), self.items[str(item_id)]) for _, _, item_id in matches]
+
+    def reindex(self) -> None:
+        """Rebuild the aggregates and the search index, then persist them"""
+        self.data["aggregates"] = AggregateIndex.build(self.items.values()).totals
+        self._aggregates = AggregateIndex(self.data["aggregates"])
+        self._search = SearchIndex.build(self.items.items())
+        self.data["search"] = self._search.postings
+        self.compact()
+
+    def id_state(self) -> tuple[int, list]:
+        return self.ids.counter, self.ids.free_ids()
+
+    def bulk_load(self, items, counter: int, available_ids: list) -> None:
+        """Replace the whole ledger with the given items and ID state"""
+        self._ids = IdAllocator(counter, available_ids)
+        self._data = {
+            "id_counter": self._ids.to_json(),
+            "items": RecordTable.from_items(items),
+        }
+        self._data["aggregates"] = AggregateIndex.build(
+            self._data["items"].values()
+        ).totals
+        self._aggregates = AggregateIndex(self._data["aggregates"])
+        self._search = SearchIndex.build(self._data["items"].items())
+        self._data["search"] = self._search.to_json()
+        self.pending = []
+        self._write_snapshot(self._data)
+        if self.journal_path.exists():
+            os.remove(self.journal_path)
+        self.journal_length = 0
+
+
+class SqliteStore:
+    """SQLite persistence with indexes on date and category.
+
+    Mutations use the same journal entries as ``JournalStore``. Triggers keep
+    the ``aggregates`` table of per-month, per-category totals and the
+    ``daily`` table of per-day totals in step with ``items``, as well as the
+    ``sketches`` bin counts of a ``QuantileSketch`` per month and category
+    (``sketch_bin`` is registered on every connection). Filtered listings use
+    the date and category indexes. The
+    ``search_tokens`` table maps description tokens to IDs; it is kept up to
+    date by ``record`` with the same tokenizer as ``SearchIndex``.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS items (
+            id INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            amount REAL NOT NULL,
+            date TEXT NOT NULL,
+            category TEXT NOT NULL DEFAULT 'General'
+        );
+        CREATE INDEX IF NOT EXISTS idx_items_date ON items (date);
+        CREATE INDEX IF NOT EXISTS idx_items_month ON items (substr(date, 6, 2), amount);
+        CREATE INDEX IF NOT EXISTS idx_items_category ON items (category, amount);
+        CREATE TABLE IF NOT EXISTS available_ids (id INTEGER PRIMARY KEY);
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+        INSERT OR IGNORE INTO meta (key, value) VALUES ('id_counter', 1);
+
+        CREATE TABLE IF NOT EXISTS aggregates (
+            month TEXT NOT NULL,
+            category TEXT NOT NULL,
+            total REAL NOT NULL,
+            PRIMARY KEY (month, category)
+        );
+        CREATE TRIGGER IF NOT EXISTS aggregates_on_insert AFTER INSERT ON items BEGIN
+            INSERT INTO aggregates (month, category, total)
+            VALUES (substr(NEW.date, 1, 7), NEW.category, NEW.amount)
+            ON CONFLICT (month, category)
+            DO UPDATE SET total = ROUND(total + excluded.total, 2);
+        END;
+        CREATE TRIGGER IF NOT EXISTS aggregates_on_delete AFTER DELETE ON items BEGIN
+            UPDATE aggregates SET total = ROUND(total - OLD.amount, 2)
+            WHERE month = substr(OLD.date, 1, 7) AND category = OLD.category;
+        END;
+        CREATE TRIGGER IF NOT EXISTS aggregates_on_update AFTER UPDATE ON items BEGIN
+            UPDATE aggregates SET total = ROUND(total - OLD.amount, 2)
+            WHERE month = substr(OLD.date, 1, 7) AND category = OLD.category;
+            INSERT INTO aggregates (month, category, total)
+            VALUES (substr(NEW.date, 1, 7), NEW.category, NEW.amount)
+            ON CONFLICT (month, category)
+            DO UPDATE SET total = ROUND(total + excluded.total, 2);
+        END;
+        INSERT OR IGNORE INTO meta (key, value) VALUES ('aggregates_built', 0);
+
+        CREATE TABLE IF NOT EXISTS daily (
+            date TEXT PRIMARY KEY,
+            total REAL NOT NULL
+        ) WITHOUT ROWID;
+        CREATE TRIGGER IF NOT EXISTS daily_on_insert AFTER INSERT ON items BEGIN
+            INSERT INTO daily (date, total) VALUES (NEW.date, NEW.amount)
+            ON CONFLICT (date) DO UPDATE SET total = ROUND(total + excluded.total, 2);
+        END;
+        CREATE TRIGGER IF NOT EXISTS daily_on_delete AFTER DELETE ON items BEGIN
+            UPDATE daily SET total = ROUND(total - OLD.amount, 2) WHERE date = OLD.date;
+        END;
+        CREATE TRIGGER IF NOT EXISTS daily_on_update AFTER UPDATE ON items BEGIN
+            UPDATE daily SET total = ROUND(total - OLD.amount, 2) WHERE date = OLD.date;
+            INSERT INTO daily (date, total) VALUES (NEW.date, NEW.amount)
+            ON CONFLICT (date) DO UPDATE SET total = ROUND(total + excluded.total, 2);
+        END;
+        INSERT OR IGNORE INTO meta (key, value) VALUES ('daily_built', 0);
+
+        CREATE TABLE IF NOT EXISTS sketches (
+            month TEXT NOT NULL,
+            category TEXT NOT NULL,
+            bin TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (month, category, bin)
+        ) WITHOUT ROWID;
+        CREATE TRIGGER IF NOT EXISTS sketches_on_insert AFTER INSERT ON items BEGIN
+            INSERT INTO sketches (month, category, bin, count)
+            VALUES (substr(NEW.date, 1, 7), NEW.category, sketch_bin(NEW.amount), 1)
+            ON CONFLICT (month, category, bin) DO UPDATE SET count = count + 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS sketches_on_delete AFTER DELETE ON items BEGIN
+            UPDATE sketches SET count = count - 1
+            WHERE month = substr(OLD.date, 1, 7) AND category = OLD.category
+            AND bin = sketch_bin(OLD.amount);
+        END;
+        CREATE TRIGGER IF NOT EXISTS sketches_on_update AFTER UPDATE ON items BEGIN
+            UPDATE sketches SET count = count - 1
+            WHERE month = substr(OLD.date, 1, 7) AND category = OLD.category
+            AND bin = sketch_bin(OLD.amount);
+            INSERT INTO sketches (month, category, bin, count)
+            VALUES (substr(NEW.date, 1, 7), NEW.category, sketch_bin(NEW.amount), 1)
+            ON CONFLICT (month, category, bin) DO UPDATE SET count = count + 1;
+        END;
+        INSERT OR IGNORE INTO meta (key, value) VALUES ('sketches_built', 0);
+
+        CREATE TABLE IF NOT EXISTS search_tokens (
+            token TEXT NOT NULL,
+            id INTEGER NOT NULL,
+            PRIMARY KEY (token, id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_search_tokens_id ON search_tokens (id);
+        INSERT OR IGNORE INTO meta (key, value) VALUES ('search_built', 0);
+    """
+
+    COLUMNS = ("description", "amount", "date", "category")
+    BUILT_FLAGS = (
+        "aggregates_built",
+        "daily_built",
+        "search_built",
+        "sketches_built",
+    )
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = Path(db_path)
+        self._connection = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """The database connection, opened on first access"""
+        if self._connection is None:
+            try:
+                self._connection = sqlite3.connect(self.db_path)
+                self._connection.create_function(
+                    "sketch_bin", 1, QuantileSketch.key, deterministic=True
+                )
+                self._connection.executescript(self.SCHEMA)
+                self._connection.commit()
+
+                (built,) = self._connection.execute(
+                    "SELECT MIN(value) FROM meta "
+                    f"WHERE key IN ({', '.join(map(repr, self.BUILT_FLAGS))})"
+                ).fetchone()
+                if not built:
+                    self.reindex()
+            except sqlite3.Error as e:
+                UI.print_error(f"SQLite error during load: {e}")
+                sys.exit(1)
+        return self._connection
+
+    @staticmethod
+    def _row_to_item(row) -> dict:
+        return {
+            "description": row[1],
+            "amount": row[2],
+            "date": row[3],
+            "category": row[4],
+        }
+
+    def _index_tokens(self, item_id: int, description: str | None) -> None:
+        """Replace the search tokens of one item; None just drops them"""
+        self.connection.execute("DELETE FROM search_tokens WHERE id = ?", (item_id,))
+        if description is not None:
+            self.connection.executemany(
+                "INSERT INTO search_tokens (token, id) VALUES (?, ?)",
+                ((token, item_id) for token in SearchIndex.tokenize(description)),
+            )
+
+    def next_id(self) -> int:
+        """Return the ID the next add will use"""
+        (free_id,) = self.connection.execute(
+            "SELECT MIN(id) FROM available_ids"
+        ).fetchone()
+        if free_id is not None:
+            return free_id
+        return self.id_state()[0]
+
+    def record(self, entry: dict) -> None:
+        """Apply a mutation inside the current transaction"""
+        op = entry["op"]
+        item_id = int(entry["id"])
+        cursor = self.connection
+
+        if op == "add":
+            item = entry["item"]
+            cursor.execute("DELETE FROM items WHERE id = ?", (item_id,))
+            cursor.execute(
+                "INSERT INTO items (id, description, amount, date, category) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (item_id, *(item.get(column) for column in self.COLUMNS)),
+            )
+            cursor.execute("DELETE FROM available_ids WHERE id = ?", (item_id,))
+            cursor.execute(
+                "UPDATE meta SET value = MAX(value, ?) WHERE key = 'id_counter'",
+                (item_id + 1,),
+            )
+            self._index_tokens(item_id, item["description"])
+            return
+
+        if self.get(item_id) is None:
+            raise KeyError(entry["id"])
+
+        if op == "update":
+            fields = {k: v for k, v in entry["fields"].items() if k in self.COLUMNS}
+            assignments = ", ".join(f"{column} = ?" for column in fields)
+            cursor.execute(
+                f"UPDATE items SET {assignments} WHERE id = ?",
+                (*fields.values(), item_id),
+            )
+            if "description" in fields:
+                self._index_tokens(item_id, fields["description"])
+        elif op == "delete":
+            cursor.execute("DELETE FROM items WHERE id = ?", (item_id,))
+            cursor.execute("INSERT INTO available_ids (id) VALUES (?)", (item_id,))
+            self._index_tokens(item_id, None)
+
+    def commit(self) -> None:
+        if self._connection is not None:
+            self._connection.commit()
+
+    def rollback(self) -> None:
+        if self._connection is not None:
+            self._connection.rollback()
+
+    def compact(self) -> int:
+        """Reclaim free pages; SQLite has no journal to fold"""
+        self.connection.commit()
+        self.connection.execute("VACUUM")
+        return 0
+
+    def signature(self) -> None:
+        """SQLite sees other connections' writes by itself"""
+        return None
+
+    def get(self, item_id: str) -> dict | None:
+        if not str(item_id).isdigit():
+            return None
+        row = self.connection.execute(
+            "SELECT * FROM items WHERE id = ?", (int(item_id),)
+        ).fetchone()
+        return self._row_to_item(row) if row else None
+
+    def count(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def iter_items(
+        self,
+        category: str | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+    ):
+        """Stream the (id, item) pairs matching the filters, ordered by ID"""
+        clauses, params = [], []
+        if category is not None:
+            clauses.append("category = ?")
+            params.append(category)
+        if date_from is not None:
+            clauses.append("date >= ?")
+            params.append(date_from)
+        if date_to is not None:
+            clauses.append("date <= ?")
+            params.append(date_to)
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.connection.execute(
+            f"SELECT * FROM items{where} ORDER BY id", params
+        )
+        for row in rows:
+            yield str(row[0]), self._row_to_item(row)
+
+    SORT_COLUMNS = {"id": ("id",), "date": ("date", "id"), "amount": ("amount", "id")}
+
+    def select_items(
+        self,
+        category: str | None = None,
+        sort: str = "id",
+        limit: int | None = None,
+        offset: int = 0,
+        descending: bool = False,
+    ) -> list:
+        """Filter, order and page the items in one query"""
+        direction = " DESC" if descending else ""
+        order = ", ".join(f"{column}{direction}" for column in self.SORT_COLUMNS[sort])
+        where, params = "", []
+        if category is not None:
+            where, params = " WHERE category = ?", [category]
+
+        query = f"SELECT * FROM items{where} ORDER BY {order}"
+        if limit is not None:
+            query = query + " LIMIT ? OFFSET ?"
+            params = params + [limit, offset]
+        elif offset:
+            query = query + " LIMIT -1 OFFSET ?"
+            params = params + [offset]
+
+        return [
+            (str(row[0]), self._row_to_item(row))
+            for row in self.connection.execute(query, params)
+        ]
+
+    def columns(self):
+        """Yield (date, category, amount) for every item, in no particular order"""
+        return self.connection.execute("SELECT date, category, amount FROM items")
+
+    def total(self, month: int | None = None, category: str | None = None) -> float:
+        """Sum the amounts matching the month and/or category from the aggregates"""
+        clauses, params = [], []
+        if month is not None:
+            clauses.append("substr(month, 6, 2) = ?")
+            params.append(f"{int(month):02d}")
+        if category is not None:
+            clauses.append("category = ?")
+            params.append(category)
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        (summary,) = self.connection.execute(
+            f"SELECT TOTAL(total) FROM aggregates{where}", params
+        ).fetchone()
+        return round(summary, 2)
+
+    def range_total(
+        self, date_from: str | None = None, date_to: str | None = None
+    ) -> float:
+        """Sum the per-day totals between the two dates, both inclusive"""
+        (summary,) = self.connection.execute(
+            "SELECT TOTAL(total) FROM daily WHERE date BETWEEN ? AND ?",
+            (date_from or "", date_to or "9999-12-31"),
+        ).fetchone()
+        return round(summary, 2)
+
+    def sketches(self, period: str | None = None) -> dict:
+        """Assemble a QuantileSketch per month and category from the bin counts"""
+        sketches = {}
+        rows = self.connection.execute(
+            "SELECT month, category, bin, count FROM sketches "
+            "WHERE count > 0 AND month LIKE ?",
+            ((period or "") + "%",),
+        )
+        for month, category, key, count in rows:
+            sketch = sketches.setdefault((month, category), QuantileSketch())
+            sketch.state["count"] = sketch.state["count"] + count
+            sketch.state["bins"][key] = count
+
+        totals = self.connection.execute(
+            "SELECT month, category, total FROM aggregates WHERE month LIKE ?",
+            ((period or "") + "%",),
+        )
+        for month, category, total in totals:
+            if (month, category) in sketches:
+                sketches[(month, category)].state["sum"] = total
+        return sketches
+
+    def aggregate_rows(self) -> dict:
+        rows = self.connection.execute(
+            "SELECT month, category, total FROM aggregates WHERE total != 0"
+        )
+        return {(month, category): total for month, category, total in rows}
+
+    def scan_aggregate_rows(self) -> dict:
+        """Recompute the aggregate rows by walking every item"""
+        rows = self.connection.execute(
+            "SELECT substr(date, 1, 7), category, ROUND(TOTAL(amount), 2) "
+            "FROM items GROUP BY 1, 2"
+        )
+        return {(month, category): total for month, category, total in rows if total}
+
+    def search(
+        self,
+        terms: list,
+        category: str | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        limit: int | None = None,
+    ) -> list:
+        """Rank the items matching any term: best score first, then newest"""
+        if not terms:
+            return []
+
+        # One token range scan per term; exact hits weigh 2, prefix hits 1.
+        matches, params = [], []
+        for position, term in enumerate(terms):
+            matches.append(
+                f"SELECT id, {position} AS term, "
+                "MAX(CASE WHEN token = ? THEN 2 ELSE 1 END) AS weight "
+                "FROM search_tokens WHERE token >= ? AND token < ? GROUP BY id"
+            )
+            params.extend([term, term, term + "\U0010ffff"])
+
+        clauses = []
+        if category is not None:
+            clauses.append("items.category = ?")
+            params.append(category)
+        if date_from is not None:
+            clauses.append("items.date >= ?")
+            params.append(date_from)
+        if date_to is not None:
+            clauses.append("items.date <= ?")
+            params.append(date_to)
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = (
+            f"WITH matches AS ({' UNION ALL '.join(matches)}), "
+            "scores AS (SELECT id, SUM(weight) AS score FROM matches GROUP BY id) "
+            f"SELECT items.* FROM scores JOIN items USING (id){where} "
+            "ORDER BY scores.score DESC, items.date DESC, items.id DESC"
+        )
+        if limit is not None:
+            query = query + " LIMIT ?"
+            params.append(limit)
+
+        return [
+            (str(row[0]), self._row_to_item(row))
+            for row in self.connection.execute(query, params)
+        ]
+
+    def reindex(self) -> None:
+        """Rebuild the aggregates, daily totals and search tokens from the items"""
+        with self.connection:
+            self.connection.execute("DELETE FROM aggregates")
+            self.connection.execute(
+                "INSERT INTO aggregates (month, category, total) "
+                "SELECT substr(date, 1, 7), category, ROUND(TOTAL(amount), 2) "
+                "FROM items GROUP BY 1, 2"
+            )
+            self.connection.execute("DELETE FROM sketches")
+            self.connection.execute(
+                "INSERT INTO sketches (month, category, bin, count) "
+                "SELECT substr(date, 1, 7), category, sketch_bin(amount), COUNT(*) "
+                "FROM items GROUP BY 1, 2, 3"
+            )
+            self.connection.execute("DELETE FROM daily")
+            self.connection.execute(
+                "INSERT INTO daily (date, total) "
+                "SELECT date, ROUND(TOTAL(amount), 2) FROM items GROUP BY date"
+            )
+            self.connection.execute("DELETE FROM search_tokens")
+            self.connection.executemany(
+                "INSERT INTO search_tokens (token, id) VALUES (?, ?)",
+                (
+                    (token, item_id)
+                    for item_id, description in self.connection.execute(
+                        "SELECT id, description FROM items"
+                    )
+                    for token in SearchIndex.tokenize(description)
+                ),
+            )
+            self.connection.execute(
+                "UPDATE meta SET value = 1 "
+                f"WHERE key IN ({', '.join(map(repr, self.BUILT_FLAGS))})"
+            )
+
+    def id_state(self) -> tuple[int, list]:
+        (counter,) = self.connection.execute(
+            "SELECT value FROM meta WHERE key = 'id_counter'"
+        ).fetchone()
+        available_ids = [
+            row[0]
+            for row in self.connection.execute(
+                "SELECT id FROM available_ids ORDER BY id"
+            )
+        ]
+        return counter, available_ids
+
+    def bulk_load(self, items, counter: int, available_ids: list) -> None:
+        """Replace the whole ledger with the given items and ID state"""
+        with self.connection:
+            self.connection.execute("DELETE FROM items")
+            self.connection.execute("DELETE FROM available_ids")
+            self.connection.executemany(
+                "INSERT INTO items (id, description, amount, date, category) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    (
+                        int(key),
+                        item["description"],
+                        item["amount"],
+                        item["date"],
+                        item.get("category", "General"),
+                    )
+                    for key, item in items
+                ),
+            )
+            self.connection.executemany(
+                "INSERT INTO available_ids (id) VALUES (?)",
+                ((item_id,) for item_id in available_ids),
+            )
+            self.connection.execute(
+                "UPDATE meta SET value = ? WHERE key = 'id_counter'", (counter,)
+            )
+        self.reindex()
+
+
+class ShardedStore:
+    """One ``JournalStore`` per year-month, plus a small manifest.
+
+    The directory holds a ``YYYY-MM.json`` snapshot and journal per month and
+    ``manifest.json`` with the ID allocator and, per shard, its item count, the
+    lowest and highest ID it has held, and per-category counts, totals and
+    quantile sketches. Summaries and ``stats`` are answered from the manifest
+    alone, other commands open only
+    the shards their filters can match, and an add touches only the shard of
+    its date, so a write costs the same whatever the size of the history.
+    """
+
+    SHARD_NAME = re.compile(r"^\d{4}-\d{2}$")
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self.manifest_path = self.directory / "manifest.json"
+        self.shards = {}
+        self.dirty = set()
+        self._manifest = None
+        self._ids = None
+
+    @property
+    def manifest(self) -> dict:
+        """The manifest, loaded from disk on first access"""
+        if self._manifest is None:
+            try:
+                if self.manifest_path.exists():
+                    with open(self.manifest_path, "r") as f:
+                        self._manifest = json.load(f)
+                else:
+                    self._manifest = {
+                        "id_counter": {"counter": 1, "free_ranges": []},
+                        "shards": {},
+                    }
+
+            except IOError as e:
+                UI.print_error(f"IO Error during manifest load: {e}")
+                sys.exit(1)
+
+            except json.JSONDecodeError as e:
+                UI.print_error(f"Corrupt manifest: {e}")
+                sys.exit(1)
+
+            self._ids = IdAllocator.from_json(self._manifest["id_counter"])
+        return self._manifest
+
+    @property
+    def ids(self) -> IdAllocator:
+        self.manifest
+        return self._ids
+
+    def shard(self, month: str) -> JournalStore:
+        """The store of one year-month, opened lazily"""
+        if month not in self.shards:
+            self.shards[month] = JournalStore(self.directory / f"{month}.json")
+        return self.shards[month]
+
+    def _months(
+        self,
+        category: str | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+    ) -> list:
+        """The shards that can hold items matching the filters, oldest first"""
+        months = []
+        for month, stats in sorted(self.manifest["shards"].items()):
+            if category is not None and not stats["counts"].get(category):
+                continue
+            if date_from is not None and month < date_from[:7]:
+                continue
+            if date_to is not None and month > date_to[:7]:
+                continue
+            months.append(month)
+        return months
+
+    def _shard_files(self) -> set:
+        """The year-months that have a snapshot or journal on disk"""
+        if not self.directory.exists():
+            return set()
+        return {
+            path.stem
+            for path in self.directory.iterdir()
+            if path.suffix in (".json", ".journal") and self.SHARD_NAME.match(path.stem)
+        }
+
+    def _account(self, month: str, item_id: str, item: dict, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) one item from the shard statistics"""
+        item_id = int(item_id)
+        category = item.get("category", "General")
+        stats = self.manifest["shards"].setdefault(
+            month,
+            {
+                "count": 0,
+                "min_id": item_id,
+                "max_id": item_id,
+                "counts": {},
+                "totals": {},
+                "sketches": {},
+            },
+        )
+
+        stats["count"] = stats["count"] + sign
+        if sign > 0:
+            stats["min_id"] = min(stats["min_id"], item_id)
+            stats["max_id"] = max(stats["max_id"], item_id)
+
+        count = stats["counts"].get(category, 0) + sign
+        if count:
+            stats["counts"][category] = count
+        else:
+            stats["counts"].pop(category, None)
+        AggregateIndex._bump(stats["totals"], category, sign * item["amount"])
+
+        # Manifests written before the sketches were kept lack them; those
+        # are built whole from the shard the first time they are asked for.
+        if "sketches" in stats:
+            sketch = QuantileSketch(stats["sketches"].get(category))
+            stats["sketches"][category] = sketch.state
+            sketch.add(item["amount"], sign)
+            if not sketch.count:
+                del stats["sketches"][category]
+
+        if not stats["count"]:
+            del self.manifest["shards"][month]
+
+    def _locate(self, item_id: str) -> str | None:
+        """Find the shard holding an ID, trying the newest candidate first"""
+        if not str(item_id).isdigit() or self.ids.is_free(int(item_id)):
+            return None
+
+        candidates = [
+            month
+            for month, stats in self.manifest["shards"].items()
+            if stats["min_id"] <= int(item_id) <= stats["max_id"]
+        ]
+        for month in sorted(candidates, reverse=True):
+            if self.shard(month).get(str(item_id)) is not None:
+                return month
+        return None
+
+    def _insert(self, month: str, item_id: str, item: dict) -> None:
+        self.shard(month).record({"op": "add", "id": item_id, "item": item})
+        self._account(month, item_id, item, 1)
+        self.dirty.add(month)
+
+    def _remove(self, month: str, item_id: str) -> None:
+        item = dict(self.shard(month).get(item_id))
+        self.shard(month).record({"op": "delete", "id": item_id})
+        self._account(month, item_id, item, -1)
+        self.dirty.add(month)
+
+    def signature(self) -> tuple | None:
+        """Size and mtime of the manifest, which every commit rewrites"""
+        if not self.manifest_path.exists():
+            return None
+        stat = self.manifest_path.stat()
+        return stat.st_size, stat.st_mtime_ns
+
+    def get(self, item_id: str) -> dict | None:
+        month = self._locate(item_id)
+        return self.shard(month).get(str(item_id)) if month else None
+
+    def count(self) -> int:
+        return sum(stats["count"] for stats in self.manifest["shards"].values())
+
+    def next_id(self) -> int:
+        """Return the ID the next add will use"""
+        return self.ids.peek()
+
+    def record(self, entry: dict) -> None:
+        """Apply a mutation to the shards it touches and queue it for commit"""
+        op = entry["op"]
+        item_id = str(entry["id"])
+
+        if op == "add":
+            month = self._locate(item_id)
+            if month is not None:
+                self._remove(month, item_id)
+            self._insert(entry["item"]["date"][:7], item_id, dict(entry["item"]))
+            self.ids.claim(int(item_id))
+            return
+
+        month = self._locate(item_id)
+        if month is None:
+            raise KeyError(item_id)
+
+        if op == "update":
+            item = {**self.shard(month).get(item_id), **entry["fields"]}
+            # A new date can move the item into another shard.
+            self._remove(month, item_id)
+            self._insert(item["date"][:7], item_id, item)
+        elif op == "delete":
+            self._remove(month, item_id)
+            self.ids.release(int(item_id))
+
+    def _write_manifest(self) -> None:
+        """Atomically replace the manifest"""
+        self.manifest["id_counter"] = self.ids.to_json()
+        temp_path = self.manifest_path.with_suffix(".json.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            # dumps uses the C encoder; dump would stream through the Python one.
+            f.write(json.dumps(self.manifest, separators=(",", ":")))
+        os.replace(temp_path, self.manifest_path)
+
+    def commit(self) -> None:
+        """Append to the journals of the touched shards, then rewrite the manifest"""
+        if not self.dirty:
+            return
+
+        self.directory.mkdir(exist_ok=True)
+        for month in sorted(self.dirty):
+            self.shard(month).commit()
+        self._write_manifest()
+        self.dirty = set()
+
+    def rollback(self) -> None:
+        """Drop the queued mutations; shards and manifest are reloaded on next use"""
+        if not self.dirty:
+            return
+        for shard in self.shards.values():
+            shard.rollback()
+        self.dirty = set()
+        self._manifest = None
+        self._ids = None
+
+    def compact(self) -> int:
+        """Fold the journal of every shard that has one into its snapshot"""
+        self.commit()
+        folded = 0
+        for month in sorted(self._shard_files()):
+            if self.shard(month).journal_path.exists():
+                folded = folded + self.shard(month).compact()
+        return folded
+
+    def iter_items(
+        self,
+        category: str | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+    ):
+        """Stream the (id, item) pairs matching the filters, oldest shard first"""
+        for month in self._months(category, date_from, date_to):
+            yield from self.shard(month).iter_items(category, date_from, date_to)
+
+    def select_items(
+        self,
+        category: str | None = None,
+        sort: str = "id",
+        limit: int | None = None,
+        offset: int = 0,
+        descending: bool = False,
+    ) -> list:
+        """Pick each matching shard's best rows, then merge them"""
+        wanted = None if limit is None else offset + limit
+        rows = []
+        for month in self._months(category):
+            rows.extend(
+                self.shard(month).select_items(
+                    category, sort, limit=wanted, descending=descending
+                )
+            )
+
+        key = JournalStore.SORT_KEYS[sort]
+        if limit is None:
+            return sorted(rows, key=key, reverse=descending)[offset:]
+
+        select = heapq.nlargest if descending else heapq.nsmallest
+        return select(wanted, rows, key=key)[offset:]
+
+    def columns(self):
+        """Yield (date, category, amount) for every item, in no particular order"""
+        for month in self._months():
+            yield from self.shard(month).columns()
+
+    def total(self, month: int | None = None, category: str | None = None) -> float:
+        """Sum the amounts matching the month and/or category from the manifest"""
+        summary = 0
+        for year_month, stats in self.manifest["shards"].items():
+            if month is not None and int(year_month[5:7]) != int(month):
+                continue
+            if category is None:
+                summary = summary + sum(stats["totals"].values())
+            else:
+                summary = summary + stats["totals"].get(category, 0)
+        return round(summary, 2)
+
+    def range_total(
+        self, date_from: str | None = None, date_to: str | None = None
+    ) -> float:
+        """Sum whole months from the manifest; only the two edge shards are opened"""
+        summary = 0
+        for month in self._months(None, date_from, date_to):
+            whole_month = (
+                date_from is None
+                or date_from[:7] < month
+                or date_from == f"{month}-01"
+            ) and (date_to is None or date_to[:7] > month)
+
+            if whole_month:
+                totals = self.manifest["shards"][month]["totals"]
+                summary = summary + sum(totals.values())
+            else:
+                summary = summary + self.shard(month).range_total(date_from, date_to)
+        return round(summary, 2)
+
+    def search(
+        self,
+        terms: list,
+        category: str | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        limit: int | None = None,
+    ) -> list:
+        """Rank each matching shard, then merge: best score first, then newest"""
+        matches = []
+        for month in self._months(category, date_from, date_to):
+            ranked = self.shard(month).rank(terms, category, date_from, date_to, limit)
+            matches.extend((*match, month) for match in ranked)
+
+        key = lambda match: match[:3]
+        if limit is None:
+            matches.sort(key=key, reverse=True)
+        else:
+            matches = heapq.nlargest(limit, matches, key=key)
+        return [
+            (str(item_id), self.shard(month).get(str(item_id)))
+            for _, _, item_id, month in matches
+        ]
+
+    def sketches(self, period: str | None = None) -> dict:
+        """Read the sketches of the months in the period from the manifest"""
+        sketches = {}
+        upgraded = False
+        for month in self._months():
+            if period is not None and not month.startswith(period):
+                continue
+            stats = self.manifest["shards"][month]
+            if "sketches" not in stats:
+                shard_sketches = self.shard(month).sketches(month)
+                stats["sketches"] = {
+                    category: sketch.state
+                    for (_, category), sketch in shard_sketches.items()
+                }
+                upgraded = True
+            for category, state in stats["sketches"].items():
+                sketches[(month, category)] = QuantileSketch(state)
+
+        if upgraded and not self.dirty:
+            self._write_manifest()
+        return sketches
+
+    def aggregate_rows(self) -> dict:
+        return {
+            (month, category): total
+            for month, stats in self.manifest["shards"].items()
+            for category, total in stats["totals"].items()
+        }
+
+    def scan_aggregate_rows(self) -> dict:
+        """Recompute the aggregate rows by walking every shard on disk"""
+        rows = {}
+        for month in sorted(self._shard_files()):
+            rows.update(self.shard(month).scan_aggregate_rows())
+        return rows
+
+    def reindex(self) -> None:
+        """Rebuild every shard's indexes and the manifest statistics from the items"""
+        self.commit()
+        self.manifest["shards"] = {}
+        for month in sorted(self._shard_files()):
+            shard = self.shard(month)
+            shard.reindex()
+            for item_id, item in shard.iter_items():
+                self._account(month, item_id, item, 1)
+                self.ids.claim(int(item_id))
+        self.directory.mkdir(exist_ok=True)
+        self._write_manifest()
+
+    def id_state(self) -> tuple[int, list]:
+        return self.ids.counter, self.ids.free_ids()
+
+    def bulk_load(self, items, counter: int, available_ids: list) -> None:
+        """Replace the whole ledger with the given items, one shard per month"""
+        self.directory.mkdir(exist_ok=True)
+        for month in self._shard_files():
+            shard = self.shard(month)
+            for path in (shard.snapshot_path, shard.journal_path):
+                if path.exists():
+                    os.remove(path)
+
+        groups = {}
+        for key, item in items:
+            groups.setdefault(item["date"][:7], []).append((str(key), item))
+
+        self.shards = {}
+        self.dirty = set()
+        self._manifest = {"id_counter": {}, "shards": {}}
+        self._ids = IdAllocator(counter, available_ids)
+        for month, rows in groups.items():
+            self.shard(month).bulk_load(rows, counter, [])
+            for item_id, item in rows:
+                self._account(month, item_id, item, 1)
+        self._write_manifest()
+
+
+class BinaryStore:
+    """Fixed-width binary records, read through ``mmap``.
+
+    ``expenseDB.bin`` is a 64-byte header followed by one 32-byte record per
+    slot: ID, date ordinal, amount in cents, category code, and the length and
+    offset of the description in ``expenseDB.heap``, an append-only UTF-8 heap.
+    Summaries sum the amount column straight from the mapped file through
+    strided ``memoryview`` casts, so no item is decoded. Adds are appended and
+    updates and deletes overwrite their record in place; a delete leaves a
+    zeroed tombstone until ``compact``. Before a record is overwritten its old
+    bytes, and the committed header, are appended to ``expenseDB.undo``. The
+    header's record count and heap size are written last on commit and the
+    undo file is removed after it, so an interrupted write is rolled back on
+    the next open. Category names beyond ``CategoryList`` live in the heap as
+    a JSON list.
+    """
+
+    MAGIC = b"EXPBIN01"
+    # magic, version, record size, slots, live items, ID counter, heap size,
+    # offset and length of the category names in the heap
+    HEADER = struct.Struct("<8sIIQQQQQI4x")
+    RECORD = struct.Struct("<IiqHHIQ")
+    # offset and length of the old bytes that follow in the undo file
+    UNDO = struct.Struct("<QI")
+    VERSION = 1
+
+    def __init__(self, data_path: Path) -> None:
+        self.data_path = Path(data_path)
+        self.heap_path = self.data_path.with_suffix(".heap")
+        self.undo_path = self.data_path.with_suffix(".undo")
+        self._header = None
+        self._map = None
+        self._slots = None
+        self._ids = None
+        self._table = None
+        self._search = None
+        self._names = None
+        self.undo = []
+        self.dirty = False
+
+    ####### Files #######
+
+    def _finish_compaction(self) -> None:
+        """Roll an interrupted compact forward, or drop its half-written files"""
+        data_temp = self.data_path.with_suffix(".bin.tmp")
+        heap_temp = self.heap_path.with_suffix(".heap.tmp")
+        if data_temp.exists() and not heap_temp.exists():
+            os.replace(data_temp, self.data_path)
+        for path in (data_temp, heap_temp):
+            if path.exists():
+                os.remove(path)
+
+    def _restore(self, undo: list) -> None:
+        """Write back the old bytes of overwritten records, newest first"""
+        for start, payload in reversed(undo):
+            self._write_at(self.data_path, start, payload)
+        if self.undo_path.exists():
+            os.remove(self.undo_path)
+
+    def _roll_back_interrupted(self) -> None:
+        """Undo the overwrites of a commit that never finished"""
+        if not self.undo_path.exists():
+            return
+        with open(self.undo_path, "rb") as f:
+            raw = f.read()
+        undo = []
+        position = 0
+        while position + self.UNDO.size <= len(raw):
+            start, length = self.UNDO.unpack_from(raw, position)
+            position = position + self.UNDO.size + length
+            if position > len(raw):
+                # Cut short while being written; its record was not touched yet.
+                break
+            undo.append((start, raw[position - length : position]))
+        self._restore(undo)
+
+    @property
+    def header(self) -> dict:
+        """The committed header plus the in-memory state of pending writes"""
+        if self._header is None:
+            self._finish_compaction()
+            self._roll_back_interrupted()
+            self._header = {
+                "slots": 0,
+                "live": 0,
+                "counter": 1,
+                "heap_size": 0,
+                "names_offset": 0,
+                "names_length": 0,
+            }
+            if self.data_path.exists():
+                with open(self.data_path, "rb") as f:
+                    raw = f.read(self.HEADER.size)
+                if len(raw) < self.HEADER.size:
+                    UI.print_error(f"Corrupt binary ledger: {self.data_path}")
+                    sys.exit(1)
+                magic, version, record_size, *values = self.HEADER.unpack(raw)
+                if magic != self.MAGIC or record_size != self.RECORD.size:
+                    UI.print_error(f"Not a binary ledger: {self.data_path}")
+                    sys.exit(1)
+                self._header = dict(zip(self._header, values))
+        return self._header
+
+    @property
+    def names(self) -> list:
+        """Category names by code: CategoryList's, unless the heap holds a list"""
+        if self._names is None:
+            self._names = list(CategoryList.list_of_categories)
+            if self.header["names_length"]:
+                with open(self.heap_path, "rb") as f:
+                    f.seek(self.header["names_offset"])
+                    self._names = json.loads(f.read(self.header["names_length"]))
+        return self._names
+
+    def _pack_header(self, header: dict) -> bytes:
+        return self.HEADER.pack(
+            self.MAGIC, self.VERSION, self.RECORD.size, *header.values()
+        )
+
+    def _write_at(self, path: Path, offset: int, payload: bytes) -> None:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
         try:
-            with open(cls.file_path, "w", encoding="utf-8") as f:
-                cls.python_json_object["id_counter"]["counter"] = cls.id_counter
-                cls.python_json_object["id_counter"]["available_ids"] = (
-                    cls.available_ids
+            os.pwrite(fd, payload, offset)
+        finally:
+            os.close(fd)
+
+    @contextmanager
+    def _records(self):
+        """A memoryview of the used record slots of the mapped file"""
+        end = self.HEADER.size + self.header["slots"] * self.RECORD.size
+        if not self.header["slots"]:
+            yield memoryview(b"")
+            return
+        if self._map is None or len(self._map) < end:
+            with open(self.data_path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with memoryview(self._map)[self.HEADER.size : end] as records:
+            yield records
+
+    def _column(self, records: memoryview, code: str, index: int) -> memoryview:
+        """One field of every record, as a strided view of the mapped bytes"""
+        per_record = self.RECORD.size // struct.calcsize(code)
+        return records.cast(code)[index::per_record]
+
+    def _ids_column(self, records):
+        return self._column(records, "I", 0)
+
+    def _dates_column(self, records):
+        return self._column(records, "i", 1)
+
+    def _cents_column(self, records):
+        return self._column(records, "q", 1)
+
+    def _codes_column(self, records):
+        return self._column(records, "H", 8)
+
+    def _lengths_column(self, records):
+        return self._column(records, "I", 5)
+
+    def _offsets_column(self, records):
+        return self._column(records, "q", 3)
+
+    def _read_record(self, slot: int) -> tuple:
+        with self._records() as records:
+            start = slot * self.RECORD.size
+            return self.RECORD.unpack(records[start : start + self.RECORD.size])
+
+    def _description(self, offset: int, length: int) -> str:
+        with open(self.heap_path, "rb") as f:
+            f.seek(offset)
+            return f.read(length).decode("utf-8")
+
+    ####### Items #######
+
+    @property
+    def slots(self) -> array:
+        """ID -> slot (-1 when unused), built from the ID column on first use"""
+        if self._slots is None:
+            self._slots = array("i", [-1]) * self.header["counter"]
+            with self._records() as records:
+                for slot, item_id in enumerate(self._ids_column(records)):
+                    if item_id:
+                        self._slots[item_id] = slot
+        return self._slots
+
+    @property
+    def ids(self) -> IdAllocator:
+        """The allocator, with the unused IDs found by C-level scans of ``slots``"""
+        if self._ids is None:
+            slots = self.slots
+            free_ids = []
+            position = 1
+            # Slot 0 is never an ID; a ledger without gaps needs no search at all.
+            for _ in range(slots.count(-1) - 1):
+                position = slots.index(-1, position)
+                free_ids.append(position)
+                position = position + 1
+            self._ids = IdAllocator(self.header["counter"], free_ids)
+        return self._ids
+
+    def _code(self, category: str) -> int:
+        """The category's code, adding the name to the heap's list if it is new"""
+        if category not in self.names:
+            self.names.append(category)
+            payload = json.dumps(self.names).encode("utf-8")
+            self._write_at(self.heap_path, self.header["heap_size"], payload)
+            self.header["names_offset"] = self.header["heap_size"]
+            self.header["names_length"] = len(payload)
+            self.header["heap_size"] = self.header["heap_size"] + len(payload)
+        return self.names.index(category)
+
+    def _pack(self, item_id: int, item: dict) -> bytes:
+        """Append the description to the heap and pack the record"""
+        description = item["description"].encode("utf-8")
+        offset = self.header["heap_size"]
+        self._write_at(self.heap_path, offset, description)
+        self.header["heap_size"] = offset + len(description)
+        return self.RECORD.pack(
+            item_id,
+            date.fromisoformat(item["date"]).toordinal(),
+            round(item["amount"] * 100),
+            self._code(item.get("category", "General")),
+            0,
+            len(description),
+            offset,
+        )
+
+    def _unpack(self, record: tuple) -> dict:
+        _, ordinal, cents, code, _, length, offset = record
+        return {
+            "description": self._description(offset, length),
+            "amount": cents / 100,
+            "date": date.fromordinal(ordinal).isoformat(),
+            "category": self.names[code],
+        }
+
+    def _overwrite(self, slot: int, payload: bytes) -> None:
+        """Rewrite a record in place, saving the old bytes to the undo file first"""
+        start = self.HEADER.size + slot * self.RECORD.size
+        undo = [(start, self.RECORD.pack(*self._read_record(slot)))]
+        if not self.undo:
+            # The first overwrite also saves the header, which commit replaces.
+            with open(self.data_path, "rb") as f:
+                undo.insert(0, (0, f.read(self.HEADER.size)))
+
+        fd = os.open(self.undo_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(
+                fd,
+                b"".join(
+                    self.UNDO.pack(offset, len(old)) + old for offset, old in undo
+                ),
+            )
+        finally:
+            os.close(fd)
+        self.undo.extend(undo)
+        self._write_at(self.data_path, start, payload)
+
+    def signature(self) -> tuple | None:
+        """Size and mtime of the record file, whose header every commit rewrites"""
+        if not self.data_path.exists():
+            return None
+        stat = self.data_path.stat()
+        return stat.st_size, stat.st_mtime_ns
+
+    def get(self, item_id: str) -> dict | None:
+        item_id = str(item_id)
+        if not item_id.isdigit() or int(item_id) >= len(self.slots):
+            return None
+        slot = self.slots[int(item_id)]
+        return self._unpack(self._read_record(slot)) if slot >= 0 else None
+
+    def count(self) -> int:
+        return self.header["live"]
+
+    def next_id(self) -> int:
+        """Return the ID the next add will use"""
+        return self.ids.peek()
+
+    def record(self, entry: dict) -> None:
+        """Write a mutation to the files; it counts once commit writes the header"""
+        item_id = int(entry["id"])
+        slot = self.slots[item_id] if item_id < len(self.slots) else -1
+        if entry["op"] != "add" and slot < 0:
+            raise KeyError(entry["id"])
+
+        self._table = None
+        self._search = None
+        self.dirty = True
+        header = self.header
+
+        if entry["op"] == "add" and slot < 0:
+            slot = header["slots"]
+            start = self.HEADER.size + slot * self.RECORD.size
+            self._write_at(self.data_path, start, self._pack(item_id, entry["item"]))
+            header["slots"] = slot + 1
+            header["live"] = header["live"] + 1
+            if item_id >= len(self.slots):
+                self.slots.extend([-1] * (item_id + 1 - len(self.slots)))
+            self.slots[item_id] = slot
+            self.ids.claim(item_id)
+        elif entry["op"] == "add":
+            self._overwrite(slot, self._pack(item_id, entry["item"]))
+        elif entry["op"] == "update":
+            item = {**self._unpack(self._read_record(slot)), **entry["fields"]}
+            self._overwrite(slot, self._pack(item_id, item))
+        elif entry["op"] == "delete":
+            self._overwrite(slot, bytes(self.RECORD.size))
+            header["live"] = header["live"] - 1
+            self.slots[item_id] = -1
+            self.ids.release(item_id)
+
+        header["counter"] = self.ids.counter
+
+    def commit(self) -> None:
+        """Write the header, which makes the appended records and heap bytes count"""
+        if not self.dirty:
+            return
+        self._write_at(self.data_path, 0, self._pack_header(self.header))
+        if self.undo:
+            os.remove(self.undo_path)
+        self.undo = []
+        self.dirty = False
+
+    def _reset(self) -> None:
+        """Forget everything read from the files; it is read again on next use"""
+        self.undo = []
+        self.dirty = False
+        self._header = None
+        self._names = None
+        self._map = None
+        self._slots = None
+        self._ids = None
+        self._table = None
+        self._search = None
+
+    def rollback(self) -> None:
+        """Restore overwritten records and forget appends"""
+        if not self.dirty:
+            return
+        self._restore(self.undo)
+        self._reset()
+
+    def compact(self) -> int:
+        """Rewrite both files without tombstones or dead heap bytes.
+
+        Returns the number of tombstones dropped.
+        """
+        self.commit()
+        header = self.header
+        with self._records() as records:
+            used = sum(self._lengths_column(records)) + header["names_length"]
+        dropped = header["slots"] - header["live"]
+        if dropped or header["heap_size"] > used:
+            self._rewrite(self.iter_items(), header["counter"])
+        return dropped
+
+    def _rewrite(self, items, counter: int) -> None:
+        """Write a fresh pair of files through temporary ones, heap first"""
+        data_temp = self.data_path.with_suffix(".bin.tmp")
+        heap_temp = self.heap_path.with_suffix(".heap.tmp")
+        names = list(CategoryList.list_of_categories)
+        codes = {name: code for code, name in enumerate(names)}
+        header = {"slots": 0, "live": 0, "counter": counter, "heap_size": 0}
+
+        with open(data_temp, "wb") as data, open(heap_temp, "wb") as heap:
+            data.write(bytes(self.HEADER.size))
+            for item_id, item in items:
+                description = item["description"].encode("utf-8")
+                category = item.get("category", "General")
+                if category not in codes:
+                    codes[category] = len(names)
+                    names.append(category)
+                data.write(
+                    self.RECORD.pack(
+                        int(item_id),
+                        date.fromisoformat(item["date"]).toordinal(),
+                        round(item["amount"] * 100),
+                        codes[category],
+                        0,
+                        len(description),
+                        header["heap_size"],
+                    )
+                )
+                heap.write(description)
+                header["heap_size"] = header["heap_size"] + len(description)
+                header["slots"] = header["slots"] + 1
+                header["counter"] = max(header["counter"], int(item_id) + 1)
+            header["live"] = header["slots"]
+
+            header["names_offset"], header["names_length"] = 0, 0
+            if names != CategoryList.list_of_categories:
+                payload = json.dumps(names).encode("utf-8")
+                heap.write(payload)
+                header["names_offset"] = header["heap_size"]
+                header["names_length"] = len(payload)
+                header["heap_size"] = header["heap_size"] + len(payload)
+
+            data.seek(0)
+            data.write(self._pack_header(header))
+
+        os.replace(heap_temp, self.heap_path)
+        os.replace(data_temp, self.data_path)
+        self._reset()
+
+    ####### Queries #######
+
+    def total(self, month: int | None = None, category: str | None = None) -> float:
+        """Sum the amount column of the mapped records; tombstones hold 0"""
+        code = None
+        if category is not None:
+            if category not in self.names:
+                return 0
+            code = self.names.index(category)
+
+        with self._records() as records:
+            cents = self._cents_column(records)
+            if month is None and code is None:
+                return round(sum(cents) / 100, 2)
+
+            codes = self._codes_column(records)
+            if month is None:
+                summary = sum(c for c, k in zip(cents, codes) if k == code)
+                return round(summary / 100, 2)
+
+            # Month of each day from the first to the last; tombstones date 0.
+            dates = self._dates_column(records)
+            first = min((d for d in dates if d), default=0)
+            if not first:
+                return 0.0
+            months = bytes(
+                date.fromordinal(ordinal).month
+                for ordinal in range(first, max(d for d in dates if d) + 1)
+            )
+            summary = sum(
+                c
+                for c, d, k in zip(cents, dates, codes)
+                if d and months[d - first] == month and (code is None or k == code)
+            )
+        return round(summary / 100, 2)
+
+    def range_total(
+        self, date_from: str | None = None, date_to: str | None = None
+    ) -> float:
+        """Sum the amounts dated between the two dates from the mapped columns"""
+        low = date.fromisoformat(date_from).toordinal() if date_from else 1
+        high = date.max.toordinal()
+        if date_to:
+            high = date.fromisoformat(date_to).toordinal()
+        with self._records() as records:
+            cents = self._cents_column(records)
+            dates = self._dates_column(records)
+            summary = sum(c for c, d in zip(cents, dates) if low <= d <= high)
+        return round(summary / 100, 2)
+
+    def columns(self):
+        """Yield (date, category, amount) for every item, in no particular order"""
+        with self._records() as records:
+            rows = list(
+                zip(
+                    array("i", self._dates_column(records)),
+                    array("H", self._codes_column(records)),
+                    array("q", self._cents_column(records)),
+                    array("I", self._ids_column(records)),
+                )
+            )
+        iso_dates = {}
+        for ordinal, code, cents, item_id in rows:
+            if not item_id:
+                continue
+            text = iso_dates.get(ordinal)
+            if text is None:
+                text = iso_dates[ordinal] = date.fromordinal(ordinal).isoformat()
+            yield text, self.names[code], cents / 100
+
+    @property
+    def items(self) -> RecordTable:
+        """The whole ledger as a RecordTable, for the listing and search commands"""
+        if self._table is None:
+            table = RecordTable()
+            table.category_names = list(self.names)
+            table.category_codes = {name: code for code, name in enumerate(self.names)}
+            with self._records() as records:
+                table.dates = array("i", self._dates_column(records))
+                table.cents = array("q", self._cents_column(records))
+                table.categories = array("H", self._codes_column(records))
+                spans = list(
+                    zip(self._offsets_column(records), self._lengths_column(records))
                 )
-                json.dump(cls.python_json_object, f, indent=4)
+            # Descriptions are short, so reading the whole heap is cheapest.
+            heap = self.heap_path.read_bytes() if spans else b""
+            table.descriptions = [
+                heap[offset : offset + length].decode("utf-8")
+                for offset, length in spans
+            ]
+            table.row_of = array("i", self.slots)
+            table.length = self.header["live"]
+            self._table = table
+        return self._table
+
+    @property
+    def search_index(self) -> SearchIndex:
+        """A description index, built from the heap for each process that searches"""
+        if self._search is None:
+            self._search = SearchIndex.build(self.items.items())
+        return self._search
+
+    # These only read self.items and self.search_index.
+    iter_items = JournalStore.iter_items
+    select_items = JournalStore.select_items
+    rank = JournalStore.rank
+    search = JournalStore.search
+
+    def sketches(self, period: str | None = None) -> dict:
+        """Sketch the amounts of each year-month and category in the period.
+
+        Works on the integer columns: each distinct date and amount is turned
+        into a year-month and a sketch bin once, then the bins are counted.
+        """
+        with self._records() as records:
+            rows = zip(
+                array("I", self._ids_column(records)),
+                array("i", self._dates_column(records)),
+                array("H", self._codes_column(records)),
+                array("q", self._cents_column(records)),
+            )
+            groups = {}
+            months = {}
+            bins = {}
+            for item_id, ordinal, code, cents in rows:
+                if not item_id:
+                    continue
+                year_month = months.get(ordinal)
+                if year_month is None:
+                    year_month = date.fromordinal(ordinal).isoformat()[:7]
+                    if period is not None and not year_month.startswith(period):
+                        year_month = ""
+                    months[ordinal] = year_month
+                if not year_month:
+                    continue
+                key = bins.get(cents)
+                if key is None:
+                    key = bins[cents] = QuantileSketch.key(cents / 100)
+                group = groups.get((year_month, code))
+                if group is None:
+                    group = groups[(year_month, code)] = [0, 0, {}]
+                group[0] = group[0] + 1
+                group[1] = group[1] + cents
+                group[2][key] = group[2].get(key, 0) + 1
+
+        return {
+            (year_month, self.names[code]): QuantileSketch(
+                {"count": count, "sum": total / 100, "bins": counts}
+            )
+            for (year_month, code), (count, total, counts) in groups.items()
+        }
+
+    def aggregate_rows(self) -> dict:
+        """Sum every year-month and category from the mapped columns"""
+        rows = {}
+        for item_date, category, amount in self.columns():
+            group = (item_date[:7], category)
+            rows[group] = rows.get(group, 0) + amount
+        return {group: round(total, 2) for group, total in rows.items()}
+
+    scan_aggregate_rows = aggregate_rows
+
+    def reindex(self) -> None:
+        """There is no derived index to rebuild; compact the files instead"""
+        self.compact()
+
+    def id_state(self) -> tuple[int, list]:
+        return self.ids.counter, self.ids.free_ids()
+
+    def bulk_load(self, items, counter: int, available_ids: list) -> None:
+        """Replace the whole ledger with the given items and ID state"""
+        self.data_path.parent.mkdir(parents=True, exist_ok=True)
+        # An undo file left behind would otherwise be applied to the new files.
+        self._roll_back_interrupted()
+        self._rewrite(items, counter)
+
+
+STORAGE_BACKENDS = {
+    "json": ("expenseDB.json", JournalStore),
+    "sqlite": ("expenseDB.sqlite3", SqliteStore),
+    "sharded": ("expenseDB.shards", ShardedStore),
+    "binary": ("expenseDB.bin", BinaryStore),
+}
+
+
+############## Reports #################
+
+
+class ColumnarView:
+    """Column-oriented copy of the ledger for grouped sums.
+
+    Dates are kept as year-month ordinals (``year * 12 + month - 1``),
+    categories as codes into ``CategoryList.list_of_categories`` and amounts in
+    a float buffer, so grouping is a single pass over three flat arrays (or a
+    ``numpy.bincount`` when NumPy is installed).
+    """
+
+    def __init__(self, rows) -> None:
+        self.category_names = list(CategoryList.list_of_categories)
+        category_codes = {name: code for code, name in enumerate(self.category_names)}
+        month_ordinals = {}
+
+        self.months = array("q")
+        self.categories = array("H")
+        self.amounts = array("d")
+
+        for date, category, amount in rows:
+            month = month_ordinals.get(date)
+            if month is None:
+                month = int(date[:4]) * 12 + int(date[5:7]) - 1
+                month_ordinals[date] = month
+            code = category_codes.get(category)
+            if code is None:
+                code = category_codes[category] = len(self.category_names)
+                self.category_names.append(category)
+
+            self.months.append(month)
+            self.categories.append(code)
+            self.amounts.append(amount)
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    def pivot(self) -> tuple[list, list]:
+        """Sum amounts by (year-month, category).
+
+        Returns the sorted year-month ordinals and a matrix with one row per
+        ordinal and one column per category code.
+        """
+        if not self.amounts:
+            return [], []
+
+        first, last = min(self.months), max(self.months)
+        width = len(self.category_names)
+        cells = (last - first + 1) * width
+
+        if numpy is not None:
+            months = numpy.frombuffer(self.months, dtype=numpy.int64)
+            codes = numpy.frombuffer(self.categories, dtype=numpy.uint16)
+            keys = (months - first) * width + codes
+            sums = numpy.bincount(
+                keys, weights=numpy.frombuffer(self.amounts), minlength=cells
+            ).tolist()
+        else:
+            sums = [0.0] * cells
+            for month, code, amount in zip(self.months, self.categories, self.amounts):
+                sums[(month - first) * width + code] += amount
+
+        ordinals, matrix = [], []
+        for row_number in range(last - first + 1):
+            row = sums[row_number * width : (row_number + 1) * width]
+            if any(row):
+                ordinals.append(first + row_number)
+                matrix.append(row)
+        return ordinals, matrix
+
+
+############## Result Cache #################
+
+
+class ResultCache:
+    """On-disk LRU cache of the output of read commands.
+
+    Each entry is one ``<key>.out`` file; ``index.json`` keeps each entry's
+    size and last use plus the hit and miss counts. Keys include the ledger
+    generation, a counter in the ``generation`` file that every commit bumps,
+    so a write makes all earlier entries unreachable, and they age out as the
+    cache fills past ``max_bytes``.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        self.directory = Path(directory)
+        self.index_path = self.directory / "index.json"
+        self.generation_path = self.directory / "generation"
+        self.max_bytes = max_bytes
+        self._index = None
+
+    @property
+    def index(self) -> dict:
+        if self._index is None:
+            try:
+                with open(self.index_path, "r") as f:
+                    self._index = json.load(f)
+            except (IOError, json.JSONDecodeError):
+                self._index = {"hits": 0, "misses": 0, "entries": {}}
+        return self._index
+
+    def _replace(self, path: Path, text: str) -> None:
+        """Write a file through a temporary one, so readers never see half of it"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(temp_path, path)
+
+    def generation(self) -> int:
+        try:
+            return int(self.generation_path.read_text())
+        except (IOError, ValueError):
+            return 0
 
-        except IOError as e:
-            UI.print_error(f"Write error: {e}")
+    def bump(self) -> None:
+        """Start a new ledger generation after a write"""
+        self._replace(self.generation_path, str(self.generation() + 1))
+
+    @staticmethod
+    def key(*parts) -> str:
+        return hashlib.sha256(
+            json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """The cached output for key, or None on a miss"""
+        entry = self.index["entries"].get(key)
+        if entry is not None:
+            try:
+                output = (self.directory / f"{key}.out").read_text(encoding="utf-8")
+            except IOError:
+                del self.index["entries"][key]
+            else:
+                entry[1] = time.time()
+                self.index["hits"] = self.index["hits"] + 1
+                return output
+
+        self.index["misses"] = self.index["misses"] + 1
+        return None
+
+    def put(self, key: str, output: str) -> None:
+        """Store an output, then evict the least recently used past max_bytes"""
+        size = len(output.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        entries = self.index["entries"]
+        self._replace(self.directory / f"{key}.out", output)
+        entries[key] = [size, time.time()]
+
+        used = sum(entry_size for entry_size, _ in entries.values())
+        if used > self.max_bytes:
+            for old_key in sorted(entries, key=lambda old_key: entries[old_key][1]):
+                used = used - entries.pop(old_key)[0]
+                try:
+                    os.remove(self.directory / f"{old_key}.out")
+                except FileNotFoundError:
+                    pass
+                if used <= self.max_bytes:
+                    break
+
+    def save(self) -> None:
+        if self._index is not None:
+            self._replace(self.index_path, json.dumps(self._index))
+
+    def clear(self) -> int:
+        """Drop every entry and reset the counts; returns the entries removed"""
+        removed = len(self.index["entries"])
+        for key in self.index["entries"]:
+            try:
+                os.remove(self.directory / f"{key}.out")
+            except FileNotFoundError:
+                pass
+        self._index = {"hits": 0, "misses": 0, "entries": {}}
+        self.save()
+        return removed
+
+
+############## Expense Class #################
+
+
+class Expense:
+    @staticmethod
+    def _handle_path(file_name: str = "expenseDB.json") -> Path:
+        """Create and store the JSON in a specific path"""
+        home_path = os.getenv("HOME")
+        config_path = ".config/expense-tracker/"
+
+        config_directory = os.path.join(home_path, config_path)
+        full_path = os.path.join(home_path, config_path, file_name)
+
+        if not os.path.exists(config_directory):
+            try:
+                os.mkdir(config_directory)
+            except OSError:
+                pass  # Handle quietly or use print_error if strictly needed
+
+        return full_path
+
+    @classmethod
+    def _load_config(cls) -> dict:
+        """Load the optional config.json next to the ledger"""
+        config_path = Path(cls._handle_path("config.json"))
+        if not config_path.exists():
+            return {}
+
+        try:
+            with open(config_path, "r") as f:
+                return json.load(f)
+        except (IOError, json.JSONDecodeError) as e:
+            UI.print_error(f"Could not read config: {e}")
             sys.exit(1)
 
-        except Exception as e:
-            UI.print_error(f"Unexpected error: {e}")
+    @classmethod
+    def _save_config(cls, config: dict) -> None:
+        with open(cls._handle_path("config.json"), "w", encoding="utf-8") as f:
+            json.dump(config, f, indent=4)
+
+    @classmethod
+    def _open_store(cls, backend: str):
+        """Open the storage backend by name"""
+        file_name, store_class = STORAGE_BACKENDS[backend]
+        return store_class(Path(cls._handle_path(file_name)))
+
+    backend = "json"
+    store = None
+    deferred = False
+    cache = None
+
+    def __init__(self, backend: str | None = None) -> None:
+        Expense.backend = backend or Expense._load_config().get("backend", "json")
+        if Expense.backend not in STORAGE_BACKENDS:
+            UI.print_error(f"Unknown storage backend: {Expense.backend}")
             sys.exit(1)
 
+        Expense.store = Expense._open_store(Expense.backend)
+
     @classmethod
     def _final_writing(cls) -> None:
-        """Write the Python object into a JSON file"""
+        """Commit the pending mutations, unless a batch defers them"""
+        if cls.deferred:
+            return
+
         try:
-            with open(cls.file_path, "w", encoding="utf-8") as f:
-                json.dump(cls.python_json_object, f, indent=4)
+            cls.store.commit()
+            cls._result_cache().bump()
 
         except IOError as e:
             UI.print_error(f"Write error: {e}")
@@ -206,36 +3056,29 @@ class Expense:
             UI.print_error(f"Unexpected error: {e}")
             sys.exit(1)
 
-    def __init__(self) -> None:
-        Expense._load_counter()
-
     @classmethod
     def add_expense_record(cls, description: str, amount: float, category: str) -> None:
         """Add new item expense record"""
-        if cls.available_ids:
-            input_id = cls.available_ids.pop(0)
-        else:
-            input_id = cls.id_counter
-            cls.id_counter = cls.id_counter + 1
-
+        input_id = cls.store.next_id()
         input_description = description
         input_amount = amount
         date = datetime.now().strftime("%Y-%m-%d")
         input_category = category
 
-        cls.python_json_object["items"].update(
+        cls.store.record(
             {
-                str(input_id): {
+                "op": "add",
+                "id": str(input_id),
+                "item": {
                     "description": input_description,
                     "amount": input_amount,
                     "date": date,
                     "category": input_category,
-                }
+                },
             }
         )
 
         cls._final_writing()
-        cls._write_counter()
 
         UI.print_success(
             f"Expense added: {Theme.BOLD}{input_description}{Theme.RESET} "
@@ -246,17 +3089,15 @@ class Expense:
     def delete_item(cls, id: int) -> None:
         """Delete a ID."""
         try:
-            expense_item = cls.python_json_object["items"][id]
-            del cls.python_json_object["items"][id]
-        except (IndexError, KeyError):
+            expense_item = cls.store.get(id)
+            if expense_item is None:
+                raise KeyError(id)
+            cls.store.record({"op": "delete", "id": id})
+        except (IndexError, KeyError, ValueError):
             UI.print_error(f"ID {id} not found.")
             sys.exit(1)
 
-        cls.available_ids.append(int(id))
-        cls.available_ids.sort()
-
         cls._final_writing()
-        cls._write_counter()  # Ensure counter/available_ids are saved too
 
         item_description = expense_item.get("description")
 
@@ -265,47 +3106,292 @@ class Expense:
         )
 
     @classmethod
-    def list_items(cls, specific_category: str = "all") -> None:
-        """List all or a specific category of the item expenses."""
-        expense_items = cls.python_json_object.get("items")
+    def compact(cls) -> None:
+        """Fold the journal back into the snapshot"""
+        try:
+            folded = cls.store.compact()
+        except IOError as e:
+            UI.print_error(f"Write error: {e}")
+            sys.exit(1)
 
-        if not expense_items:
-            UI.print_info("No expenses found.")
+        UI.print_success(
+            f"Compacted the {cls.backend} ledger "
+            f"({Theme.BOLD}{folded}{Theme.RESET} journal entries folded)."
+        )
+
+    @classmethod
+    def reindex(cls, check_only: bool = False) -> None:
+        """Rebuild the summary aggregates, or compare them against a full scan"""
+        if not check_only:
+            cls.store.reindex()
+            UI.print_success(
+                "Summary aggregates and search index rebuilt from the items."
+            )
             return
 
-        print("")
-        UI.table_row("ID", "DATE", "DESCRIPTION", "CATEGORY", "AMOUNT", header=True)
-        print(
-            f" {Theme.OVERLAY}────── ┼ ────────────── ┼ ────────────────────────────── ┼ ────────────────────────────── ┼ ────────────{Theme.RESET}"
+        indexed = cls.store.aggregate_rows()
+        scanned = cls.store.scan_aggregate_rows()
+        mismatches = [
+            key
+            for key in sorted(set(indexed) | set(scanned))
+            if abs(indexed.get(key, 0) - scanned.get(key, 0)) >= 0.005
+        ]
+
+        if not mismatches:
+            UI.print_success(
+                f"Aggregates match a full scan ({len(scanned)} month/category totals)."
+            )
+            return
+
+        UI.print_error(f"{len(mismatches)} aggregate totals differ from a full scan:")
+        for year_month, category in mismatches:
+            print(
+                f"   {Theme.OVERLAY}{year_month} {category}:{Theme.RESET} "
+                f"index {UI.format_currency(indexed.get((year_month, category), 0))}, "
+                f"scan {UI.format_currency(scanned.get((year_month, category), 0))}"
+            )
+        print(f"   {Theme.OVERLAY}Run 'reindex' to rebuild them.{Theme.RESET}")
+        sys.exit(1)
+
+    @classmethod
+    def migrate(cls, target_backend: str, force: bool = False) -> None:
+        """Copy the whole ledger into another storage backend and switch to it"""
+        if target_backend == cls.backend:
+            UI.print_error(f"The ledger already uses the {target_backend} backend.")
+            sys.exit(1)
+
+        target = cls._open_store(target_backend)
+        if target.count() and not force:
+            UI.print_error(
+                f"The {target_backend} ledger is not empty; use --force to overwrite it."
+            )
+            sys.exit(1)
+
+        counter, available_ids = cls.store.id_state()
+        try:
+            target.bulk_load(cls.store.iter_items(), counter, available_ids)
+        except (IOError, sqlite3.Error) as e:
+            UI.print_error(f"Migration failed: {e}")
+            sys.exit(1)
+
+        config = cls._load_config()
+        config["backend"] = target_backend
+        cls._save_config(config)
+        cls._result_cache().bump()
+
+        UI.print_success(
+            f"Migrated {Theme.BOLD}{target.count()}{Theme.RESET} items from "
+            f"{cls.backend} to {Theme.BOLD}{target_backend}{Theme.RESET}; it is now the default backend."
         )
 
-        # Sort by ID for cleaner look
-        sorted_items = dict(
-            sorted(expense_items.items(), key=lambda item: int(item[0]))
+    @classmethod
+    def list_items(
+        cls,
+        specific_category: str = "all",
+        sort: str = "id",
+        limit: int | None = None,
+        offset: int = 0,
+        top: int | None = None,
+    ) -> None:
+        """List all or a specific category of the item expenses.
+
+        ``top`` picks the N largest items by the sort key (newest first for
+        ``date``); otherwise ``limit``/``offset`` page through ascending order.
+        """
+        if not cls.store.count():
+            UI.print_info("No expenses found.")
+            return
+
+        category_filter = None if specific_category == "all" else specific_category
+
+        if top is not None:
+            rows = cls.store.select_items(
+                category_filter, sort, limit=top, descending=True
+            )
+        else:
+            rows = cls.store.select_items(
+                category_filter, sort, limit=limit, offset=offset
+            )
+
+        cls._print_rows(rows)
+
+    @staticmethod
+    def _print_rows(rows) -> None:
+        """Write the (id, item) pairs as a table in a single write"""
+        lines = [
+            "",
+            UI.format_row("ID", "DATE", "DESCRIPTION", "CATEGORY", "AMOUNT", header=True),
+            f" {Theme.OVERLAY}────── ┼ ────────────── ┼ ────────────────────────────── ┼ ────────────────────────────── ┼ ────────────{Theme.RESET}",
+        ]
+
+        for key, item in rows:
+            lines.append(
+                UI.format_row(
+                    f"#{key}",
+                    item.get("date"),
+                    item.get("description"),
+                    item.get("category", "General"),
+                    UI.format_currency(item.get("amount")),
+                )
+            )
+
+        lines.append("\n")
+        sys.stdout.write("\n".join(lines))
+
+    @classmethod
+    def search(
+        cls,
+        query: list,
+        category: str | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        limit: int | None = 20,
+    ) -> None:
+        """Find expenses whose description matches the query words.
+
+        Each word matches whole description tokens or their prefixes; items
+        matching more words rank first, exact words beat prefixes, and ties are
+        listed newest first.
+        """
+        terms = sorted(SearchIndex.tokenize(" ".join(query)))
+        if not terms:
+            UI.print_error("The search query has no words in it.")
+            sys.exit(1)
+
+        rows = cls.store.search(terms, category, date_from, date_to, limit)
+        if not rows:
+            UI.print_info("No matching expenses found.")
+            return
+
+        cls._print_rows(rows)
+
+    @classmethod
+    def report(cls, year: int | None = None, as_csv: bool = False) -> None:
+        """Print the year-month by category spend matrix with totals"""
+        view = ColumnarView(cls.store.columns())
+        ordinals, matrix = view.pivot()
+
+        if year is not None:
+            rows = [
+                (ordinal, row)
+                for ordinal, row in zip(ordinals, matrix)
+                if ordinal // 12 == year
+            ]
+        else:
+            rows = list(zip(ordinals, matrix))
+
+        if not rows:
+            UI.print_info("No expenses found.")
+            return
+
+        used = [
+            code
+            for code in range(len(view.category_names))
+            if any(row[code] for _, row in rows)
+        ]
+        labels = [f"{ordinal // 12}-{ordinal % 12 + 1:02d}" for ordinal, _ in rows]
+        column_totals = [sum(row[code] for _, row in rows) for code in used]
+
+        if as_csv:
+            writer = csv.writer(sys.stdout)
+            writer.writerow(["month", *(view.category_names[c] for c in used), "total"])
+            for label, (_, row) in zip(labels, rows):
+                cells = [row[code] for code in used]
+                writer.writerow([label, *(f"{v:.2f}" for v in cells), f"{sum(cells):.2f}"])
+            writer.writerow(
+                ["total", *(f"{v:.2f}" for v in column_totals), f"{sum(column_totals):.2f}"]
+            )
+            return
+
+        cell_w = 12
+        sep = f"{Theme.OVERLAY}│{Theme.RESET}"
+
+        def cell(text: str, color: str) -> str:
+            if len(text) > cell_w:
+                text = text[: cell_w - 1] + "…"
+            return f"{color}{text:>{cell_w}}{Theme.RESET}"
+
+        header = Theme.MAUVE + Theme.BOLD
+        lines = [
+            "",
+            f" {header}{'MONTH':<8}{Theme.RESET} {sep} "
+            + " ".join(cell(view.category_names[code], header) for code in used)
+            + f" {sep} {cell('TOTAL', header)}",
+        ]
+        for label, (_, row) in zip(labels, rows):
+            cells = [row[code] for code in used]
+            lines.append(
+                f" {Theme.BLUE}{label:<8}{Theme.RESET} {sep} "
+                + " ".join(
+                    cell(f"{value:,.2f}" if value else "·", Theme.TEXT)
+                    for value in cells
+                )
+                + f" {sep} {cell(f'{sum(cells):,.2f}', Theme.GREEN)}"
+            )
+        lines.append(
+            f" {header}{'TOTAL':<8}{Theme.RESET} {sep} "
+            + " ".join(cell(f"{value:,.2f}", Theme.GREEN) for value in column_totals)
+            + f" {sep} {cell(f'{sum(column_totals):,.2f}', Theme.GREEN + Theme.BOLD)}"
         )
+        print("\n".join(lines) + "\n")
 
-        for key, item in sorted_items.items():
-            description = item.get("description")
-            amount = item.get("amount")
-            date = item.get("date")
-            category = item.get("category", "General")
+    STATS_QUANTILES = (("MEDIAN", 0.5), ("P90", 0.9), ("P99", 0.99), ("MAX", 1.0))
 
-            if category != specific_category and specific_category != "all":
+    @classmethod
+    def stats(
+        cls,
+        period: str | None = None,
+        category: str | None = None,
+        by: str = "category",
+    ) -> None:
+        """Count, mean and spend quantiles per category or per month.
+
+        Merges the per-month, per-category sketches instead of reading the
+        items; the quantiles are within 1% of the exact amounts.
+        """
+        groups = {}
+        overall = QuantileSketch()
+        for (month, item_category), sketch in cls.store.sketches(period).items():
+            if category is not None and item_category != category:
                 continue
+            key = month if by == "month" else item_category
+            groups.setdefault(key, QuantileSketch()).merge(sketch)
+            overall.merge(sketch)
+
+        if not overall.count:
+            UI.print_info("No expenses found.")
+            return
 
-            UI.table_row(
-                f"#{key}", date, description, category, UI.format_currency(amount)
+        header = Theme.MAUVE + Theme.BOLD
+        sep = f"{Theme.OVERLAY}│{Theme.RESET}"
+        names = ["COUNT", "MEAN", *(name for name, _ in cls.STATS_QUANTILES)]
+        label = "MONTH" if by == "month" else "CATEGORY"
+
+        def row(name: str, sketch: QuantileSketch, color: str) -> str:
+            values = [
+                f"{sketch.count:,}",
+                f"{sketch.mean():,.2f}",
+                *(f"{sketch.quantile(q):,.2f}" for _, q in cls.STATS_QUANTILES),
+            ]
+            return (
+                f" {color}{name[:24]:<24}{Theme.RESET} {sep} "
+                + " ".join(f"{Theme.TEXT}{value:>11}{Theme.RESET}" for value in values)
             )
-        print("")
+
+        lines = [
+            "",
+            f" {header}{label:<24}{Theme.RESET} {sep} "
+            + " ".join(f"{header}{name:>11}{Theme.RESET}" for name in names),
+        ]
+        for key in sorted(groups):
+            lines.append(row(key, groups[key], Theme.BLUE))
+        lines.append(row("ALL", overall, header))
+        print("\n".join(lines) + "\n")
 
     @classmethod
     def summary_of_all_items(cls) -> None:
         """Get the summary of all items"""
-        expense_items = cls.python_json_object.get("items")
-        summary = 0
-
-        for key, item in expense_items.items():
-            summary = summary + item["amount"]
+        summary = cls.store.total()
         UI.header("Total Expenses")
 
         print(
@@ -313,156 +3399,654 @@ class Expense:
         )
 
     @classmethod
-    def summary_items_by_month(cls, month: int) -> None:
-        """Summary of items by month"""
-        expense_items = cls.python_json_object.get("items")
-        summary = 0
+    def summary_items_by_month(cls, month: int) -> None:
+        """Summary of items by month"""
+        summary = cls.store.total(month=month)
+
+        month_name = datetime(2000, int(month), 1).strftime("%B")
+        UI.header(f"Expenses for {month_name}")
+
+        print(
+            f" {Theme.TEXT}Total:{Theme.RESET} {Theme.GREEN}{Theme.BOLD}{UI.format_currency(summary)}{Theme.RESET}\n"
+        )
+
+    @classmethod
+    def summary_items_by_dates(
+        cls, date_from: str | None = None, date_to: str | None = None
+    ) -> None:
+        """Summary of the items dated between two dates, both inclusive"""
+        if date_from and date_to and date_from > date_to:
+            UI.print_error("--from must not be after --to.")
+            sys.exit(1)
+
+        summary = cls.store.range_total(date_from, date_to)
+
+        if date_from and date_to:
+            UI.header(f"Expenses from {date_from} to {date_to}")
+        elif date_from:
+            UI.header(f"Expenses since {date_from}")
+        else:
+            UI.header(f"Expenses until {date_to}")
+
+        print(
+            f" {Theme.TEXT}Total:{Theme.RESET} {Theme.GREEN}{Theme.BOLD}{UI.format_currency(summary)}{Theme.RESET}\n"
+        )
+
+    @classmethod
+    def summary_items_rolling(cls, days: int) -> None:
+        """Summary of the last N days, today included"""
+        today = date.today()
+        cls.summary_items_by_dates(
+            (today - timedelta(days=days - 1)).isoformat(), today.isoformat()
+        )
+
+    @classmethod
+    def summary_items_by_category(cls, input_category: str) -> None:
+        """Summary of items by category"""
+        summary = cls.store.total(category=input_category)
+
+        UI.header(f"Expenses for {input_category}")
+
+        print(
+            f" {Theme.TEXT}Total:{Theme.RESET} {Theme.GREEN}{Theme.BOLD}{UI.format_currency(summary)}{Theme.RESET}\n"
+        )
+
+    @staticmethod
+    def _update_date() -> str:
+        """Update date"""
+        return datetime.now().strftime("%Y-%m-%d")
+
+    @staticmethod
+    def _validate_fields(fields: dict) -> dict:
+        """Validate new description/amount/category values before any write"""
+        validated = {}
+        if fields.get("description") is not None:
+            validated["description"] = str(fields["description"])
+        if fields.get("amount") is not None:
+            validated["amount"] = validate_amount(fields["amount"])
+        if fields.get("category") is not None:
+            if fields["category"] not in CategoryList.list_of_categories:
+                UI.print_error(f"Unknown category: {fields['category']}")
+                sys.exit(1)
+            validated["category"] = fields["category"]
+        return validated
+
+    @classmethod
+    def update_item(
+        cls,
+        id,
+        new_description: str | None = None,
+        new_amount=None,
+        new_category: str | None = None,
+    ) -> None:
+        """Update any of the description, amount and category in one write"""
+        fields = cls._validate_fields(
+            {
+                "description": new_description,
+                "amount": new_amount,
+                "category": new_category,
+            }
+        )
+        if not fields:
+            UI.print_error(
+                "Nothing to update: pass --description, --amount or --category."
+            )
+            sys.exit(1)
+
+        if cls.store.get(id) is None:
+            UI.print_error(f"ID {id} does not exist.")
+            sys.exit(1)
+
+        fields["date"] = cls._update_date()
+        cls.store.record({"op": "update", "id": id, "fields": fields})
+        cls._final_writing()
+
+        UI.print_success(f"Item {Theme.BOLD}#{id}{Theme.RESET} updated.")
+        if "description" in fields:
+            print(f"   {Theme.OVERLAY}New Desc:{Theme.RESET} {fields['description']}")
+        if "amount" in fields:
+            print(
+                f"   {Theme.OVERLAY}New Amount:{Theme.RESET} {Theme.GREEN}{UI.format_currency(fields['amount'])}{Theme.RESET}"
+            )
+        if "category" in fields:
+            print(
+                f"   {Theme.OVERLAY}New Category:{Theme.RESET} {Theme.GREEN}{fields['category']}{Theme.RESET}"
+            )
+
+    WHERE_FIELDS = ("description", "category", "date")
+
+    @staticmethod
+    def _parse_assignments(assignments: list, allowed: tuple, option: str) -> dict:
+        """Turn ['field=value', ...] into a dict, rejecting unknown fields"""
+        parsed = {}
+        for assignment in assignments:
+            field, sep, value = assignment.partition("=")
+            field = field.strip()
+            if not sep or field not in allowed:
+                UI.print_error(
+                    f"{option} expects FIELD=VALUE with FIELD one of: {', '.join(allowed)}."
+                )
+                sys.exit(1)
+            parsed[field] = value
+        return parsed
+
+    @classmethod
+    def update_where(cls, where: list, assignments: list) -> None:
+        """Apply the same field values to every matching item in one write.
+
+        Dates are left unchanged so a bulk recategorisation does not move the
+        rows into the current month.
+        """
+        conditions = cls._parse_assignments(where, cls.WHERE_FIELDS, "--where")
+        fields = cls._validate_fields(
+            cls._parse_assignments(
+                assignments, ("description", "amount", "category"), "--set"
+            )
+        )
+
+        matches = [
+            item_id
+            for item_id, item in cls.store.iter_items(conditions.get("category"))
+            if all(item.get(field) == value for field, value in conditions.items())
+        ]
+
+        for item_id in matches:
+            cls.store.record({"op": "update", "id": item_id, "fields": dict(fields)})
+        if matches:
+            cls._final_writing()
+
+        changes = ", ".join(f"{field}={value}" for field, value in fields.items())
+        UI.print_success(
+            f"Updated {Theme.BOLD}{len(matches)}{Theme.RESET} items ({changes})."
+        )
+
+    BATCH_COMMANDS = {
+        "add",
+        "delete",
+        "update",
+        "import",
+        "list",
+        "search",
+        "stats",
+        "summary",
+        "report",
+    }
+
+    @classmethod
+    def run_batch(cls, source: str, verbose: bool = False) -> None:
+        """Apply newline-delimited CLI commands against one load and one write.
+
+        Every command runs against the in-memory ledger with commits deferred.
+        If any line fails to parse or run, nothing is written.
+        """
+        try:
+            with cls._open_stream(source, "r", False) as f:
+                lines = f.read().splitlines()
+        except IOError as e:
+            UI.print_error(f"Could not read batch: {e}")
+            sys.exit(1)
+
+        parser = build_parser()
+        applied = 0
+        started = time.perf_counter()
+        cls.deferred = True
+
+        try:
+            for line_number, line in enumerate(lines, start=1):
+                if not line.strip() or line.lstrip().startswith("#"):
+                    continue
+
+                output = io.StringIO()
+                try:
+                    with redirect_stdout(output), redirect_stderr(output):
+                        args = parser.parse_args(shlex.split(line))
+                        if args.command not in cls.BATCH_COMMANDS:
+                            UI.print_error(
+                                f"'{args.command}' cannot run inside a batch."
+                            )
+                            sys.exit(1)
+                        if args.backend not in (None, cls.backend):
+                            UI.print_error("--backend cannot change inside a batch.")
+                            sys.exit(1)
+                        run_command(cls, args)
+
+                except SystemExit as e:
+                    if e.code:
+                        cls.store.rollback()
+                        sys.stdout.write(output.getvalue())
+                        UI.print_error(
+                            f"Batch aborted at line {line_number}: {line.strip()}\n"
+                            f"   Nothing was written."
+                        )
+                        sys.exit(1)
+                except Exception as e:
+                    cls.store.rollback()
+                    UI.print_error(f"Batch aborted at line {line_number}: {e}")
+                    sys.exit(1)
+
+                if verbose:
+                    sys.stdout.write(output.getvalue())
+                applied = applied + 1
+
+            applied_at = time.perf_counter()
+        finally:
+            cls.deferred = False
+
+        cls._final_writing()
+        finished = time.perf_counter()
+
+        elapsed = finished - started
+        UI.print_success(
+            f"Batch committed: {Theme.BOLD}{applied}{Theme.RESET} commands in "
+            f"{elapsed * 1000:.1f}ms ({applied / elapsed if elapsed else 0:,.0f} commands/s; "
+            f"commit {(finished - applied_at) * 1000:.1f}ms)."
+        )
+
+    CACHED_COMMANDS = {"list", "summary", "search", "report", "stats"}
+    CACHE_MAX_BYTES = 16 * 2**20
+
+    @classmethod
+    def _result_cache(cls) -> ResultCache:
+        if cls.cache is None:
+            cls.cache = ResultCache(
+                Path(cls._handle_path("cache")),
+                cls._load_config().get("cache_max_bytes", cls.CACHE_MAX_BYTES),
+            )
+        return cls.cache
+
+    @classmethod
+    def run_cached(cls, args: argparse.Namespace) -> None:
+        """Run a read command, or replay its output for an unchanged ledger.
+
+        The key holds the parsed arguments, the backend, the ledger generation,
+        the store's file signature (for edits made outside the CLI) and today's
+        date (for rolling windows). Only successful runs are cached, and a
+        ``cache_max_bytes`` of 0 turns the cache off.
+        """
+        cache = cls._result_cache()
+        if not cache.max_bytes:
+            run_command(cls, args)
+            return
 
-        for key, item in expense_items.items():
-            date = item["date"]
-            extracted_month = re.findall(r"^\d+\-(\d+)\-\d+", date)[0]
-            if int(extracted_month) == int(month):
-                summary = summary + item["amount"]
+        options = {
+            name: value
+            for name, value in vars(args).items()
+            if name not in ("backend", "timings", "profile")
+        }
+        key = cache.key(
+            options,
+            cls.backend,
+            cache.generation(),
+            cls.store.signature(),
+            date.today().isoformat(),
+        )
 
-            month_name = datetime(2000, int(month), 1).strftime("%B")
-        UI.header(f"Expenses for {month_name}")
+        output = cache.get(key)
+        if output is not None:
+            sys.stdout.write(output)
+            cache.save()
+            return
 
-        print(
-            f" {Theme.TEXT}Total:{Theme.RESET} {Theme.GREEN}{Theme.BOLD}{UI.format_currency(summary)}{Theme.RESET}\n"
-        )
+        buffer = io.StringIO()
+        try:
+            with redirect_stdout(buffer):
+                run_command(cls, args)
+            cache.put(key, buffer.getvalue())
+        finally:
+            sys.stdout.write(buffer.getvalue())
+            cache.save()
 
     @classmethod
-    def summary_items_by_category(cls, input_category: str) -> None:
-        """Summary of items by category"""
-        expense_items = cls.python_json_object.get("items")
-        summary = 0
-
-        for key, item in expense_items.items():
-            item_category = item.get("category", "General")
-            if input_category == item_category:
-                summary = summary + item["amount"]
+    def cache_command(cls, action: str) -> None:
+        """Report on or empty the result cache"""
+        cache = cls._result_cache()
+        if action == "clear":
+            removed = cache.clear()
+            UI.print_success(f"Removed {Theme.BOLD}{removed}{Theme.RESET} cached results.")
+            return
 
-        UI.header(f"Expenses for {input_category}")
+        index = cache.index
+        lookups = index["hits"] + index["misses"]
+        used = sum(size for size, _ in index["entries"].values())
+        hit_rate = index["hits"] / lookups if lookups else 0.0
 
+        UI.header("Result Cache")
         print(
-            f" {Theme.TEXT}Total:{Theme.RESET} {Theme.GREEN}{Theme.BOLD}{UI.format_currency(summary)}{Theme.RESET}\n"
+            f" {Theme.TEXT}Entries:{Theme.RESET} {len(index['entries'])} "
+            f"{Theme.OVERLAY}({UI.format_size(used)} of {UI.format_size(cache.max_bytes)}){Theme.RESET}\n"
+            f" {Theme.TEXT}Hits:{Theme.RESET} {index['hits']:,}  "
+            f"{Theme.TEXT}Misses:{Theme.RESET} {index['misses']:,}  "
+            f"{Theme.TEXT}Hit rate:{Theme.RESET} {Theme.GREEN}{Theme.BOLD}{hit_rate:.1%}{Theme.RESET}\n"
+            f" {Theme.TEXT}Ledger generation:{Theme.RESET} {cache.generation()}\n"
         )
 
+    SOCKET_NAME = "expense-tracker.sock"
+    DIRECT_COMMANDS = {None, "serve", "migrate"}
+    IDLE_SECONDS = 2.0
+    COMPACT_AFTER = 1000
+
     @staticmethod
-    def _update_date() -> str:
-        """Update date"""
-        return datetime.now().strftime("%Y-%m-%d")
+    def _receive(connection: socket.socket) -> bytes:
+        chunks = []
+        while chunk := connection.recv(65536):
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    @staticmethod
+    def _parse_request(payload: bytes) -> dict:
+        """Decode a client request; ValueError unless it is well formed"""
+        request = json.loads(payload)
+        if not isinstance(request, dict):
+            raise ValueError("the request must be a JSON object")
+        if request.get("stop") or request.get("ping"):
+            return request
+        if not isinstance(request.get("cwd"), str) or not (
+            isinstance(request.get("argv"), list)
+            and all(isinstance(arg, str) for arg in request["argv"])
+        ):
+            raise ValueError("the request needs a 'cwd' string and an 'argv' list")
+        return request
 
     @classmethod
-    def update_description(cls, id, new_description) -> None:
-        """Update the description of an item"""
-        try:
-            if id not in cls.python_json_object["items"]:
-                raise IndexError("ID not found")
+    def _request(cls, request: dict) -> dict | None:
+        """Send one request to the daemon; None if none is listening"""
+        path = cls._handle_path(cls.SOCKET_NAME)
+        if not os.path.exists(path):
+            return None
 
-            new_date = cls._update_date()
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.connect(path)
+                client.sendall(json.dumps(request).encode("utf-8"))
+                client.shutdown(socket.SHUT_WR)
+                return json.loads(cls._receive(client))
+        except (OSError, json.JSONDecodeError):
+            return None
 
-            cls.python_json_object["items"][id]["description"] = new_description
-            cls.python_json_object["items"][id]["date"] = new_date
+    @classmethod
+    def forward(cls, argv: list) -> int | None:
+        """Run a command line through a running daemon.
 
-            cls._final_writing()
+        Returns its exit code, or None when there is no daemon or the command
+        has to run in this process (stdin/stdout streams, another backend).
+        """
+        if not argv or "serve" in argv or "-" in argv:
+            return None
 
-            UI.print_success(f"Item {Theme.BOLD}#{id}{Theme.RESET} updated.")
-            print(f"   {Theme.OVERLAY}New Desc:{Theme.RESET} {new_description}")
+        reply = cls._request({"argv": argv, "cwd": os.getcwd()})
+        if reply is None or reply.get("fallback"):
+            return None
 
-        except IndexError:
-            UI.print_error(f"ID {id} does not exist.")
-            sys.exit(1)
+        sys.stdout.write(reply["output"])
+        return reply["code"]
 
     @classmethod
-    def update_amount(cls, id, new_amount) -> None:
-        """Update the amount of an item"""
-        try:
-            if id not in cls.python_json_object["items"]:
-                raise IndexError("ID not found")
-
-            new_date = cls._update_date()
+    def _execute(cls, parser: argparse.ArgumentParser, argv: list) -> dict:
+        """Run one forwarded command line against the resident ledger"""
+        output = io.StringIO()
+        code = 0
 
-            cls.python_json_object["items"][id]["amount"] = float(new_amount)
-            cls.python_json_object["items"][id]["date"] = new_date
-
-            cls._final_writing()
+        with redirect_stdout(output), redirect_stderr(output):
+            try:
+                args = parser.parse_args(argv)
+                backend = args.backend or cls._load_config().get("backend", "json")
+                if (
+                    args.command in cls.DIRECT_COMMANDS
+                    or backend != cls.backend
+                    or args.timings
+                    or args.profile
+                ):
+                    return {"fallback": True}
+                run_command(cls, args)
+
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else int(e.code is not None)
+            except Exception as e:
+                UI.print_error(f"Critical failure: {e}")
+                code = 1
+
+        if code:
+            # Whatever the failed command queued must not reach the next one.
+            cls.store.rollback()
+        return {"code": code, "output": output.getvalue()}
 
-            UI.print_success(f"Item {Theme.BOLD}#{id}{Theme.RESET} updated.")
-            print(
-                f"   {Theme.OVERLAY}New Amount:{Theme.RESET} {Theme.GREEN}{UI.format_currency(new_amount)}{Theme.RESET}"
-            )
+    @classmethod
+    def serve(cls, stop: bool = False) -> None:
+        """Keep the ledger in memory and answer CLI calls on a Unix socket.
+
+        Writes are committed before each reply; on the JSON backend the journal
+        is folded into the snapshot while the daemon is idle.
+        """
+        if stop:
+            if cls._request({"stop": True}) is None:
+                UI.print_error("No daemon is running.")
+                sys.exit(1)
+            UI.print_success("Daemon stopped.")
+            return
 
-        except IndexError:
-            UI.print_error(f"ID {id} does not exist.")
+        path = cls._handle_path(cls.SOCKET_NAME)
+        if cls._request({"ping": True}) is not None:
+            UI.print_error(f"A daemon is already listening on {path}")
             sys.exit(1)
-        except ValueError:
-            UI.print_error("Amount must be a number.")
-            sys.exit(1)
-
-    @classmethod
-    def update_category(cls, id, new_category: str) -> None:
-        """Update the category of an item"""
+        if os.path.exists(path):
+            os.remove(path)
+
+        # Load the ledger and build its indexes once, up front.
+        count = cls.store.count()
+        cls.store.total()
+        cls.store.search(["warmup"], limit=1)
+        parser = build_parser()
+        signature = cls.store.signature()
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Create the socket owner-only: no window where other users can connect.
+        umask = os.umask(0o177)
         try:
-            if id not in cls.python_json_object["items"]:
-                raise IndexError("ID not found")
+            server.bind(path)
+        finally:
+            os.umask(umask)
+        server.listen(16)
+        server.settimeout(cls.IDLE_SECONDS)
+        UI.print_success(
+            f"Serving the {cls.backend} ledger ({Theme.BOLD}{count}{Theme.RESET} items) "
+            f"on {path}"
+        )
 
-            new_date = cls._update_date()
+        try:
+            while True:
+                try:
+                    connection, _ = server.accept()
+                except socket.timeout:
+                    if (
+                        isinstance(cls.store, JournalStore)
+                        and cls.store.journal_length >= cls.COMPACT_AFTER
+                    ):
+                        cls.store.compact()
+                        signature = cls.store.signature()
+                    continue
+
+                with connection:
+                    connection.settimeout(30)
+                    try:
+                        request = cls._parse_request(cls._receive(connection))
+                        if request.get("stop"):
+                            connection.sendall(b"{}")
+                            break
+                        if request.get("ping"):
+                            connection.sendall(b"{}")
+                            continue
+
+                        if cls.store.signature() != signature:
+                            # Another process wrote to the ledger: drop the stale copy.
+                            cls.store = cls._open_store(cls.backend)
+
+                        os.chdir(request["cwd"])
+                        reply = cls._execute(parser, request["argv"])
+                        signature = cls.store.signature()
+                        connection.sendall(json.dumps(reply).encode("utf-8"))
+
+                    except (ValueError, OSError) as e:
+                        # A malformed, half-closed or silent client must not
+                        # take the daemon down; a real one runs the command itself.
+                        error = {"fallback": True, "error": str(e)}
+                        try:
+                            connection.sendall(json.dumps(error).encode("utf-8"))
+                        except OSError:
+                            pass
+
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.close()
+            if os.path.exists(path):
+                os.remove(path)
+
+    EXPORT_FIELDS = ["id", "description", "amount", "date", "category"]
 
-            cls.python_json_object["items"][id]["category"] = new_category
-            cls.python_json_object["items"][id]["date"] = new_date
+    @staticmethod
+    def _open_stream(path: str, mode: str, compress: bool):
+        """Open a text stream on a path, or on stdin/stdout for '-'"""
+        if path == "-":
+            standard = sys.stdout if mode == "w" else sys.stdin
+            if compress:
+                return gzip.open(standard.buffer, f"{mode}t", encoding="utf-8", newline="")
+            return nullcontext(standard)
+
+        if compress:
+            return gzip.open(path, f"{mode}t", encoding="utf-8", newline="")
+        return open(path, mode, encoding="utf-8", newline="")
 
-            cls._final_writing()
+    @classmethod
+    def export_items(
+        cls,
+        file_format: str = "csv",
+        output: str | None = None,
+        compress: bool = False,
+        category: str | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+    ) -> None:
+        """Stream the matching items to a CSV or JSONL file, or to stdout"""
+        if output is None:
+            output = f"expense_items.{file_format}" + (".gz" if compress else "")
+
+        rows = cls.store.iter_items(category, date_from, date_to)
+        exported = 0
 
-            UI.print_success(f"Item {Theme.BOLD}#{id}{Theme.RESET} updated.")
-            print(
-                f"   {Theme.OVERLAY}New Category:{Theme.RESET} {Theme.GREEN}{new_category}{Theme.RESET}"
-            )
+        try:
+            with cls._open_stream(output, "w", compress) as f:
+                if file_format == "csv":
+                    writer = csv.writer(f)
+                    writer.writerow(cls.EXPORT_FIELDS)
+                    for item_id, item in rows:
+                        writer.writerow(
+                            (
+                                item_id,
+                                item["description"],
+                                item["amount"],
+                                item["date"],
+                                item.get("category", "General"),
+                            )
+                        )
+                        exported = exported + 1
+                else:
+                    for item_id, item in rows:
+                        f.write(json.dumps({"id": item_id, **item}) + "\n")
+                        exported = exported + 1
 
-        except IndexError:
-            UI.print_error(f"ID {id} does not exist.")
-            sys.exit(1)
-        except ValueError:
-            UI.print_error("Category must be a valid string.")
+        except IOError as e:
+            UI.print_error(f"Could not write {file_format.upper()}: {e}")
             sys.exit(1)
 
-    @classmethod
-    def export_csv(cls) -> None:
-        expense_items = cls.python_json_object.get("items")
+        if output != "-":
+            UI.print_success(
+                f"Exported {exported} items to {Theme.BOLD}{output}{Theme.RESET}"
+            )
 
-        fieldnames = ["id", "description", "amount", "date", "category"]
+    @classmethod
+    def _read_import_rows(cls, source: str, file_format: str, compress: bool) -> list:
+        """Parse and validate every row before anything is written"""
+        items = []
+        with cls._open_stream(source, "r", compress) as f:
+            rows = csv.DictReader(f) if file_format == "csv" else map(json.loads, f)
+
+            for line_number, row in enumerate(rows, start=1):
+                try:
+                    try:
+                        amount = parse_amount(row["amount"])
+                    except ValueError:
+                        raise ValueError(
+                            f"amount must be a positive number, got {row['amount']!r}"
+                        )
+
+                    description = str(row["description"])
+                    if not description.strip():
+                        raise ValueError("description cannot be empty")
+
+                    category = row.get("category") or "General"
+                    if category not in CategoryList.list_of_categories:
+                        raise ValueError(f"unknown category {category!r}")
+
+                    date = row.get("date") or cls._update_date()
+                    datetime.strptime(date, "%Y-%m-%d")
+
+                except (KeyError, TypeError, ValueError) as e:
+                    raise ValueError(f"row {line_number}: {e}") from e
+
+                items.append(
+                    {
+                        "description": description,
+                        "amount": amount,
+                        "date": date,
+                        "category": category,
+                    }
+                )
+        return items
 
-        file_name = "expense_items.csv"
+    @classmethod
+    def import_items(
+        cls, source: str, file_format: str | None = None, compress: bool | None = None
+    ) -> None:
+        """Load CSV/JSONL rows as new expenses and commit them in one write"""
+        name = source[:-3] if source.endswith(".gz") else source
+        if compress is None:
+            compress = source.endswith(".gz")
+        if file_format is None:
+            file_format = "jsonl" if name.endswith((".jsonl", ".json")) else "csv"
 
         try:
-            with open(file_name, "w", encoding="utf-8", newline="") as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-
-                writer.writeheader()
+            items = cls._read_import_rows(source, file_format, compress)
+        except (IOError, ValueError) as e:
+            UI.print_error(f"Nothing imported: {e}")
+            sys.exit(1)
 
-                for user_id, info in expense_items.items():
-                    row = {"id": user_id}
-                    row.update(info)
+        for item in items:
+            cls.store.record(
+                {"op": "add", "id": str(cls.store.next_id()), "item": item}
+            )
+        cls._final_writing()
 
-                    writer.writerow(row)
+        UI.print_success(f"Imported {Theme.BOLD}{len(items)}{Theme.RESET} expenses.")
 
-            UI.print_success(f"Exported to {Theme.BOLD}{file_name}{Theme.RESET}")
 
-        except IOError as e:
-            UI.print_error(f"Could not write CSV: {e}")
+################## Helper methods & Classes ######################
 
 
-################## Helper methods & Classes ######################
+def parse_amount(input_amount: str) -> float:
+    """Round an amount to cents; ValueError unless it is positive and finite"""
+    input_amount = float(input_amount)
+    if not math.isfinite(input_amount):
+        raise ValueError("The input amount must be a finite number!")
+    input_amount = round(input_amount, 2)
+    if input_amount <= 0:
+        raise ValueError("The input amount cannot be ZERO or NEGATIVE!")
+    return input_amount
 
 
 def validate_amount(input_amount: str) -> float:
     """Validate the input amount"""
     try:
-        input_amount = float(input_amount)
-        if input_amount <= 0:
-            raise ValueError("The input amount cannot be ZERO or NEGATIVE!")
-        else:
-            return input_amount
+        return parse_amount(input_amount)
     except ValueError:
         UI.print_error("Amount must be a positive number.")
         sys.exit(1)
@@ -485,6 +4069,27 @@ def validate_string(input_string: str) -> str:
         sys.exit(1)
 
 
+def validate_positive_int(input_number: str) -> int:
+    """Validate a row count such as --limit or --offset"""
+    try:
+        input_number = int(input_number)
+        if input_number < 0:
+            raise ValueError("The number cannot be negative.")
+        return input_number
+    except Exception:
+        UI.print_error("The value must be a non-negative integer.")
+        sys.exit(1)
+
+
+def validate_date(input_date: str) -> str:
+    """Validate a YYYY-MM-DD date"""
+    try:
+        return datetime.strptime(input_date, "%Y-%m-%d").strftime("%Y-%m-%d")
+    except ValueError:
+        UI.print_error("Dates must use the YYYY-MM-DD format.")
+        sys.exit(1)
+
+
 def validate_month_input(input_month: str) -> int:
     """Validate the entered input for the month. (Type and Value)"""
     try:
@@ -498,6 +4103,23 @@ def validate_month_input(input_month: str) -> int:
         sys.exit(1)
 
 
+def validate_year(input_year: str) -> str:
+    """Validate a YYYY year"""
+    if re.fullmatch(r"\d{4}", input_year):
+        return input_year
+    UI.print_error("Years must use the YYYY format.")
+    sys.exit(1)
+
+
+def validate_year_month(input_month: str) -> str:
+    """Validate a YYYY-MM month"""
+    try:
+        return datetime.strptime(input_month, "%Y-%m").strftime("%Y-%m")
+    except ValueError:
+        UI.print_error("Months must use the YYYY-MM format.")
+        sys.exit(1)
+
+
 class CategoryList:
     list_of_categories = [
         "General",
@@ -527,10 +4149,30 @@ class CategoryList:
             print(f"\t{category}")
 
 
-def arguments() -> argparse.Namespace:
+ROLLING_WINDOWS = {"7d": 7, "30d": 30, "90d": 90}
+
+
+def build_parser() -> argparse.ArgumentParser:
     """Argparse arguments"""
     # Custom help formatter could be added here, but staying within constraints
     parser = argparse.ArgumentParser(description="Manage your expenses.")
+    parser.add_argument(
+        "--backend",
+        help="Storage backend to use (default: the 'backend' key of config.json, or json).",
+        choices=list(STORAGE_BACKENDS),
+        required=False,
+    )
+    parser.add_argument(
+        "--timings",
+        help="Print wall/CPU time and bytes read/written per phase to stderr.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--profile",
+        help="Write a cProfile (pstats) dump of the command to FILE.",
+        metavar="FILE",
+        required=False,
+    )
     subparser = parser.add_subparsers(dest="command")
 
     add_parser = subparser.add_parser("add", help="Add Expense")
@@ -574,12 +4216,42 @@ def arguments() -> argparse.Namespace:
         required=False,
         metavar="CAT",
     )
+    list_parser.add_argument(
+        "--sort",
+        help="Order the expenses by id, date or amount (default: id).",
+        choices=["id", "date", "amount"],
+        default="id",
+        required=False,
+    )
+    page_group = list_parser.add_mutually_exclusive_group(required=False)
+    page_group.add_argument(
+        "--top",
+        help="Show only the N largest expenses by the sort key, largest first.",
+        metavar="N",
+        type=validate_positive_int,
+        required=False,
+    )
+    page_group.add_argument(
+        "--limit",
+        help="Show at most N expenses.",
+        metavar="N",
+        type=validate_positive_int,
+        required=False,
+    )
+    list_parser.add_argument(
+        "--offset",
+        help="Skip the first N expenses.",
+        metavar="N",
+        type=validate_positive_int,
+        default=0,
+        required=False,
+    )
 
     summary_parser = subparser.add_parser(
         "summary", help="Get a summary of all expenses or a specific date."
     )
-    summary_parser = summary_parser.add_mutually_exclusive_group(required=False)
-    summary_parser.add_argument(
+    summary_group = summary_parser.add_mutually_exclusive_group(required=False)
+    summary_group.add_argument(
         "--month",
         required=False,
         help="Specify the number of the month.",
@@ -587,7 +4259,7 @@ def arguments() -> argparse.Namespace:
         type=validate_month_input,
         nargs=1,
     )
-    summary_parser.add_argument(
+    summary_group.add_argument(
         "--category",
         required=False,
         help="Specify the category of item.",
@@ -595,6 +4267,28 @@ def arguments() -> argparse.Namespace:
         choices=CategoryList.list_of_categories,
         nargs=1,
     )
+    summary_group.add_argument(
+        "--rolling",
+        required=False,
+        help="Total of the last 7, 30 or 90 days, today included.",
+        choices=ROLLING_WINDOWS,
+    )
+    summary_parser.add_argument(
+        "--from",
+        dest="date_from",
+        required=False,
+        help="Total of the expenses on or after this date.",
+        metavar="YYYY-MM-DD",
+        type=validate_date,
+    )
+    summary_parser.add_argument(
+        "--to",
+        dest="date_to",
+        required=False,
+        help="Total of the expenses on or before this date.",
+        metavar="YYYY-MM-DD",
+        type=validate_date,
+    )
 
     delete_parser = subparser.add_parser("delete", help="Delete a specific item.")
     delete_parser.add_argument(
@@ -605,14 +4299,23 @@ def arguments() -> argparse.Namespace:
         nargs=1,
     )
 
-    update_parser = subparser.add_parser("update", help="Update a specific item.")
-    update_parser.add_argument(
+    update_parser = subparser.add_parser(
+        "update", help="Update a specific item, or every item matching --where."
+    )
+    update_target = update_parser.add_mutually_exclusive_group(required=True)
+    update_target.add_argument(
         "--id",
-        required=True,
         help="Specify the item id that you want to get updated.",
         metavar="ID",
         nargs=1,
     )
+    update_target.add_argument(
+        "--where",
+        help="Bulk update the items where FIELD equals VALUE "
+        "(description, category or date); repeatable.",
+        metavar="FIELD=VALUE",
+        action="append",
+    )
     update_parser.add_argument(
         "--description",
         help="The new description for the item.",
@@ -630,77 +4333,386 @@ def arguments() -> argparse.Namespace:
         choices=CategoryList.list_of_categories,
         nargs=1,
     )
+    update_parser.add_argument(
+        "--set",
+        help="With --where: the new FIELD=VALUE (description, amount or category); "
+        "repeatable. Dates are left unchanged.",
+        metavar="FIELD=VALUE",
+        action="append",
+    )
 
     export_parser = subparser.add_parser(
-        "export", help="Export the expenses as a CSV file."
+        "export", help="Export the expenses as a CSV or JSONL file."
+    )
+    export_parser.add_argument(
+        "--format",
+        help="Output format (default: csv).",
+        choices=["csv", "jsonl"],
+        default="csv",
+        required=False,
+    )
+    export_parser.add_argument(
+        "--output",
+        help="Output path, or '-' for stdout (default: expense_items.<format>).",
+        metavar="PATH",
+        required=False,
+    )
+    export_parser.add_argument(
+        "--gzip",
+        help="Compress the output with gzip.",
+        action="store_true",
+        required=False,
+    )
+    export_parser.add_argument(
+        "--category",
+        required=False,
+        help="Only export one category.",
+        metavar="CAT",
+        choices=CategoryList.list_of_categories,
+    )
+    export_parser.add_argument(
+        "--from",
+        dest="date_from",
+        required=False,
+        help="Only export expenses on or after this date.",
+        metavar="YYYY-MM-DD",
+        type=validate_date,
+    )
+    export_parser.add_argument(
+        "--to",
+        dest="date_to",
+        required=False,
+        help="Only export expenses on or before this date.",
+        metavar="YYYY-MM-DD",
+        type=validate_date,
+    )
+
+    search_parser = subparser.add_parser(
+        "search", help="Search the expense descriptions by keyword or prefix."
+    )
+    search_parser.add_argument(
+        "query",
+        help="Words to look for; each matches a whole word or the start of one.",
+        metavar="WORD",
+        nargs="+",
+    )
+    search_parser.add_argument(
+        "--category",
+        required=False,
+        help="Only search one category.",
+        metavar="CAT",
+        choices=CategoryList.list_of_categories,
+    )
+    search_parser.add_argument(
+        "--from",
+        dest="date_from",
+        required=False,
+        help="Only search expenses on or after this date.",
+        metavar="YYYY-MM-DD",
+        type=validate_date,
+    )
+    search_parser.add_argument(
+        "--to",
+        dest="date_to",
+        required=False,
+        help="Only search expenses on or before this date.",
+        metavar="YYYY-MM-DD",
+        type=validate_date,
+    )
+    search_parser.add_argument(
+        "--limit",
+        help="Show at most N results (default: 20).",
+        metavar="N",
+        type=validate_positive_int,
+        default=20,
+    )
+
+    import_parser = subparser.add_parser(
+        "import", help="Import expenses from a CSV or JSONL file in one write."
+    )
+    import_parser.add_argument(
+        "--input",
+        required=True,
+        help="Input path, or '-' for stdin. A .gz suffix is decompressed.",
+        metavar="PATH",
+    )
+    import_parser.add_argument(
+        "--format",
+        help="Input format (default: from the file extension, else csv).",
+        choices=["csv", "jsonl"],
+        required=False,
+    )
+    import_parser.add_argument(
+        "--gzip",
+        help="The input is gzip compressed (implied by a .gz suffix).",
+        action="store_true",
+        default=None,
+        required=False,
+    )
+
+    compact_parser = subparser.add_parser(
+        "compact", help="Fold the write journal back into the JSON snapshot."
+    )
+
+    report_parser = subparser.add_parser(
+        "report", help="Year-month by category spend matrix with totals."
+    )
+    report_parser.add_argument(
+        "--year",
+        required=False,
+        help="Only show the months of one year.",
+        metavar="YYYY",
+        type=int,
+        nargs=1,
+    )
+    report_parser.add_argument(
+        "--csv",
+        help="Write the matrix as CSV to stdout.",
+        action="store_true",
+        required=False,
+    )
+
+    stats_parser = subparser.add_parser(
+        "stats", help="Count, mean, median, p90, p99 and max spend per group."
+    )
+    stats_period = stats_parser.add_mutually_exclusive_group(required=False)
+    stats_period.add_argument(
+        "--year",
+        required=False,
+        help="Only use the months of one year.",
+        metavar="YYYY",
+        type=validate_year,
+    )
+    stats_period.add_argument(
+        "--month",
+        required=False,
+        help="Only use one month.",
+        metavar="YYYY-MM",
+        type=validate_year_month,
+    )
+    stats_parser.add_argument(
+        "--category",
+        required=False,
+        help="Only use one category.",
+        metavar="CAT",
+        choices=CategoryList.list_of_categories,
+    )
+    stats_parser.add_argument(
+        "--by",
+        help="Group by category or by month (default: category).",
+        choices=["category", "month"],
+        default="category",
+    )
+
+    cache_parser = subparser.add_parser(
+        "cache", help="Show the hit rate of the read-command cache, or empty it."
+    )
+    cache_parser.add_argument(
+        "action",
+        help="stats: entries, size and hit rate; clear: remove every entry.",
+        choices=["stats", "clear"],
+    )
+
+    reindex_parser = subparser.add_parser(
+        "reindex", help="Rebuild the summary aggregates from the items."
+    )
+    reindex_parser.add_argument(
+        "--check",
+        help="Only compare the aggregates against a full scan.",
+        action="store_true",
+        required=False,
     )
 
-    return parser.parse_args()
+    migrate_parser = subparser.add_parser(
+        "migrate", help="Move the ledger to another storage backend."
+    )
+    migrate_parser.add_argument(
+        "--to",
+        required=True,
+        help="The storage backend to migrate to.",
+        choices=list(STORAGE_BACKENDS),
+        nargs=1,
+    )
+    migrate_parser.add_argument(
+        "--force",
+        help="Overwrite a non-empty ledger in the target backend.",
+        action="store_true",
+        required=False,
+    )
+
+    batch_parser = subparser.add_parser(
+        "batch", help="Run newline-delimited commands with a single write."
+    )
+    batch_parser.add_argument(
+        "--file",
+        required=True,
+        help="File of commands, one per line, or '-' for stdin.",
+        metavar="PATH",
+    )
+    batch_parser.add_argument(
+        "--verbose",
+        help="Show the output of every command.",
+        action="store_true",
+        required=False,
+    )
+
+    serve_parser = subparser.add_parser(
+        "serve",
+        help="Keep the ledger in memory and answer other calls over a Unix socket.",
+    )
+    serve_parser.add_argument(
+        "--stop",
+        help="Stop the running daemon.",
+        action="store_true",
+        required=False,
+    )
+
+    return parser
+
+
+def arguments() -> argparse.Namespace:
+    return build_parser().parse_args()
 
 
 ############### Main Program #################
 
 
-def main() -> None:
-    try:
-        args = arguments()
+def run_command(expense_record: Expense, args: argparse.Namespace) -> None:
+    """Dispatch one parsed command"""
+    if args.command == "add":
+        expense_record.add_expense_record(
+            args.description[0], args.amount[0], args.category[0]
+        )
 
-        # If no arguments provided, show help
-        if not args.command:
-            print(f"\n {Theme.MAUVE}{Theme.BOLD}EXPENSE TRACKER CLI{Theme.RESET}")
-            print(
-                f" {Theme.OVERLAY}Use 'python3 expense-tracker.py --help' for usage.{Theme.RESET}\n"
+    elif args.command == "delete":
+        expense_record.delete_item(args.id[0])
+
+    elif args.command == "list":
+        if args.list_categories:
+            CategoryList.display_categories()
+        else:
+            expense_record.list_items(
+                args.category[0] if args.category else "all",
+                sort=args.sort,
+                limit=args.limit,
+                offset=args.offset,
+                top=args.top,
             )
-            sys.exit(0)
 
-        expense_record = Expense()
+    elif args.command == "summary":
+        if (args.date_from or args.date_to) and (
+            args.month or args.category or args.rolling
+        ):
+            UI.print_error(
+                "--from/--to cannot be combined with --month, --category or --rolling."
+            )
+            sys.exit(1)
+
+        if args.date_from or args.date_to:
+            expense_record.summary_items_by_dates(args.date_from, args.date_to)
+        elif args.rolling:
+            expense_record.summary_items_rolling(ROLLING_WINDOWS[args.rolling])
+        elif args.month:
+            expense_record.summary_items_by_month(args.month[0])
+        elif args.category:
+            expense_record.summary_items_by_category(args.category[0])
+        else:
+            expense_record.summary_of_all_items()
+
+    elif args.command == "update":
+        if args.where:
+            if not args.set or args.description or args.amount or args.category:
+                UI.print_error("--where takes its new values from --set.")
+                sys.exit(1)
+            expense_record.update_where(args.where, args.set)
 
-        if args.command == "add":
-            expense_record.add_expense_record(
-                args.description[0], args.amount[0], args.category[0]
+        else:
+            if args.set:
+                UI.print_error("--set is only used with --where.")
+                sys.exit(1)
+            expense_record.update_item(
+                args.id[0],
+                args.description[0] if args.description else None,
+                args.amount[0] if args.amount else None,
+                args.category[0] if args.category else None,
             )
 
-        elif args.command == "delete":
-            expense_record.delete_item(args.id[0])
+    elif args.command == "export":
+        expense_record.export_items(
+            args.format,
+            args.output,
+            args.gzip,
+            args.category,
+            args.date_from,
+            args.date_to,
+        )
 
-        elif args.command == "list":
-            if args.list_categories:
-                CategoryList.display_categories()
-            else:
-                if args.category:
-                    expense_record.list_items(args.category[0])
-                else:
-                    expense_record.list_items()
+    elif args.command == "search":
+        expense_record.search(
+            args.query, args.category, args.date_from, args.date_to, args.limit
+        )
 
-        elif args.command == "summary":
-            if args.month:
-                expense_record.summary_items_by_month(args.month[0])
-            elif args.category:
-                expense_record.summary_items_by_category(args.category[0])
-            else:
-                expense_record.summary_of_all_items()
+    elif args.command == "import":
+        expense_record.import_items(args.input, args.format, args.gzip)
+
+    elif args.command == "compact":
+        expense_record.compact()
+
+    elif args.command == "report":
+        expense_record.report(args.year[0] if args.year else None, args.csv)
 
-        elif args.command == "update":
-            if args.description and args.amount and args.category:
-                expense_record.update_description(args.id[0], args.description[0])
-                expense_record.update_amount(args.id[0], args.amount[0])
-                expense_record.update_category(args.id[0], args.category[0])
+    elif args.command == "stats":
+        expense_record.stats(args.month or args.year, args.category, args.by)
 
-            elif args.description and args.amount:
-                expense_record.update_description(args.id[0], args.description[0])
-                expense_record.update_amount(args.id[0], args.amount[0])
+    elif args.command == "cache":
+        expense_record.cache_command(args.action)
 
-            elif args.amount:
-                expense_record.update_amount(args.id[0], args.amount[0])
+    elif args.command == "reindex":
+        expense_record.reindex(args.check)
 
-            elif args.description:
-                expense_record.update_description(args.id[0], args.description[0])
+    elif args.command == "migrate":
+        expense_record.migrate(args.to[0], args.force)
 
-            elif args.category:
-                expense_record.update_category(args.id[0], args.category[0])
+    elif args.command == "batch":
+        expense_record.run_batch(args.file, args.verbose)
 
-        elif args.command == "export":
-            expense_record.export_csv()
+    elif args.command == "serve":
+        expense_record.serve(args.stop)
+
+
+def main() -> None:
+    loaded = (time.perf_counter(), time.process_time())
+    try:
+        # Hand the command to a running daemon when there is one.
+        code = Expense.forward(sys.argv[1:])
+        if code is not None:
+            sys.exit(code)
+
+        args = arguments()
+
+        # If no arguments provided, show help
+        if not args.command:
+            print(f"\n {Theme.MAUVE}{Theme.BOLD}EXPENSE TRACKER CLI{Theme.RESET}")
+            print(
+                f" {Theme.OVERLAY}Use 'python3 expense-tracker.py --help' for usage.{Theme.RESET}\n"
+            )
+            sys.exit(0)
+
+        parsed = (time.perf_counter(), time.process_time())
+        timings = nullcontext()
+        if args.timings:
+            timings = Instrumentation.session(loaded, parsed)
+        profile = nullcontext()
+        if args.profile:
+            profile = Instrumentation.profile(args.profile)
+        with timings, profile:
+            expense_record = Expense(args.backend)
+            if args.command in Expense.CACHED_COMMANDS and not (
+                args.timings or args.profile
+            ):
+                expense_record.run_cached(args)
+            else:
+                run_command(expense_record, args)
 
     except KeyboardInterrupt:
         print(f"\n{Theme.RED}Operation cancelled.{Theme.RESET}")
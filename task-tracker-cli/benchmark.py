@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parent / "task-tracker.py"
+
+STATUSES = ["todo", "in-progress", "done"]
+
+
+############## Database generation #################
+
+
+def generate_database(tasks: int, seed: int = 42) -> dict:
+    """A task database with the given number of tasks in every status"""
+    rng = random.Random(seed)
+    items = {}
+    status_index = {status: [] for status in STATUSES}
+    for task_id in range(1, tasks + 1):
+        status = rng.choice(STATUSES)
+        items[str(task_id)] = {
+            "description": f"task {task_id}",
+            "status": status,
+            "createdAt": "2024/01/01 09:00:00",
+            "updatedAt": "N/A",
+        }
+        status_index[status].append(str(task_id))
+    return {
+        "id_counter": {"counter": tasks, "available_ids": []},
+        "meta": {"count": tasks},
+        "status_index": status_index,
+        "items": items,
+    }
+
+
+def make_home(tasks: int, backend: str = "json") -> Path:
+    """Create a temporary HOME holding a task database of the given size"""
+    home = Path(tempfile.mkdtemp(prefix="task-bench-"))
+    config_directory = home / ".config" / "task-tracker"
+    config_directory.mkdir(parents=True)
+
+    with open(config_directory / "taskDB.json", "w", encoding="utf-8") as f:
+        json.dump(generate_database(tasks), f, indent=4)
+
+    if backend != "json":
+        run_cli(home, "migrate", "--to", backend)
+
+    return home
+
+
+def run_cli(home: Path, *argv: str) -> float:
+    """Run task-tracker.py in a fresh process and return the wall time"""
+    env = dict(os.environ, HOME=str(home))
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, str(SCRIPT), *argv],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=False,
+    )
+    return time.perf_counter() - start
+
+
+def median_ms(samples: list) -> float:
+    return statistics.median(samples) * 1000
+
+
+############## Benchmarks #################
+
+
+def bench_list(sizes: list, repeat: int) -> dict:
+    """`list` latency, the full rewrite it no longer pays, and the DB mtime"""
+    results = {}
+
+    for tasks in sizes:
+        home = make_home(tasks)
+        database = home / ".config" / "task-tracker" / "taskDB.json"
+        modified = database.stat().st_mtime_ns
+
+        list_ms = median_ms([run_cli(home, "list") for _ in range(repeat)])
+        status_ms = median_ms(
+            [run_cli(home, "list", "--status", "done") for _ in range(repeat)]
+        )
+
+        # What every read used to add: re-serializing the whole database.
+        with open(database, "r", encoding="utf-8") as f:
+            content = json.load(f)
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            with open(database.with_suffix(".bench"), "w", encoding="utf-8") as f:
+                json.dump(content, f, indent=4)
+            samples.append(time.perf_counter() - start)
+        os.remove(database.with_suffix(".bench"))
+
+        results[tasks] = {
+            "list_ms": list_ms,
+            "list_status_ms": status_ms,
+            "removed_write_ms": median_ms(samples),
+            "rewritten": database.stat().st_mtime_ns != modified,
+        }
+
+    print(
+        f"{'tasks':>10}{'list':>12}{'list --status':>16}"
+        f"{'removed write':>16}{'DB rewritten':>14}"
+    )
+    for tasks, result in results.items():
+        print(
+            f"{tasks:>10,}{result['list_ms']:>10.1f}ms{result['list_status_ms']:>14.1f}ms"
+            f"{result['removed_write_ms']:>14.1f}ms{str(result['rewritten']):>14}"
+        )
+
+    return results
+
+
+def bench_backends(sizes: list, repeat: int) -> dict:
+    """Reads and single-task writes against the json and sqlite backends"""
+    results = {}
+
+    for tasks in sizes:
+        for backend in ("json", "sqlite"):
+            home = make_home(tasks, backend)
+            task_id = str(tasks // 2)
+
+            # Alternate the status so that every run really changes the task.
+            mark_samples = [
+                run_cli(home, "mark-done" if run % 2 else "mark-todo", "--id", task_id)
+                for run in range(repeat)
+            ]
+
+            results[(tasks, backend)] = {
+                "list_ms": median_ms([run_cli(home, "list") for _ in range(repeat)]),
+                "list_status_ms": median_ms(
+                    [run_cli(home, "list", "--status", "done") for _ in range(repeat)]
+                ),
+                "mark_ms": median_ms(mark_samples),
+                "stats_ms": median_ms([run_cli(home, "stats") for _ in range(repeat)]),
+            }
+
+    print(
+        f"{'tasks':>10}{'backend':>9}{'list':>12}{'list --status':>16}"
+        f"{'mark-done':>13}{'stats':>11}"
+    )
+    for (tasks, backend), result in results.items():
+        print(
+            f"{tasks:>10,}{backend:>9}{result['list_ms']:>10.1f}ms"
+            f"{result['list_status_ms']:>14.1f}ms{result['mark_ms']:>11.1f}ms"
+            f"{result['stats_ms']:>9.1f}ms"
+        )
+
+    return results
+
+
+def bench_bulk(tasks: int, count: int) -> dict:
+    """Closing `count` tasks one command at a time against one bulk command"""
+    results = {}
+
+    for backend in ("json", "sqlite"):
+        home = make_home(tasks, backend)
+        single_s = sum(
+            run_cli(home, "mark-done", "--id", str(task_id))
+            for task_id in range(1, count + 1)
+        )
+        bulk_s = run_cli(home, "mark-todo", "--id", f"1-{count}")
+        where_s = run_cli(home, "mark-in-progress", "--where", "status=todo")
+
+        results[backend] = {
+            "single_ms": single_s * 1000,
+            "bulk_ms": bulk_s * 1000,
+            "where_ms": where_s * 1000,
+        }
+
+    print(f"{tasks:,} tasks, {count} tasks changed")
+    print(
+        f"{'backend':>9}{f'{count} x --id N':>16}{f'--id 1-{count}':>14}"
+        f"{'--where':>12}"
+    )
+    for backend, result in results.items():
+        print(
+            f"{backend:>9}{result['single_ms']:>14.1f}ms{result['bulk_ms']:>12.1f}ms"
+            f"{result['where_ms']:>10.1f}ms"
+        )
+
+    return results
+
+
+def arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the task tracker.")
+    subparser = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = subparser.add_parser(
+        "list", help="Latency of read-only list commands as the DB grows."
+    )
+    list_parser.add_argument(
+        "--sizes",
+        help="Comma separated task counts.",
+        default="1000,10000,100000",
+    )
+    list_parser.add_argument(
+        "--repeat", help="Runs per measurement.", type=int, default=5
+    )
+
+    backends_parser = subparser.add_parser(
+        "backends", help="Compare the json and sqlite backends as the DB grows."
+    )
+    backends_parser.add_argument(
+        "--sizes",
+        help="Comma separated task counts.",
+        default="1000,10000,100000",
+    )
+    backends_parser.add_argument(
+        "--repeat", help="Runs per measurement.", type=int, default=5
+    )
+
+    bulk_parser = subparser.add_parser(
+        "bulk", help="One bulk mark command against one command per task."
+    )
+    bulk_parser.add_argument(
+        "--tasks", help="Tasks in the database.", type=int, default=100000
+    )
+    bulk_parser.add_argument(
+        "--count", help="Tasks to change.", type=int, default=50
+    )
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = arguments()
+
+    if args.command == "list":
+        sizes = [int(size) for size in args.sizes.split(",")]
+        bench_list(sizes, args.repeat)
+
+    if args.command == "backends":
+        sizes = [int(size) for size in args.sizes.split(",")]
+        bench_backends(sizes, args.repeat)
+
+    if args.command == "bulk":
+        bench_bulk(args.tasks, args.count)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ import json
 import sys
 import argparse
 import os
+import sqlite3
 
 from datetime import datetime
 from pathlib import Path
@@ -66,6 +67,24 @@ def _fmt_error_io(detail: Any) -> str:
     )
 
 
+def _fmt_repaired(tasks: int, max_id: int, free_ids: int) -> str:
+    """Format the summary of a repair."""
+    return (
+        f"\n  {_GREEN}{_BOLD}{_ICON_DB}  Database Repaired{_RESET}\n"
+        f"  {_SUBTEXT}Tasks       {_RESET}{_TEXT}{tasks}{_RESET}\n"
+        f"  {_SUBTEXT}Highest ID  {_RESET}{_BLUE}{_BOLD}#{max_id}{_RESET}\n"
+        f"  {_SUBTEXT}Free IDs    {_RESET}{_TEXT}{free_ids}{_RESET}\n"
+    )
+
+
+def _fmt_counter_mismatch() -> str:
+    """Format the error for an ID counter or index that no longer matches the tasks."""
+    return _fmt_error_db(
+        "The ID counter or status index does not match the tasks in the database.",
+        "run 'task-tracker.py repair' to rebuild them",
+    )
+
+
 def _color_status(status_str: str) -> str:
     """Return a colored, icon-prefixed status token for any status string variant."""
     s = status_str
@@ -79,12 +98,103 @@ def _color_status(status_str: str) -> str:
         return f"{_SUBTEXT}{s}{_RESET}"
 
 
+_STATUSES = ("todo", "in-progress", "done")
+
+
+def _fmt_stats(counts: dict) -> str:
+    """Format the number of tasks in each status."""
+    lines = [f"\n  {_MAUVE}{_BOLD}{_ICON_DB}  Task Stats{_RESET}"]
+    for status, count in counts.items():
+        lines.append(
+            f"  {_color_status(status)}  {_SUBTEXT}{status:<12}{_RESET}"
+            f"{_BLUE}{_BOLD}{count:>6}{_RESET}"
+        )
+    lines.append(
+        f"  {_SUBTEXT}{'Total':<17}{_RESET}{_TEXT}{_BOLD}{sum(counts.values()):>6}{_RESET}\n"
+    )
+    return "\n".join(lines)
+
+
+def _fmt_index_mismatch(mismatches: list) -> str:
+    """Format the statuses whose index count differs from a full rebuild."""
+    detail = ", ".join(
+        f"{status} indexed {indexed} / actual {actual}"
+        for status, indexed, actual in mismatches
+    )
+    return _fmt_error_db(
+        "The status index does not match the tasks in the database.",
+        f"{detail}; run 'task-tracker.py repair' to rebuild it",
+    )
+
+
+def _fmt_missing(missing: list) -> str:
+    """Format the IDs that were asked for but do not exist, if any."""
+    if not missing:
+        return ""
+
+    shown = ", ".join(f"#{id}" for id in missing[:5])
+    if len(missing) > 5:
+        shown += f" (+{len(missing) - 5} more)"
+    return f"  {_SUBTEXT}Not Found   {_RESET}{_PEACH}{shown}{_RESET}\n"
+
+
+def _fmt_bulk_status(count: int, status: str, missing: list) -> str:
+    """Format the summary of a status change over several tasks."""
+    return (
+        f"\n  {_MAUVE}{_BOLD}{_ICON_BOLT}  Status Updated{_RESET}\n"
+        f"  {_SUBTEXT}Tasks       {_RESET}{_BLUE}{_BOLD}{count}{_RESET}\n"
+        f"  {_SUBTEXT}New Status  {_RESET}{_color_status(status)}\n"
+        f"{_fmt_missing(missing)}"
+    )
+
+
+def _fmt_bulk_delete(count: int, missing: list) -> str:
+    """Format the summary of deleting several tasks."""
+    return (
+        f"\n  {_PEACH}{_BOLD}{_ICON_DELETE}  Tasks Deleted{_RESET}\n"
+        f"  {_SUBTEXT}Tasks       {_RESET}{_BLUE}{_BOLD}{count}{_RESET}"
+        f"{_PEACH} removed from the database.{_RESET}\n"
+        f"{_fmt_missing(missing)}"
+    )
+
+
+def _fmt_task_row(item_id: Any, item: dict) -> str:
+    """Format one task as a line of the task list."""
+    return (
+        f"  {_color_status(item.get('status', 'N/A'))}  "
+        f"{_BLUE}{_BOLD}#{item_id:<4}{_RESET}  "
+        f"{_SUBTEXT}{item.get('createdAt', 'N/A')}{_RESET}  "
+        f"{_DIM}{_SUBTEXT}(U: {item.get('updatedAt', 'N/A')}){_RESET}  "
+        f"{_MAUVE}{_ICON_ARROW}{_RESET}  "
+        f"{_TEXT}{item.get('description', 'N/A')}{_RESET}"
+    )
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 
 
-def handle_path() -> Path:
+def _expand_ids(id_ranges: list, counter: int) -> list:
+    """Unique task IDs from inclusive (first, last) ranges, in the order given.
+
+    Ranges stop at the ID counter since no task can sit above it; a single ID
+    is kept as is so that a missing one is still reported.
+    """
+    task_ids = []
+    seen = set()
+    for first, last in id_ranges:
+        if last > first:
+            last = min(last, counter)
+
+        for task_id in range(first, last + 1):
+            if task_id not in seen:
+                seen.add(task_id)
+                task_ids.append(task_id)
+
+    return task_ids
+
+
+def handle_path(file_name: str = "taskDB.json") -> Path:
     """Handle path and directory of configs"""
-    file_name = "taskDB.json"
     directory = ".config/task-tracker/"
     home_path = os.getenv("HOME")
 
@@ -98,7 +208,40 @@ def handle_path() -> Path:
     return Path(full_path)
 
 
+def _load_config() -> dict:
+    """Load the optional config.json next to the database"""
+    config_path = handle_path("config.json")
+    if not config_path.exists():
+        return {}
+
+    try:
+        with open(config_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    except json.JSONDecodeError as e:
+        print(_fmt_error_db("Failed to decode config.json.", e))
+        sys.exit(1)
+
+
+def _save_config(config: dict) -> None:
+    with open(handle_path("config.json"), "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=4)
+
+
 class TaskList:
+    """The task database, read on first use and written once by ``flush``.
+
+    ``id_counter.counter`` is the highest ID ever handed out and is trusted as
+    stored. ``meta`` holds the task count written with it; a count that no
+    longer matches the items, or a task above the counter, means the file was
+    changed behind our back and ``repair`` has to recount the IDs.
+
+    ``status_index`` maps every status to the sorted IDs of its tasks, so
+    filtered listing and ``stats`` never look at the other tasks. Changes go to
+    an in-memory set per status, built the first time a command changes one.
+    """
+
+    @staticmethod
     def _read_json() -> Any:
         """Read and return the json file"""
 
@@ -112,29 +255,13 @@ class TaskList:
 
             return python_obj
 
-        def update_counter(python_obj: Any) -> Any:
-            """Update the counter and fetch the maximum counter"""
-            task_items = python_obj.get("items")
-            max_number = 0
-            for id, item in task_items.items():
-                item_id = int(id)
-
-                max_number = max(item_id, max_number)
-
-            python_obj["id_counter"].update({"counter": max_number})
-
-            return python_obj
-
         path = handle_path()
 
         try:
             with open(path, "r", encoding="utf-8") as f:
                 python_obj = json.load(f)
 
-            python_obj = validate_database_dict(python_obj)
-            python_obj = update_counter(python_obj)
-
-            return python_obj
+            return validate_database_dict(python_obj)
 
         except json.JSONDecodeError as e:
             print(_fmt_error_db("Failed to decode the database JSON file.", e))
@@ -146,7 +273,9 @@ class TaskList:
 
     _id_counter = 0
     _available_ids = []
-    _database_dict = _read_json()
+    _dirty = False
+    _database_dict = None
+    _status_sets = None
 
     @classmethod
     def _load_counter(cls) -> None:
@@ -156,14 +285,121 @@ class TaskList:
             "available_ids", []
         )
 
+    @classmethod
+    def _counter_is_valid(cls) -> bool:
+        """Check the stored counter against the stored count, without a scan"""
+        items = cls._database_dict["items"]
+        counter = cls._database_dict["id_counter"].get("counter", 0)
+        indexed = sum(len(ids) for ids in cls._database_dict["status_index"].values())
+        return (
+            cls._database_dict["meta"].get("count") == len(items) == indexed
+            and str(counter + 1) not in items
+        )
+
+    @staticmethod
+    def _build_status_index(items: dict) -> dict:
+        """Group the task IDs by status, a full scan"""
+        index = {status: [] for status in _STATUSES}
+        for id, item in items.items():
+            index.setdefault(item.get("status", "N/A"), []).append(id)
+
+        return {status: sorted(ids, key=int) for status, ids in index.items()}
+
+    @classmethod
+    def _index_sets(cls) -> dict:
+        """The status index as sets, converted once before the first change"""
+        if cls._status_sets is None:
+            cls._status_sets = {
+                status: set(ids)
+                for status, ids in cls._database_dict["status_index"].items()
+            }
+
+        return cls._status_sets
+
+    @classmethod
+    def _index_move(cls, id: str, old_status: Any, new_status: Any) -> None:
+        """Move a task between statuses in the index; None adds or removes it"""
+        sets = cls._index_sets()
+        if old_status is not None:
+            sets.get(old_status, set()).discard(id)
+        if new_status is not None:
+            sets.setdefault(new_status, set()).add(id)
+
+    @classmethod
+    def _index_ids(cls, status: str) -> list:
+        """The IDs of the tasks in a status, from the index"""
+        if cls._status_sets is not None:
+            return sorted(cls._status_sets.get(status, ()), key=int)
+
+        return cls._database_dict["status_index"].get(status, [])
+
+    @classmethod
+    def status_counts(cls) -> dict:
+        """Number of tasks in each status, read off the index"""
+        if cls._status_sets is not None:
+            index = cls._status_sets
+        else:
+            index = cls._database_dict["status_index"]
+
+        return {
+            status: len(ids)
+            for status, ids in index.items()
+            if ids or status in _STATUSES
+        }
+
+    @classmethod
+    def check_index(cls) -> list:
+        """Compare the index with a full rebuild: (status, indexed, actual)"""
+        rebuilt = cls._build_status_index(cls._database_dict["items"])
+        index = cls._database_dict["status_index"]
+        mismatches = []
+        for status in sorted(set(index) | set(rebuilt)):
+            indexed = sorted(index.get(status, []), key=int)
+            actual = rebuilt.get(status, [])
+            if indexed != actual:
+                mismatches.append((status, len(indexed), len(actual)))
+
+        return mismatches
+
     @classmethod
     def _write(cls) -> None:
-        """Write the python dictionary object to json"""
+        """Write the python dictionary object to json through a temporary file"""
         path = handle_path()
+        temp_path = path.with_name(path.name + ".tmp")
+
+        cls._database_dict["meta"] = {"count": len(cls._database_dict["items"])}
+        if cls._status_sets is not None:
+            cls._database_dict["status_index"] = {
+                status: sorted(ids, key=int)
+                for status, ids in cls._status_sets.items()
+                if ids or status in _STATUSES
+            }
 
-        with open(path, "w", encoding="utf-8") as f:
+        with open(temp_path, "w", encoding="utf-8") as f:
             json.dump(cls._database_dict, f, indent=4)
 
+        os.replace(temp_path, path)
+
+    @classmethod
+    def _mark_dirty(cls) -> None:
+        """Remember that the database changed and has to be written by flush"""
+        cls._dirty = True
+
+    @classmethod
+    def flush(cls) -> None:
+        """Write the database once, at exit, and only if a command changed it"""
+        if not cls._dirty:
+            return
+
+        try:
+            cls._write()
+
+        except IOError as e:
+            print(_fmt_error_io(e))
+            sys.exit(1)
+
+        cls._dirty = False
+
     @classmethod
     def _save_id(cls) -> int:
         """Save the ID"""
@@ -182,9 +418,79 @@ class TaskList:
 
             return popped_id
 
-    def __init__(self) -> None:
+    def __init__(self, check: bool = True) -> None:
+        if TaskList._database_dict is None:
+            TaskList._database_dict = TaskList._read_json()
+
+        if "meta" not in self._database_dict or "status_index" not in self._database_dict:
+            # Saved before the counter and index were kept up to date: rebuild once.
+            self.repair(quiet=True)
+        elif check and not self._counter_is_valid():
+            print(_fmt_counter_mismatch())
+            sys.exit(1)
+
         self._load_counter()
-        self._write()
+
+    @classmethod
+    def count(cls) -> int:
+        """Number of tasks in the database, zero if it was never created"""
+        if cls._database_dict is None:
+            if not handle_path().exists():
+                return 0
+            cls._database_dict = cls._read_json()
+
+        return len(cls._database_dict["items"])
+
+    @classmethod
+    def iter_tasks(cls) -> Any:
+        """Yield (id, task) pairs in insertion order"""
+        return iter(cls._database_dict["items"].items())
+
+    @classmethod
+    def id_state(cls) -> tuple:
+        """The ID counter and the free IDs, as integers"""
+        return cls._id_counter, [int(id) for id in cls._available_ids]
+
+    @classmethod
+    def bulk_load(cls, tasks: Any, counter: int, available_ids: list) -> None:
+        """Replace the whole database with the given tasks and write it"""
+        cls._database_dict = {
+            "id_counter": {
+                "counter": counter,
+                "available_ids": [str(id) for id in available_ids],
+            },
+            "meta": {},
+            "items": {str(id): dict(item) for id, item in tasks},
+        }
+        cls._database_dict["status_index"] = cls._build_status_index(
+            cls._database_dict["items"]
+        )
+        cls._status_sets = None
+        cls._load_counter()
+        cls._mark_dirty()
+        cls.flush()
+
+    @classmethod
+    def repair(cls, quiet: bool = False) -> None:
+        """Recount the ID counter and the free IDs from every task"""
+        items = cls._database_dict["items"]
+        task_ids = {int(id) for id in items}
+        max_id = max(task_ids, default=0)
+
+        cls._database_dict["id_counter"] = {
+            "counter": max_id,
+            "available_ids": [
+                str(id) for id in range(1, max_id) if id not in task_ids
+            ],
+        }
+        cls._database_dict["meta"] = {"count": len(items)}
+        cls._database_dict["status_index"] = cls._build_status_index(items)
+        cls._status_sets = None
+        cls._load_counter()
+        cls._mark_dirty()
+
+        if not quiet:
+            print(_fmt_repaired(len(items), max_id, len(cls._available_ids)))
 
     @classmethod
     def add_task(cls, description: str) -> None:
@@ -205,8 +511,9 @@ class TaskList:
                     }
                 }
             )
+            cls._index_move(str(id), None, status)
 
-            cls._write()
+            cls._mark_dirty()
 
             print(
                 f"\n  {_GREEN}{_BOLD}{_ICON_ADD}  Task Added{_RESET}\n"
@@ -218,19 +525,16 @@ class TaskList:
             print(_fmt_error_notfound(id, e))
             sys.exit(1)
 
-        except IOError as e:
-            print(_fmt_error_io(e))
-            sys.exit(1)
-
     @classmethod
     def delete_task(cls, id: str) -> None:
         """Delete a task"""
         try:
             deleted_id = id
-            del cls._database_dict["items"][deleted_id]
+            deleted = cls._database_dict["items"].pop(deleted_id)
+            cls._index_move(deleted_id, deleted.get("status", "N/A"), None)
             cls._available_ids.append(deleted_id)
 
-            cls._write()
+            cls._mark_dirty()
 
             print(
                 f"\n  {_PEACH}{_BOLD}{_ICON_DELETE}  Task Deleted{_RESET}\n"
@@ -241,10 +545,6 @@ class TaskList:
             print(_fmt_error_notfound(id, e))
             sys.exit(1)
 
-        except IOError as e:
-            print(_fmt_error_io(e))
-            sys.exit(1)
-
     @staticmethod
     def _get_current_datetime() -> str:
         return (datetime.now()).strftime("%Y/%m/%d %H:%M:%S")
@@ -253,11 +553,11 @@ class TaskList:
     def update_status(cls, id: str, status: str) -> None:
         """Update the status of a task"""
         try:
-            cls._database_dict["items"][id].update(
-                {"status": status, "updatedAt": cls._get_current_datetime()}
-            )
+            item = cls._database_dict["items"][id]
+            cls._index_move(id, item.get("status", "N/A"), status)
+            item.update({"status": status, "updatedAt": cls._get_current_datetime()})
 
-            cls._write()
+            cls._mark_dirty()
 
             print(
                 f"\n  {_MAUVE}{_BOLD}{_ICON_BOLT}  Status Updated{_RESET}\n"
@@ -269,10 +569,6 @@ class TaskList:
             print(_fmt_error_notfound(id, e))
             sys.exit(1)
 
-        except IOError as e:
-            print(_fmt_error_io(e))
-            sys.exit(1)
-
     @classmethod
     def update_description(cls, id: str, description: str) -> None:
         """update the description of a task"""
@@ -281,7 +577,7 @@ class TaskList:
                 {"description": description, "updatedAt": cls._get_current_datetime()}
             )
 
-            cls._write()
+            cls._mark_dirty()
 
             print(
                 f"\n  {_MAUVE}{_BOLD}{_ICON_EDIT}  Description Updated{_RESET}\n"
@@ -293,9 +589,49 @@ class TaskList:
             print(_fmt_error_notfound(id, e))
             sys.exit(1)
 
-        except IOError as e:
-            print(_fmt_error_io(e))
-            sys.exit(1)
+    @classmethod
+    def select_ids(cls, id_ranges: Any, status: Any) -> tuple:
+        """Resolve --id ranges and a status filter to (matching IDs, missing IDs)"""
+        if id_ranges is None:
+            return list(cls._index_ids(status)), []
+
+        items = cls._database_dict["items"]
+        matched = []
+        missing = []
+        for task_id in _expand_ids(id_ranges, cls._id_counter):
+            id = str(task_id)
+            item = items.get(id)
+            if item is None:
+                missing.append(id)
+            elif status is None or item.get("status", "N/A") == status:
+                matched.append(id)
+
+        return matched, missing
+
+    @classmethod
+    def bulk_update_status(cls, ids: list, status: str) -> None:
+        """Update the status of many tasks in memory, written by one flush"""
+        items = cls._database_dict["items"]
+        updated_date = cls._get_current_datetime()
+
+        for id in ids:
+            item = items[id]
+            cls._index_move(id, item.get("status", "N/A"), status)
+            item.update({"status": status, "updatedAt": updated_date})
+
+        cls._mark_dirty()
+
+    @classmethod
+    def bulk_delete(cls, ids: list) -> None:
+        """Delete many tasks in memory, written by one flush"""
+        items = cls._database_dict["items"]
+
+        for id in ids:
+            deleted = items.pop(id)
+            cls._index_move(id, deleted.get("status", "N/A"), None)
+            cls._available_ids.append(id)
+
+        cls._mark_dirty()
 
     @classmethod
     def display_tasks(cls) -> None:
@@ -303,56 +639,575 @@ class TaskList:
         dict_items = cls._database_dict.get("items")
 
         for id, item in dict_items.items():
-            item_id = id
-            description = item.get("description", "N/A")
-            status = item.get("status", "N/A")
-            created_date = item.get("createdAt", "N/A")
-            update_date = item.get("updatedAt", "N/A")
-
-            if status == "done":
-                status = "[x]"
-            elif status == "in-progress":
-                status = "[-]"
-            elif status == "todo":
-                status = "[ ]"
-
-            print(
-                f"  {_color_status(status)}  "
-                f"{_BLUE}{_BOLD}#{item_id:<4}{_RESET}  "
-                f"{_SUBTEXT}{created_date}{_RESET}  "
-                f"{_DIM}{_SUBTEXT}(U: {update_date}){_RESET}  "
-                f"{_MAUVE}{_ICON_ARROW}{_RESET}  "
-                f"{_TEXT}{description}{_RESET}"
-            )
+            print(_fmt_task_row(id, item))
 
     @classmethod
     def filter_display_tasks(cls, status: str) -> None:
-        """Print specific tasks with requested status"""
+        """Print specific tasks with requested status, through the status index.
+
+        ``list`` runs without the counter check, so a hand-edited file may have
+        an index that no longer matches the tasks. When the counts disagree, or
+        an indexed task is gone or has another status, every task is scanned.
+        """
         dict_items = cls._database_dict["items"]
 
-        for id, item in dict_items.items():
-            item_id = id
-            description = item.get("description", "N/A")
-            item_status = item.get("status", "N/A")
-            created_date = item.get("createdAt", "N/A")
-            update_date = item.get("updatedAt", "N/A")
-
-            if status == item_status:
-                if status == "done":
-                    status = "[x]"
-                elif status == "in-progress":
-                    status = "[-]"
-                elif status == "todo":
-                    status = "[ ]"
+        tasks = []
+        if cls._counter_is_valid():
+            for id in cls._index_ids(status):
+                item = dict_items.get(id)
+                if item is None or item.get("status") != status:
+                    tasks = None
+                    break
+                tasks.append((id, item))
+        else:
+            tasks = None
+
+        if tasks is None:
+            tasks = [
+                (id, item)
+                for id, item in dict_items.items()
+                if item.get("status") == status
+            ]
+
+        for id, item in tasks:
+            print(_fmt_task_row(id, item))
+
+
+class SQLiteTaskList:
+    """The task database in SQLite, one row per task.
+
+    Nothing is loaded up front: listing reads only the rows it prints, through
+    the ``status`` index when filtering, and every mutation is its own
+    single-row transaction, so ``flush`` has nothing left to write. The ID
+    counter lives in ``meta`` and deleted IDs waiting for reuse in
+    ``free_ids``. Triggers keep ``status_counts`` in step with the tasks in the
+    same transaction, which is what ``stats`` reads.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            status TEXT NOT NULL,
+            createdAt TEXT NOT NULL,
+            updatedAt TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status);
+        CREATE INDEX IF NOT EXISTS tasks_created ON tasks (createdAt);
+        CREATE INDEX IF NOT EXISTS tasks_updated ON tasks (updatedAt);
+        CREATE TABLE IF NOT EXISTS free_ids (id INTEGER PRIMARY KEY);
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER);
+        CREATE TABLE IF NOT EXISTS status_counts (
+            status TEXT PRIMARY KEY,
+            count INTEGER NOT NULL
+        );
+        CREATE TRIGGER IF NOT EXISTS tasks_count_insert AFTER INSERT ON tasks BEGIN
+            INSERT OR IGNORE INTO status_counts VALUES (NEW.status, 0);
+            UPDATE status_counts SET count = count + 1 WHERE status = NEW.status;
+        END;
+        CREATE TRIGGER IF NOT EXISTS tasks_count_delete AFTER DELETE ON tasks BEGIN
+            UPDATE status_counts SET count = count - 1 WHERE status = OLD.status;
+        END;
+        CREATE TRIGGER IF NOT EXISTS tasks_count_update AFTER UPDATE OF status ON tasks
+        WHEN OLD.status != NEW.status BEGIN
+            UPDATE status_counts SET count = count - 1 WHERE status = OLD.status;
+            INSERT OR IGNORE INTO status_counts VALUES (NEW.status, 0);
+            UPDATE status_counts SET count = count + 1 WHERE status = NEW.status;
+        END;
+    """
+
+    _connection = None
 
-            print(
-                f"  {_color_status(status)}  "
-                f"{_BLUE}{_BOLD}#{item_id:<4}{_RESET}  "
-                f"{_SUBTEXT}{created_date}{_RESET}  "
-                f"{_DIM}{_SUBTEXT}(U: {update_date}){_RESET}  "
-                f"{_MAUVE}{_ICON_ARROW}{_RESET}  "
-                f"{_TEXT}{description}{_RESET}"
+    @classmethod
+    def _connect(cls) -> sqlite3.Connection:
+        """Open the database on first use and create the schema"""
+        if cls._connection is None:
+            try:
+                cls._connection = sqlite3.connect(handle_path("taskDB.sqlite3"))
+                cls._connection.executescript(cls._SCHEMA)
+
+                counted = cls._connection.execute(
+                    "SELECT 1 FROM status_counts LIMIT 1"
+                ).fetchone()
+                if counted is None:
+                    # Created before the counts table, or empty: count once.
+                    with cls._connection:
+                        cls._rebuild_counts(cls._connection)
+
+            except sqlite3.Error as e:
+                print(_fmt_error_db("Failed to open the SQLite database.", e))
+                sys.exit(1)
+
+        return cls._connection
+
+    def __init__(self, check: bool = True) -> None:
+        self._connect()
+
+        if check and not self._counter_is_valid():
+            print(_fmt_counter_mismatch())
+            sys.exit(1)
+
+    @staticmethod
+    def _rebuild_counts(connection: sqlite3.Connection) -> None:
+        """Recount the tasks in each status, a full scan of the status index"""
+        connection.execute("DELETE FROM status_counts")
+        connection.execute(
+            "INSERT INTO status_counts SELECT status, count(*) FROM tasks GROUP BY status"
+        )
+
+    @classmethod
+    def status_counts(cls) -> dict:
+        """Number of tasks in each status, read off status_counts"""
+        counts = {status: 0 for status in _STATUSES}
+        rows = cls._connect().execute("SELECT status, count FROM status_counts")
+        for status, count in rows:
+            if count or status in _STATUSES:
+                counts[status] = count
+
+        return counts
+
+    @classmethod
+    def check_index(cls) -> list:
+        """Compare status_counts with a full count: (status, indexed, actual)"""
+        connection = cls._connect()
+        indexed = dict(connection.execute("SELECT status, count FROM status_counts"))
+        actual = dict(
+            connection.execute("SELECT status, count(*) FROM tasks GROUP BY status")
+        )
+        return [
+            (status, indexed.get(status, 0), actual.get(status, 0))
+            for status in sorted(set(indexed) | set(actual))
+            if indexed.get(status, 0) != actual.get(status, 0)
+        ]
+
+    @classmethod
+    def _counter(cls) -> int:
+        row = cls._connect().execute(
+            "SELECT value FROM meta WHERE key = 'counter'"
+        ).fetchone()
+        return row[0] if row else 0
+
+    @classmethod
+    def _counter_is_valid(cls) -> bool:
+        """Check that no task sits above the counter, one primary key probe"""
+        row = cls._connect().execute(
+            "SELECT 1 FROM tasks WHERE id > ? LIMIT 1", (cls._counter(),)
+        ).fetchone()
+        return row is None
+
+    @classmethod
+    def _save_id(cls, connection: sqlite3.Connection) -> int:
+        """Take a free ID, or the next one from the counter"""
+        row = connection.execute("SELECT min(id) FROM free_ids").fetchone()
+        if row[0] is not None:
+            connection.execute("DELETE FROM free_ids WHERE id = ?", row)
+            return row[0]
+
+        counter = cls._counter() + 1
+        connection.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('counter', ?)",
+            (counter,),
+        )
+        return counter
+
+    @staticmethod
+    def _task_id(id: str) -> int:
+        """Parse a task ID from the command line"""
+        try:
+            return int(id)
+
+        except ValueError as e:
+            print(_fmt_error_notfound(id, e))
+            sys.exit(1)
+
+    @classmethod
+    def flush(cls) -> None:
+        """Every change is already committed"""
+
+    @classmethod
+    def count(cls) -> int:
+        return cls._connect().execute("SELECT count(*) FROM tasks").fetchone()[0]
+
+    @classmethod
+    def iter_tasks(cls) -> Any:
+        """Yield (id, task) pairs in ID order"""
+        rows = cls._connect().execute(
+            "SELECT id, description, status, createdAt, updatedAt"
+            " FROM tasks ORDER BY id"
+        )
+        for id, description, status, created_date, update_date in rows:
+            yield id, {
+                "description": description,
+                "status": status,
+                "createdAt": created_date,
+                "updatedAt": update_date,
+            }
+
+    @classmethod
+    def id_state(cls) -> tuple:
+        """The ID counter and the free IDs, as integers"""
+        rows = cls._connect().execute("SELECT id FROM free_ids ORDER BY id")
+        return cls._counter(), [row[0] for row in rows]
+
+    @classmethod
+    def bulk_load(cls, tasks: Any, counter: int, available_ids: list) -> None:
+        """Replace every table with the given tasks, in one transaction"""
+        connection = cls._connect()
+        with connection:
+            connection.execute("DELETE FROM tasks")
+            connection.execute("DELETE FROM free_ids")
+            connection.execute("DELETE FROM status_counts")
+            connection.executemany(
+                "INSERT INTO tasks VALUES (?, ?, ?, ?, ?)",
+                (
+                    (
+                        int(id),
+                        item.get("description", "N/A"),
+                        item.get("status", "todo"),
+                        item.get("createdAt", "N/A"),
+                        item.get("updatedAt", "N/A"),
+                    )
+                    for id, item in tasks
+                ),
+            )
+            connection.executemany(
+                "INSERT OR IGNORE INTO free_ids VALUES (?)",
+                ((id,) for id in available_ids),
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('counter', ?)",
+                (counter,),
+            )
+
+    @classmethod
+    def repair(cls) -> None:
+        """Recount the ID counter and the free IDs from every task"""
+        connection = cls._connect()
+        task_ids = {row[0] for row in connection.execute("SELECT id FROM tasks")}
+        max_id = max(task_ids, default=0)
+        free_ids = [id for id in range(1, max_id) if id not in task_ids]
+
+        with connection:
+            cls._rebuild_counts(connection)
+            connection.execute("DELETE FROM free_ids")
+            connection.executemany(
+                "INSERT INTO free_ids VALUES (?)", ((id,) for id in free_ids)
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('counter', ?)",
+                (max_id,),
+            )
+
+        print(_fmt_repaired(len(task_ids), max_id, len(free_ids)))
+
+    @classmethod
+    def add_task(cls, description: str) -> None:
+        """Add a task"""
+        connection = cls._connect()
+        try:
+            with connection:
+                id = cls._save_id(connection)
+                connection.execute(
+                    "INSERT INTO tasks VALUES (?, ?, 'todo', ?, 'N/A')",
+                    (id, description, TaskList._get_current_datetime()),
+                )
+
+        except sqlite3.Error as e:
+            print(_fmt_error_io(e))
+            sys.exit(1)
+
+        print(
+            f"\n  {_GREEN}{_BOLD}{_ICON_ADD}  Task Added{_RESET}\n"
+            f"  {_SUBTEXT}ID          {_RESET}{_BLUE}{_BOLD}#{id}{_RESET}\n"
+            f"  {_SUBTEXT}Description {_RESET}{_TEXT}{description}{_RESET}\n"
+        )
+
+    @classmethod
+    def delete_task(cls, id: str) -> None:
+        """Delete a task"""
+        task_id = cls._task_id(id)
+        connection = cls._connect()
+        try:
+            with connection:
+                deleted = connection.execute(
+                    "DELETE FROM tasks WHERE id = ?", (task_id,)
+                ).rowcount
+                if deleted:
+                    connection.execute("INSERT INTO free_ids VALUES (?)", (task_id,))
+
+        except sqlite3.Error as e:
+            print(_fmt_error_io(e))
+            sys.exit(1)
+
+        if not deleted:
+            print(_fmt_error_notfound(id, "no task with this ID"))
+            sys.exit(1)
+
+        print(
+            f"\n  {_PEACH}{_BOLD}{_ICON_DELETE}  Task Deleted{_RESET}\n"
+            f"  {_SUBTEXT}ID {_RESET}{_BLUE}{_BOLD}#{id}{_RESET}{_PEACH} has been removed from the database.{_RESET}\n"
+        )
+
+    @classmethod
+    def _update(cls, id: str, column: str, value: str) -> None:
+        """Set one column of a task and its updatedAt, in one transaction"""
+        task_id = cls._task_id(id)
+        connection = cls._connect()
+        try:
+            with connection:
+                updated = connection.execute(
+                    f"UPDATE tasks SET {column} = ?, updatedAt = ? WHERE id = ?",
+                    (value, TaskList._get_current_datetime(), task_id),
+                ).rowcount
+
+        except sqlite3.Error as e:
+            print(_fmt_error_io(e))
+            sys.exit(1)
+
+        if not updated:
+            print(_fmt_error_notfound(id, "no task with this ID"))
+            sys.exit(1)
+
+    @classmethod
+    def update_status(cls, id: str, status: str) -> None:
+        """Update the status of a task"""
+        cls._update(id, "status", status)
+
+        print(
+            f"\n  {_MAUVE}{_BOLD}{_ICON_BOLT}  Status Updated{_RESET}\n"
+            f"  {_SUBTEXT}ID         {_RESET}{_BLUE}{_BOLD}#{id}{_RESET}\n"
+            f"  {_SUBTEXT}New Status {_RESET}{_color_status(status)}\n"
+        )
+
+    @classmethod
+    def update_description(cls, id: str, description: str) -> None:
+        """update the description of a task"""
+        cls._update(id, "description", description)
+
+        print(
+            f"\n  {_MAUVE}{_BOLD}{_ICON_EDIT}  Description Updated{_RESET}\n"
+            f"  {_SUBTEXT}ID          {_RESET}{_BLUE}{_BOLD}#{id}{_RESET}\n"
+            f"  {_SUBTEXT}Description {_RESET}{_TEXT}{description}{_RESET}\n"
+        )
+
+    @classmethod
+    def select_ids(cls, id_ranges: Any, status: Any) -> tuple:
+        """Resolve --id ranges and a status filter to (matching IDs, missing IDs)"""
+        connection = cls._connect()
+        if id_ranges is None:
+            rows = connection.execute(
+                "SELECT id FROM tasks WHERE status = ? ORDER BY id", (status,)
+            )
+            return [row[0] for row in rows], []
+
+        counter = cls._counter()
+        statuses = {}
+        for first, last in id_ranges:
+            if last > first:
+                last = min(last, counter)
+            statuses.update(
+                connection.execute(
+                    "SELECT id, status FROM tasks WHERE id BETWEEN ? AND ?",
+                    (first, last),
+                )
+            )
+
+        matched = []
+        missing = []
+        for task_id in _expand_ids(id_ranges, counter):
+            if task_id not in statuses:
+                missing.append(task_id)
+            elif status is None or statuses[task_id] == status:
+                matched.append(task_id)
+
+        return matched, missing
+
+    @classmethod
+    def bulk_update_status(cls, ids: list, status: str) -> None:
+        """Update the status of many tasks in one transaction"""
+        connection = cls._connect()
+        updated_date = TaskList._get_current_datetime()
+        try:
+            with connection:
+                connection.executemany(
+                    "UPDATE tasks SET status = ?, updatedAt = ? WHERE id = ?",
+                    ((status, updated_date, id) for id in ids),
+                )
+
+        except sqlite3.Error as e:
+            print(_fmt_error_io(e))
+            sys.exit(1)
+
+    @classmethod
+    def bulk_delete(cls, ids: list) -> None:
+        """Delete many tasks in one transaction"""
+        connection = cls._connect()
+        try:
+            with connection:
+                connection.executemany(
+                    "DELETE FROM tasks WHERE id = ?", ((id,) for id in ids)
+                )
+                connection.executemany(
+                    "INSERT OR IGNORE INTO free_ids VALUES (?)", ((id,) for id in ids)
+                )
+
+        except sqlite3.Error as e:
+            print(_fmt_error_io(e))
+            sys.exit(1)
+
+    @classmethod
+    def display_tasks(cls) -> None:
+        """Print all the tasks"""
+        for id, item in cls.iter_tasks():
+            print(_fmt_task_row(id, item))
+
+    @classmethod
+    def filter_display_tasks(cls, status: str) -> None:
+        """Print specific tasks with requested status, through the status index"""
+        rows = cls._connect().execute(
+            "SELECT id, description, createdAt, updatedAt"
+            " FROM tasks WHERE status = ? ORDER BY id",
+            (status,),
+        )
+        for id, description, created_date, update_date in rows:
+            item = {
+                "description": description,
+                "status": status,
+                "createdAt": created_date,
+                "updatedAt": update_date,
+            }
+            print(_fmt_task_row(id, item))
+
+
+TASK_BACKENDS = {"json": TaskList, "sqlite": SQLiteTaskList}
+
+
+def migrate(source: Any, source_backend: str, target_backend: str, force: bool) -> None:
+    """Copy every task into another backend and make it the default"""
+    if target_backend == source_backend:
+        print(
+            _fmt_error_db(
+                f"The tasks already use the {target_backend} backend.",
+                "pick the other backend with --to",
+            )
+        )
+        sys.exit(1)
+
+    target = TASK_BACKENDS[target_backend]
+    if target.count() and not force:
+        print(
+            _fmt_error_db(
+                f"The {target_backend} database is not empty.",
+                "use --force to overwrite it",
             )
+        )
+        sys.exit(1)
+
+    counter, available_ids = source.id_state()
+    try:
+        target.bulk_load(source.iter_tasks(), counter, available_ids)
+
+    except (IOError, sqlite3.Error) as e:
+        print(_fmt_error_io(e))
+        sys.exit(1)
+
+    config = _load_config()
+    config["backend"] = target_backend
+    _save_config(config)
+
+    print(
+        f"\n  {_GREEN}{_BOLD}{_ICON_DB}  Database Migrated{_RESET}\n"
+        f"  {_SUBTEXT}Tasks       {_RESET}{_TEXT}{target.count()}{_RESET}\n"
+        f"  {_SUBTEXT}Backend     {_RESET}{_TEXT}{source_backend} {_MAUVE}{_ICON_ARROW}{_RESET}"
+        f"  {_TEXT}{_BOLD}{target_backend}{_RESET}{_SUBTEXT} (now the default){_RESET}\n"
+    )
+
+
+def id_spec(value: str) -> list:
+    """Parse '7', '1,4,9' or '10-250' into inclusive (first, last) ranges"""
+    id_ranges = []
+    for part in value.split(","):
+        first, dash, last = part.partition("-")
+        try:
+            first = int(first)
+            last = int(last) if dash else first
+
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid task ID or range: '{part}'")
+
+        if first < 1 or last < first:
+            raise argparse.ArgumentTypeError(f"invalid task ID or range: '{part}'")
+
+        id_ranges.append((first, last))
+
+    return id_ranges
+
+
+def where_filter(value: str) -> str:
+    """Parse a 'status=<status>' filter and return the status"""
+    key, _, status = value.partition("=")
+    if key != "status" or status not in _STATUSES:
+        raise argparse.ArgumentTypeError(
+            f"invalid filter: '{value}' (expected status={{{','.join(_STATUSES)}}})"
+        )
+
+    return status
+
+
+def _add_selection_arguments(command_parser: argparse.ArgumentParser) -> None:
+    """Add the --id and --where options of the commands that take many tasks"""
+    command_parser.add_argument(
+        "--id",
+        type=id_spec,
+        required=False,
+        help="IDs of the tasks: 7, 1,4,9 or a range like 10-250",
+        nargs="+",
+    )
+    command_parser.add_argument(
+        "--where",
+        type=where_filter,
+        required=False,
+        help="Only the tasks matching a filter, e.g. status=in-progress",
+    )
+
+
+BULK_COMMANDS = {
+    "mark-todo": "todo",
+    "mark-in-progress": "in-progress",
+    "mark-done": "done",
+    "delete": None,
+}
+
+
+def run_bulk(task_list: Any, command: str, id_specs: Any, status_filter: Any) -> None:
+    """Apply a mark-* or delete command to every selected task at once"""
+    id_ranges = None
+    if id_specs is not None:
+        id_ranges = [id_range for spec in id_specs for id_range in spec]
+
+    task_ids, missing = task_list.select_ids(id_ranges, status_filter)
+    if not task_ids and missing:
+        print(_fmt_error_notfound(missing[0], "no task with this ID"))
+        sys.exit(1)
+
+    status = BULK_COMMANDS[command]
+
+    # A single task keeps its usual banner.
+    if len(task_ids) == 1 and not missing:
+        if command == "delete":
+            task_list.delete_task(str(task_ids[0]))
+        else:
+            task_list.update_status(str(task_ids[0]), status)
+        return
+
+    if command == "delete":
+        if task_ids:
+            task_list.bulk_delete(task_ids)
+        print(_fmt_bulk_delete(len(task_ids), missing))
+    else:
+        if task_ids:
+            task_list.bulk_update_status(task_ids, status)
+        print(_fmt_bulk_status(len(task_ids), status, missing))
 
 
 def arguments() -> argparse.Namespace:
@@ -360,6 +1215,13 @@ def arguments() -> argparse.Namespace:
         description="Task-CLI Tracker - Manage your tasks efficiently."
     )
 
+    parser.add_argument(
+        "--backend",
+        help="Storage backend (default: the 'backend' key of config.json, or json)",
+        choices=list(TASK_BACKENDS),
+        required=False,
+    )
+
     subparsers = parser.add_subparsers(dest="command", help="The available commands")
 
     add_parser = subparsers.add_parser("add", help="Add task.")
@@ -385,51 +1247,94 @@ def arguments() -> argparse.Namespace:
     )
 
     delete_parser = subparsers.add_parser("delete", help="Delete a task")
-    delete_parser.add_argument(
-        "--id", type=str, required=True, help="ID of the task", nargs=1
-    )
+    _add_selection_arguments(delete_parser)
 
     mark_progress_parser = subparsers.add_parser(
         "mark-in-progress", help="Mark a task as 'in-progress'"
     )
-    mark_progress_parser.add_argument(
-        "--id", type=str, required=True, help="ID of the task", nargs=1
-    )
+    _add_selection_arguments(mark_progress_parser)
 
     mark_done_parser = subparsers.add_parser("mark-done", help="Mark a task as 'done'")
-    mark_done_parser.add_argument(
-        "--id", type=str, required=True, help="ID of the task", nargs=1
-    )
+    _add_selection_arguments(mark_done_parser)
 
     mark_todo_parser = subparsers.add_parser("mark-todo", help="Mark a task as 'todo'")
-    mark_todo_parser.add_argument(
-        "--id", type=str, required=True, help="ID of the task", nargs=1
+    _add_selection_arguments(mark_todo_parser)
+
+    subparsers.add_parser(
+        "repair", help="Recount the ID counter and free IDs from the tasks"
+    )
+
+    stats_parser = subparsers.add_parser(
+        "stats", help="Count the tasks in each status"
+    )
+    stats_parser.add_argument(
+        "--check",
+        help="Compare the status index against a full rebuild",
+        action="store_true",
+        required=False,
+    )
+
+    migrate_parser = subparsers.add_parser(
+        "migrate", help="Copy the tasks to another backend and make it the default"
+    )
+    migrate_parser.add_argument(
+        "--to",
+        required=True,
+        help="The backend to migrate to",
+        choices=list(TASK_BACKENDS),
+        nargs=1,
+    )
+    migrate_parser.add_argument(
+        "--force",
+        help="Overwrite a non-empty database in the target backend",
+        action="store_true",
+        required=False,
     )
 
     args = parser.parse_args()
 
+    if args.command in BULK_COMMANDS and args.id is None and args.where is None:
+        parser.error(f"{args.command}: one of --id or --where is required")
+
     return args
 
 
 def main() -> None:
     args = arguments()
 
-    task_list = TaskList()
+    backend = args.backend or _load_config().get("backend", "json")
+    if backend not in TASK_BACKENDS:
+        print(_fmt_error_db(f"Unknown storage backend: {backend}", "see config.json"))
+        sys.exit(1)
 
-    if args.command == "add":
-        task_list.add_task(args.description[0])
+    unchecked = args.command in ("list", "repair") or (
+        args.command == "stats" and args.check
+    )
+    task_list = TASK_BACKENDS[backend](check=not unchecked)
 
-    if args.command == "mark-todo":
-        task_list.update_status(args.id[0], "todo")
+    if args.command == "stats":
+        if args.check:
+            mismatches = task_list.check_index()
+            if mismatches:
+                print(_fmt_index_mismatch(mismatches))
+                sys.exit(1)
 
-    if args.command == "mark-in-progress":
-        task_list.update_status(args.id[0], "in-progress")
+        print(_fmt_stats(task_list.status_counts()))
+        if args.check:
+            print(f"  {_GREEN}{_ICON_DONE}  The status index matches a full rebuild{_RESET}\n")
 
-    if args.command == "mark-done":
-        task_list.update_status(args.id[0], "done")
+    if args.command == "migrate":
+        migrate(task_list, backend, args.to[0], args.force)
+
+    if args.command == "repair":
+        task_list.repair()
+
+    if args.command == "add":
+        task_list.add_task(args.description[0])
+
+    if args.command in BULK_COMMANDS:
+        run_bulk(task_list, args.command, args.id, args.where)
 
-    if args.command == "delete":
-        task_list.delete_task(args.id[0])
     if args.command == "update":
         task_list.update_description(args.id[0], args.description[0])
 
@@ -439,6 +1344,8 @@ def main() -> None:
         else:
             task_list.display_tasks()
 
+    task_list.flush()
+
 
 if __name__ == "__main__":
     main()